@@ -0,0 +1,249 @@
+"""
+Offline benchmark of the dynamic pricing pipeline on synthetic data.
+
+For every --rows scale, SyntheticDataGenerator writes seeded raw files shaped by
+the data dictionaries, and the pipeline stages run against them:
+
+    generate, load, validate_sources, merge, validate, feature_engineering,
+    train_models, evaluate_model, predict
+
+Each stage reports wall time, rows per second and memory: the peak resident set size
+of this process during the stage and its growth over the stage's starting RSS
+(sampled every 5 ms; train_models' search workers are separate processes and are
+not included).
+
+Scales above --stream_above rows replace load, validate_sources, merge and validate
+by one streamed "stream_load_validate" stage; only the first --model_rows validated
+rows are kept for the later stages. train_models fits on at most --train_rows rows.
+
+    python benchmarks/pipeline.py --rows 10K 100K 1M --fcs 8 --brands 5
+    python benchmarks/pipeline.py --rows 10K --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.data.data_loader import DataLoader  # noqa: E402
+from src.data.schema import SchemaRegistry  # noqa: E402
+from src.data.synthetic import DICTIONARY_DIR, SyntheticDataGenerator  # noqa: E402
+from src.pipelines import dynamic_pricing_pipeline as pipeline  # noqa: E402
+from src.utils.profiling import MemorySampler  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SUFFIXES = {"K": 10 ** 3, "M": 10 ** 6, "B": 10 ** 9}
+
+
+def parse_count(text):
+    """
+    Parses 10000, 10K, 2.5M or 100M into a row count.
+    """
+    text = str(text).strip().upper().replace("_", "")
+    if text and text[-1] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+class StageTimer:
+    """
+    Records time, peak memory and throughput for each stage run under stage().
+    """
+
+    def __init__(self, scale, sampler=None):
+        self.scale = scale
+        self.sampler = sampler
+        self.results = []
+
+    @contextlib.contextmanager
+    def stage(self, name, rows):
+        sampling = self.sampler is not None and self.sampler.available
+        watermark = self.sampler.watch() if sampling else None
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        result = {"scale": self.scale, "stage": name, "rows": int(rows), "seconds": seconds,
+                  "rows_per_second": rows / seconds if seconds > 0 else None}
+        if sampling:
+            self.sampler.release(watermark)
+            result["peak_rss_mb"] = watermark.peak / 2 ** 20
+            result["peak_rss_growth_mb"] = (watermark.peak - watermark.start) / 2 ** 20
+        self.results.append(result)
+        print(f"{self.scale:>12,} {name:<22} {seconds:9.3f}s {rows:>12,} rows", file=sys.stderr)
+
+
+@contextlib.contextmanager
+def raw_data(directory):
+    """
+    Points DataLoader at generated raw files; schemas still come from the shipped dictionaries.
+    """
+    original = DataLoader.RAW_DATA_DIR, DataLoader.CACHE_DIR, DataLoader._schema_registry
+    DataLoader.RAW_DATA_DIR = directory
+    DataLoader.CACHE_DIR = os.path.join(directory, ".cache")
+    DataLoader._schema_registry = SchemaRegistry.from_directory(DICTIONARY_DIR)
+    try:
+        yield
+    finally:
+        DataLoader.RAW_DATA_DIR, DataLoader.CACHE_DIR, DataLoader._schema_registry = original
+
+
+def feature_columns(df):
+    return [c for c in df.columns
+            if c not in ("SellingPrice", "Date") and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def run_scale(rows, args, workdir, sampler=None):
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    from src.models.model import PricingModel
+
+    timer = StageTimer(rows, sampler)
+    directory = os.path.join(workdir, f"rows_{rows}")
+    generator = SyntheticDataGenerator(rows=rows, days=args.days, fcs=args.fcs, brands=args.brands,
+                                       seed=args.seed, sales_keys=args.sales_keys)
+    with timer.stage("generate", rows):
+        generator.write(directory)
+
+    with raw_data(directory):
+        if rows > args.stream_above:
+            with timer.stage("stream_load_validate", rows):
+                kept, kept_rows = [], 0
+                for chunk in pipeline.stream_load_and_validate_data(chunksize=args.chunk_rows):
+                    if kept_rows < args.model_rows:
+                        kept.append(chunk.iloc[:args.model_rows - kept_rows])
+                        kept_rows += len(kept[-1])
+                df = pd.concat(kept, ignore_index=True)
+        else:
+            with timer.stage("load", rows):
+                sales = DataLoader.load_csv(pipeline.SALES_FILE, schema=DataLoader.get_schema("sales"))
+                dimensions = pipeline.load_dimension_tables()
+            with timer.stage("validate_sources", rows):
+                pipeline.validate_sources(sales, dimensions)
+            with timer.stage("merge", rows):
+                df = pipeline.merge_sources(sales, dimensions)
+            del sales
+            with timer.stage("validate", len(df)):
+                df = pipeline.validate_merged(df)
+
+    with timer.stage("feature_engineering", len(df)):
+        df = pipeline.feature_engineering(df)
+
+    columns = feature_columns(df)
+    df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=columns)
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[columns], df["SellingPrice"], test_size=0.2, random_state=args.seed,
+    )
+    X_fit, y_fit = X_train.iloc[:args.train_rows], y_train.iloc[:args.train_rows]
+    with timer.stage("train_models", len(X_fit)):
+        models = pipeline.train_models(X_fit, y_fit, n_jobs=args.n_jobs, strategy=args.strategy)
+    with timer.stage("evaluate_model", len(X_test) * len(models)):
+        for model in models.values():
+            pipeline.evaluate_model(model, X_test, y_test)
+
+    best = min(models, key=lambda name: pipeline.evaluate_model(models[name], X_test, y_test)["mse"])
+    pricing_model = PricingModel(models[best], StandardScaler())
+    pricing_model.train(X_fit, y_fit)
+    with timer.stage("predict", len(X_test)):
+        pricing_model.predict(X_test)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    return timer.results
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(previous, current):
+    """
+    Returns one row per (scale, stage) present in both runs, with the time ratio.
+    """
+    before = {(r["scale"], r["stage"]): r for r in previous["results"]}
+    rows = []
+    for result in current["results"]:
+        old = before.get((result["scale"], result["stage"]))
+        if old is None:
+            continue
+        rows.append({
+            "scale": result["scale"],
+            "stage": result["stage"],
+            "seconds_before": old["seconds"],
+            "seconds_after": result["seconds"],
+            "ratio": result["seconds"] / old["seconds"] if old["seconds"] else None,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", default=["10K"], help="Sales rows per scale, e.g. 10K 1M 100M.")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--fcs", type=int, default=4)
+    parser.add_argument("--brands", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sales_keys", action="store_true", help="Give sales rows FC_ID and Brand.")
+    parser.add_argument("--train_rows", type=parse_count, default=50_000)
+    parser.add_argument("--n_jobs", type=int, default=None)
+    parser.add_argument("--strategy", choices=("grid", "halving"), default="grid")
+    parser.add_argument("--stream_above", type=parse_count, default=5_000_000)
+    parser.add_argument("--chunk_rows", type=parse_count, default=1_000_000)
+    parser.add_argument("--model_rows", type=parse_count, default=1_000_000)
+    parser.add_argument("--no_memory", action="store_true", help="Do not sample memory.")
+    parser.add_argument("--workdir", default=None, help="Where to write the generated raw files.")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: benchmarks/results/).")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against.")
+    args = parser.parse_args(argv)
+
+    sampler = None if args.no_memory else MemorySampler().start()
+    workdir = args.workdir or tempfile.mkdtemp(prefix="pricing_bench_")
+    try:
+        results = []
+        for rows in map(parse_count, args.rows):
+            results.extend(run_scale(rows, args, workdir, sampler))
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "workdir")},
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        report["comparison"] = compare(previous, report)
+    print(json.dumps(report.get("comparison", report["results"]), indent=2))
+
+
+if __name__ == "__main__":
+    main()
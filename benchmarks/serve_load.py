@@ -0,0 +1,120 @@
+"""
+Closed-loop load generator for the scoring server (src/models/serve.py).
+
+Each client thread holds one keep-alive connection and sends /predict requests
+back to back for --duration seconds; the report gives client-side throughput and
+latency percentiles, plus the /metrics snapshot of the worker that answers last.
+
+    python src/models/model.py --model_path models/tide_pricing_model.pma --workers 4
+    python benchmarks/serve_load.py --port 8080 --clients 64 --n_features 12
+"""
+import argparse
+import http.client
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=10):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def connect(args):
+    if args.unix_socket:
+        return UnixHTTPConnection(args.unix_socket)
+    return http.client.HTTPConnection(args.host, args.port, timeout=10)
+
+
+def request(connection, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def client(args, deadline, latencies, errors, seed):
+    rng = np.random.default_rng(seed)
+    connection = connect(args)
+    while time.perf_counter() < deadline:
+        payload = {"instances": rng.normal(size=(args.rows_per_request, args.n_features)).tolist()}
+        start = time.perf_counter()
+        try:
+            status, _ = request(connection, "POST", "/predict", payload)
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = connect(args)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+    connection.close()
+
+
+def run(args):
+    deadline = time.perf_counter() + args.warmup
+    threads = [
+        threading.Thread(target=client, args=(args, deadline, [], [], i)) for i in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=client, args=(args, deadline, latencies, errors, i)) for i in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latency_ms = np.asarray(latencies) * 1000
+    report = {
+        "clients": args.clients,
+        "rows_per_request": args.rows_per_request,
+        "duration_seconds": elapsed,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": len(latencies) / elapsed,
+    }
+    if len(latency_ms):
+        p50, p95, p99 = np.percentile(latency_ms, [50, 95, 99])
+        report["latency_ms"] = {"p50": p50, "p95": p95, "p99": p99, "max": float(latency_ms.max())}
+    connection = connect(args)
+    report["server_metrics"] = request(connection, "GET", "/metrics")[1]
+    connection.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix_socket", default=None)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--rows_per_request", type=int, default=1)
+    parser.add_argument("--n_features", type=int, required=True)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
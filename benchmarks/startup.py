@@ -0,0 +1,113 @@
+"""
+Cold-import benchmark for the pipeline, serving and utility entry points.
+
+Every entry point is imported in a fresh interpreter --repeats times and the
+fastest run is reported, together with any heavy dependency (sklearn, mlflow, ...)
+the import pulled in and whether it replaced sys.excepthook. With --check, the
+run fails when an entry point loads a heavy dependency or imports more than
+--tolerance slower (plus --slack_ms) than the recorded baseline.
+
+    python benchmarks/startup.py --update    # record benchmarks/startup_baseline.json
+    python benchmarks/startup.py --check
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+
+ENTRY_POINTS = {
+    "pipeline": "src.pipelines.dynamic_pricing_pipeline",
+    "serve": "src.models.serve",
+    "model": "src.models.model",
+    "logger": "src.utils.logger",
+    "error_handler": "src.utils.error_handler",
+    "credentials": "src.utils.credentials_manager",
+    "mlflow_utils": "src.mlflow_integration.mlflow_utils",
+}
+
+# Loaded only by the functions that need them, never at import time.
+HEAVY_MODULES = ("sklearn", "scipy", "mlflow", "pythonjsonlogger", "yaml", "azure", "cryptography")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "heavy_modules": sorted(name for name in {heavy!r} if name in sys.modules),
+    "excepthook_changed": sys.excepthook is not sys.__excepthook__,
+}}))
+"""
+
+
+def probe(module):
+    """
+    Imports module in a fresh interpreter; returns its import time and side effects.
+    """
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(entry_points=None, repeats=5):
+    report = {}
+    for name, module in (entry_points or ENTRY_POINTS).items():
+        runs = [probe(module) for _ in range(repeats)]
+        report[name] = {
+            "module": module,
+            "import_ms": min(run["seconds"] for run in runs) * 1000,
+            "heavy_modules": runs[0]["heavy_modules"],
+            "excepthook_changed": runs[0]["excepthook_changed"],
+        }
+    return report
+
+
+def check(report, baseline, tolerance=0.5, slack_ms=50.0):
+    """
+    Returns the list of regressions of report against baseline ({name: import_ms}).
+    """
+    failures = []
+    for name, result in report.items():
+        if result["heavy_modules"]:
+            failures.append(f"{name} imports {', '.join(result['heavy_modules'])} at load time")
+        if result["excepthook_changed"]:
+            failures.append(f"{name} replaces sys.excepthook at import")
+        limit = baseline.get(name)
+        if limit is not None and result["import_ms"] > limit * (1 + tolerance) + slack_ms:
+            failures.append(f"{name} imports in {result['import_ms']:.1f} ms, baseline {limit:.1f} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on a regression.")
+    parser.add_argument("--update", action="store_true", help="Record this run as the baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown.")
+    parser.add_argument("--slack_ms", type=float, default=50.0, help="Allowed absolute slowdown.")
+    args = parser.parse_args(argv)
+
+    report = measure(repeats=args.repeats)
+    print(json.dumps(report, indent=2))
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump({name: round(result["import_ms"], 1) for name, result in report.items()}, f, indent=2)
+            f.write("\n")
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = check(report, baseline, args.tolerance, args.slack_ms)
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,410 @@
+import contextlib
+import hashlib
+import json
+import logging
 import os
+import threading
+
 import pandas as pd
 
+from src.data.schema import SchemaRegistry
+from src.data.storage import file_lock, last_access, storage_from_env
+from src.utils.error_handler import DataLoadingError
+
+
+class ColumnarCache:
+    """
+    On-disk Arrow IPC (Feather v2) cache for parsed CSV files.
+
+    Entries are keyed by source path, size, mtime and content hash. Cached
+    copies are written uncompressed so reads can memory-map them and pull only
+    the requested columns. Entries whose source changed are dropped on the next
+    lookup, and the least recently used entries are evicted once the cache
+    grows past max_bytes.
+
+    Manifest updates hold a file lock, so concurrent pipeline processes can share the
+    cache. Hits do not rewrite the manifest: they only touch the entry file, whose
+    mtime is its last use.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+    LOCK_NAME = "manifest.lock"
+    HASH_BLOCK_SIZE = 1 << 20
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # --- Manifest ---
+    def _manifest_path(self):
+        return os.path.join(self.cache_dir, self.MANIFEST_NAME)
+
+    def _locked(self):
+        return file_lock(os.path.join(self.cache_dir, self.LOCK_NAME), self._lock)
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"sources": {}, "entries": {}}
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._manifest_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path())
+
+    # --- Keys ---
+    def _hash_file(self, file_path):
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _fingerprint(self, manifest, file_path):
+        """
+        Returns the (size, mtime, sha256) fingerprint of a source file.
+        The content hash is only recomputed when size or mtime changed.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        known = manifest["sources"].get(file_path)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known
+        fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": self._hash_file(file_path)}
+        manifest["sources"][file_path] = fingerprint
+        return fingerprint
+
+    def fingerprint(self, file_path):
+        """
+        Returns the fingerprint of a source file, reusing the cached content hash when possible.
+        """
+        with self._locked():
+            manifest = self._read_manifest()
+            known = manifest["sources"].get(os.path.abspath(file_path))
+            fingerprint = self._fingerprint(manifest, file_path)
+            if fingerprint is not known:
+                self._write_manifest(manifest)
+            return dict(fingerprint)
+
+    def _key(self, file_path, fingerprint, extra):
+        payload = json.dumps(
+            {"path": os.path.abspath(file_path), "fingerprint": fingerprint, "extra": extra},
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --- Entries ---
+    def _drop_entry(self, manifest, key):
+        entry = manifest["entries"].pop(key, None)
+        if entry is not None:
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except FileNotFoundError:
+                pass
+
+    def _drop_stale(self, manifest, file_path):
+        """
+        Drops the entries built from an outdated version of the source; entries for
+        other read options (extra) over the current version stay valid. Returns
+        whether any were dropped.
+        """
+        source = os.path.abspath(file_path)
+        current = manifest["sources"][source]
+        stale = [k for k, e in manifest["entries"].items() if e["source"] == source and e["fingerprint"] != current]
+        for key in stale:
+            self._drop_entry(manifest, key)
+        return bool(stale)
+
+    def get(self, file_path, columns=None, extra=None):
+        """
+        Returns the cached DataFrame for file_path, or None on a miss.
+        """
+        import pyarrow.feather as feather
+
+        with self._locked():
+            manifest = self._read_manifest()
+            known = manifest["sources"].get(os.path.abspath(file_path))
+            fingerprint = self._fingerprint(manifest, file_path)
+            key = self._key(file_path, fingerprint, extra)
+            changed = self._drop_stale(manifest, file_path) or fingerprint is not known
+            entry = manifest["entries"].get(key)
+            if entry is not None:
+                entry_path = os.path.join(self.cache_dir, entry["file"])
+                try:
+                    os.utime(entry_path)
+                except FileNotFoundError:
+                    self._drop_entry(manifest, key)
+                    changed = True
+                else:
+                    if changed:
+                        self._write_manifest(manifest)
+                    table = feather.read_table(entry_path, columns=columns, memory_map=True)
+                    return table.to_pandas()
+            if changed:
+                self._write_manifest(manifest)
+            return None
+
+    def put(self, file_path, df, extra=None):
+        """
+        Writes df to the cache as the columnar copy of file_path.
+        """
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        with self._locked():
+            manifest = self._read_manifest()
+            fingerprint = self._fingerprint(manifest, file_path)
+            key = self._key(file_path, fingerprint, extra)
+            entry_name = f"{key}.arrow"
+            entry_path = os.path.join(self.cache_dir, entry_name)
+            tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+            table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, entry_path)
+            manifest["entries"][key] = {
+                "source": os.path.abspath(file_path),
+                "fingerprint": fingerprint,
+                "file": entry_name,
+                "bytes": os.path.getsize(entry_path),
+            }
+            self._drop_stale(manifest, file_path)
+            self._evict(manifest, keep=key)
+            self._write_manifest(manifest)
+
+    def load(self, file_path, reader, columns=None, extra=None):
+        """
+        Returns the cached copy of file_path, parsing it with reader() and caching it on a miss.
+        """
+        df = self.get(file_path, columns=columns, extra=extra)
+        if df is not None:
+            return df
+        df = reader()
+        self.put(file_path, df, extra=extra)
+        return df[columns] if columns is not None else df
+
+    def _evict(self, manifest, keep=None):
+        entries = manifest["entries"]
+        total = sum(e["bytes"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: last_access(os.path.join(self.cache_dir, entries[k]["file"]))):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries[key]["bytes"]
+            self._drop_entry(manifest, key)
+
+    def invalidate(self, file_path=None):
+        """
+        Removes cached copies of file_path, or every entry when no path is given.
+        """
+        with self._locked():
+            manifest = self._read_manifest()
+            source = os.path.abspath(file_path) if file_path is not None else None
+            for key in [k for k, e in manifest["entries"].items() if source is None or e["source"] == source]:
+                self._drop_entry(manifest, key)
+            if source is None:
+                manifest["sources"] = {}
+            else:
+                manifest["sources"].pop(source, None)
+            self._write_manifest(manifest)
+
+    def size_bytes(self):
+        """
+        Returns the total size of all cached entries.
+        """
+        return sum(e["bytes"] for e in self._read_manifest()["entries"].values())
+
 
 class DataLoader:
     """
     Utility class for loading raw data files from the data/raw directory.
+
+    Raw files are read through a storage backend (see src/data/storage.py): local
+    data/raw by default, or an Azure Blob container configured with set_storage() or
+    the DATA_STORAGE_* environment variables.
     """
 
-    RAW_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "raw")
+    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    RAW_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "raw")
+    PROCESSED_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "processed")
+    CACHE_DIR = os.path.join(PROCESSED_DATA_DIR, "cache")
+
+    _cache = None
+    _schema_registry = None
+    _storage = None
+    _default_storage = None
 
     @staticmethod
-    def load_csv(filename):
+    def set_storage(storage):
         """
-        Loads a CSV file from the data/raw directory.
+        Reads raw files from storage (a StorageBackend); None restores the default.
         """
-        file_path = os.path.join(DataLoader.RAW_DATA_DIR, filename)
-        if not os.path.exists(file_path):
+        DataLoader._storage = storage
+
+    @staticmethod
+    def get_storage():
+        """
+        Returns the configured storage backend, or the default one for RAW_DATA_DIR.
+        """
+        if DataLoader._storage is not None:
+            return DataLoader._storage
+        default = DataLoader._default_storage
+        if default is None or getattr(default, "root", None) not in (None, DataLoader.RAW_DATA_DIR):
+            DataLoader._default_storage = storage_from_env(DataLoader.RAW_DATA_DIR)
+        return DataLoader._default_storage
+
+    @staticmethod
+    def raw_path(filename):
+        """
+        Returns a local path holding the raw file (downloaded into the storage's cache
+        if needed), or None when the storage can only stream it.
+        Raises FileNotFoundError when the file does not exist.
+        """
+        storage = DataLoader.get_storage()
+        file_path = storage.local_path(filename)
+        if file_path is not None and not os.path.exists(file_path):
             raise FileNotFoundError(f"{file_path} does not exist.")
-        return pd.read_csv(file_path)
+        if file_path is None:
+            storage.stat(filename)
+        return file_path
+
+    @staticmethod
+    def get_cache():
+        """
+        Returns the shared columnar cache, creating it on first use.
+        """
+        if DataLoader._cache is None or DataLoader._cache.cache_dir != DataLoader.CACHE_DIR:
+            DataLoader._cache = ColumnarCache(DataLoader.CACHE_DIR)
+        return DataLoader._cache
+
+    @staticmethod
+    def get_schema_registry():
+        """
+        Returns the schema registry built from the data dictionaries in data/raw.
+        """
+        if DataLoader._schema_registry is None:
+            DataLoader._schema_registry = SchemaRegistry.from_directory(DataLoader.RAW_DATA_DIR)
+        return DataLoader._schema_registry
+
+    @staticmethod
+    def get_schema(name):
+        """
+        Returns the registered schema for a raw source (e.g. "sales", "inventory").
+        """
+        return DataLoader.get_schema_registry().get(name)
+
+    @staticmethod
+    def fingerprint(filenames, extra=None):
+        """
+        Returns one content fingerprint for a set of raw files (plus any extra
+        version information), reusing the cache's stored content hashes.
+        """
+        cache = DataLoader.get_cache()
+        storage = DataLoader.get_storage()
+        parts = {}
+        for filename in sorted(filenames):
+            if storage.local:
+                parts[filename] = cache.fingerprint(DataLoader.raw_path(filename))["sha256"]
+            else:
+                # The ETag versions a remote object without downloading it.
+                parts[filename] = storage.stat(filename).etag
+        payload = json.dumps({"files": parts, "extra": extra}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def load_csv(filename, columns=None, use_cache=False, schema=None, strict=False):
+        """
+        Loads a CSV file from the data/raw directory.
+        When use_cache is set, the parsed file is kept as a memory-mapped columnar
+        copy in data/processed/cache and only the requested columns are read back.
+        When a schema is given, columns are read with its compact dtypes; type
+        violations are logged, or raised as DataLoadingError when strict is set.
+        """
+        file_path = DataLoader.raw_path(filename)
+
+        def read(usecols=None):
+            with DataLoader._open(filename, file_path) as source:
+                if schema is None:
+                    return pd.read_csv(source, usecols=usecols)
+                df, violations = schema.read_csv(source, columns=usecols)
+            DataLoader._report_violations(filename, violations, strict)
+            return df
+
+        if not use_cache or file_path is None:
+            return read(columns)
+        extra = schema.fingerprint() if schema is not None else None
+        return DataLoader.get_cache().load(file_path, read, columns=columns, extra=extra)
+
+    @staticmethod
+    def iter_csv(filename, chunksize, columns=None, schema=None, strict=False):
+        """
+        Yields a CSV file from the data/raw directory in chunks of chunksize rows,
+        so only one chunk is held in memory at a time.
+        """
+        file_path = DataLoader.raw_path(filename)
+        with DataLoader._open(filename, file_path) as source:
+            if schema is None:
+                yield from pd.read_csv(source, usecols=columns, chunksize=chunksize)
+                return
+            for chunk, violations in schema.iter_csv(source, chunksize, columns=columns):
+                DataLoader._report_violations(filename, violations, strict)
+                yield chunk
+
+    @staticmethod
+    def _open(filename, file_path):
+        """
+        Opens a raw file for parsing: the local copy when there is one, otherwise a
+        stream from the storage backend that is parsed while it downloads.
+        """
+        if file_path is not None:
+            return contextlib.nullcontext(file_path)
+        return DataLoader.get_storage().open(filename)
+
+    @staticmethod
+    def write_partitioned(chunks, output_dir, partition_col=None):
+        """
+        Writes an iterable of DataFrames as an Arrow IPC dataset under output_dir.
+        With partition_col, each chunk is split into <partition_col>=<value>/ directories.
+        Returns the list of written file paths.
+        """
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        paths = []
+        for part, chunk in enumerate(chunks):
+            if partition_col is None:
+                groups = [(None, chunk)]
+            else:
+                groups = chunk.groupby(partition_col, sort=False, observed=True)
+            for value, group in groups:
+                target_dir = output_dir
+                if partition_col is not None:
+                    label = value.date().isoformat() if isinstance(value, pd.Timestamp) else value
+                    target_dir = os.path.join(output_dir, f"{partition_col}={label}")
+                os.makedirs(target_dir, exist_ok=True)
+                path = os.path.join(target_dir, f"part-{part:05d}.arrow")
+                table = pa.Table.from_pandas(group.reset_index(drop=True), preserve_index=False)
+                feather.write_feather(table, path, compression="uncompressed")
+                paths.append(path)
+        return paths
+
+    @staticmethod
+    def _report_violations(filename, violations, strict):
+        if not violations:
+            return
+        summary = "; ".join(f"{v.column}: {v.kind} x{v.count} {v.sample}" for v in violations)
+        if strict:
+            raise DataLoadingError(f"Type violations in {filename}: {summary}")
+        logging.warning(f"Type violations in {filename}: {summary}")
 
     @staticmethod
     def list_raw_files():
         """
-        Lists all files in the data/raw directory.
+        Lists all files in the data/raw directory (or the configured storage).
         """
-        return os.listdir(DataLoader.RAW_DATA_DIR)
\ No newline at end of file
+        return DataLoader.get_storage().list()
@@ -0,0 +1,198 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+# Columns that identify the grain of a dimension source besides the date.
+GRAIN_KEYS = ("FC_ID", "Brand")
+
+
+def aggregated_keys(columns, sales_columns):
+    """
+    Returns the grain keys a source with these columns is aggregated across when
+    joined onto sales, i.e. those sales does not carry.
+    """
+    return [k for k in GRAIN_KEYS if k in columns and k not in sales_columns]
+
+
+class JoinStage:
+    """
+    Row accounting for joining one dimension source onto sales.
+    """
+
+    def __init__(self, source, dimension_rows, grain_rows, keys, rows_before, rows_after,
+                 naive_rows, unmatched_rows):
+        self.source = source
+        self.dimension_rows = dimension_rows
+        self.grain_rows = grain_rows
+        self.keys = keys
+        self.rows_before = rows_before
+        self.rows_after = rows_after
+        self.naive_rows = naive_rows
+        self.unmatched_rows = unmatched_rows
+
+    @property
+    def multiplication_factor(self):
+        return self.rows_after / self.rows_before if self.rows_before else 1.0
+
+    @property
+    def naive_multiplication_factor(self):
+        """
+        Row growth a plain many-to-many merge on the date alone would have produced.
+        """
+        return self.naive_rows / self.rows_before if self.rows_before else 1.0
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "keys": self.keys,
+            "dimension_rows": self.dimension_rows,
+            "grain_rows": self.grain_rows,
+            "rows_before": self.rows_before,
+            "rows_after": self.rows_after,
+            "multiplication_factor": self.multiplication_factor,
+            "naive_multiplication_factor": self.naive_multiplication_factor,
+            "unmatched_rows": self.unmatched_rows,
+        }
+
+
+class GranularityJoiner:
+    """
+    Joins sales against dimension sources at the grain sales can actually match.
+
+    Each dimension is reduced to one row per join key: the date plus any grain key
+    (FC_ID, Brand) that sales also carries. Grain keys sales does not have are
+    aggregated away with a warning: counts, rates and prices are averaged, so a sales
+    row sees a typical FC's stock rather than the network total, and flags are true
+    when any row is, unless overridden. Every join is then many-to-one, so output rows
+    equal sales rows.
+
+    With asof=True, a sales date missing from a source takes that source's most recent
+    earlier row (within tolerance) instead of coming back empty.
+    """
+
+    def __init__(self, date_col="Date", asof=True, tolerance=None, aggregations=None):
+        self.date_col = date_col
+        self.asof = asof
+        self.tolerance = pd.Timedelta(tolerance) if tolerance is not None else None
+        self.aggregations = aggregations or {}
+        self.prepared = {}
+
+    # --- Preparation ---
+    def default_aggregation(self, series):
+        if pd.api.types.is_bool_dtype(series):
+            return "any"
+        if pd.api.types.is_numeric_dtype(series):
+            return "mean"
+        return None
+
+    def reduce(self, name, table, sales_columns):
+        """
+        Returns (reduced table, join keys) for one dimension source.
+        """
+        keys = [self.date_col] + [k for k in GRAIN_KEYS if k in table.columns and k in sales_columns]
+        table = table.copy(deep=False)
+        if not pd.api.types.is_datetime64_any_dtype(table[self.date_col]):
+            table[self.date_col] = pd.to_datetime(table[self.date_col], errors="coerce")
+        overrides = self.aggregations.get(name, {})
+        spec = {}
+        for column in table.columns:
+            if column in keys:
+                continue
+            how = overrides.get(column, self.default_aggregation(table[column]))
+            if how is not None:
+                spec[column] = how
+        if not table.duplicated(keys).any():
+            reduced = table[keys + list(spec)]
+        else:
+            lost = aggregated_keys(table.columns, sales_columns)
+            if lost:
+                logging.warning(
+                    f"Sales rows carry no {lost}, so {name} is aggregated across them to one row per "
+                    f"{keys}; its columns no longer vary by {lost}"
+                )
+            numeric = {c: (table[c].astype("float64")
+                           if pd.api.types.is_bool_dtype(table[c]) and spec[c] == "mean" else table[c])
+                       for c in spec}
+            reduced = pd.DataFrame({**{k: table[k] for k in keys}, **numeric}) \
+                .groupby(keys, sort=False, observed=True).agg(spec).reset_index()
+        reduced = reduced.dropna(subset=[self.date_col])
+        reduced = reduced.sort_values(self.date_col, kind="stable").reset_index(drop=True)
+        return reduced, keys
+
+    def fit(self, dimensions, sales_columns):
+        """
+        Reduces each dimension source to its join grain once, so repeated joins
+        (e.g. one per streamed sales chunk) reuse the prepared tables.
+        """
+        sales_columns = set(sales_columns)
+        self.prepared = {}
+        for name, table in dimensions.items():
+            reduced, keys = self.reduce(name, table, sales_columns)
+            date_counts = table[self.date_col].value_counts()
+            if not pd.api.types.is_datetime64_any_dtype(date_counts.index):
+                date_counts.index = pd.to_datetime(date_counts.index, errors="coerce")
+            self.prepared[name] = (reduced, keys, len(table), date_counts)
+        return self
+
+    # --- Join ---
+    def join(self, sales):
+        """
+        Joins sales with every prepared dimension, preserving sales row order.
+        Returns (DataFrame, list of JoinStage).
+        """
+        df = sales.reset_index(drop=True)
+        if not pd.api.types.is_datetime64_any_dtype(df[self.date_col]):
+            df[self.date_col] = pd.to_datetime(df[self.date_col], errors="coerce")
+        order = None
+        if not df[self.date_col].is_monotonic_increasing:
+            # NumPy sorts NaT last, so rows without a date end up in the tail.
+            order = np.argsort(df[self.date_col].to_numpy(), kind="stable")
+            df = df.iloc[order].reset_index(drop=True)
+        valid_rows = int(df[self.date_col].notna().sum())
+        df, undated = df.iloc[:valid_rows], df.iloc[valid_rows:]
+
+        stages = []
+        for name, (reduced, keys, dimension_rows, date_counts) in self.prepared.items():
+            rows_before = len(df) + len(undated)
+            reduced = self._suffix_collisions(name, reduced, df.columns, keys)
+            df, reduced = self._align_keys(df, reduced, keys[1:])
+            value_columns = [c for c in reduced.columns if c not in keys]
+            if self.asof:
+                df = pd.merge_asof(
+                    df, reduced, on=self.date_col, by=keys[1:] or None,
+                    direction="backward", tolerance=self.tolerance,
+                )
+            else:
+                df = df.join(reduced.set_index(keys), on=keys)
+            unmatched = len(undated)
+            if value_columns:
+                unmatched += int(df[value_columns].isna().all(axis=1).sum())
+            naive = len(undated) + int(df[self.date_col].map(date_counts).fillna(1).sum())
+            stages.append(JoinStage(
+                name, dimension_rows, len(reduced), keys, rows_before, len(df) + len(undated),
+                naive, unmatched,
+            ))
+
+        if len(undated):
+            df = pd.concat([df, undated], ignore_index=True)
+        if order is not None:
+            restored = np.empty_like(order)
+            restored[order] = np.arange(len(order))
+            df = df.iloc[restored].reset_index(drop=True)
+        return df, stages
+
+    @staticmethod
+    def _align_keys(df, reduced, keys):
+        # merge_asof refuses keys of different dtypes, e.g. a categorical Brand from a
+        # dictionary schema against a plain object Brand on sales.
+        for key in keys:
+            if df[key].dtype != reduced[key].dtype:
+                df = df.assign(**{key: df[key].astype(object)})
+                reduced = reduced.assign(**{key: reduced[key].astype(object)})
+        return df, reduced
+
+    @staticmethod
+    def _suffix_collisions(name, reduced, existing, keys):
+        renames = {c: f"{c}_{name}" for c in reduced.columns if c in existing and c not in keys}
+        return reduced.rename(columns=renames) if renames else reduced
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# --- Type Violations ---
+TypeViolation = namedtuple("TypeViolation", ["column", "kind", "count", "sample"])
+TypeViolation.__doc__ = """
+A column that did not match its declared type.
+kind is one of: missing_column, unparseable, non_integral, out_of_range.
+sample holds up to SAMPLE_SIZE offending raw values.
+"""
+
+SAMPLE_SIZE = 5
+
+# Dictionary "Data Type" -> compact dtype used at read time.
+# float32 keeps about 7 significant digits, enough for rates and ratios.
+COMPACT_DTYPES = {
+    "int64": "int32",
+    "float64": "float32",
+    "bool": "bool",
+    "object": "object",
+}
+
+DATE_COLUMNS = {"Date", "TransactionDate"}
+CATEGORY_COLUMNS = {"Brand", "FC_ID"}
+# Prices and the SellingPrice target keep full precision: float32 loses cents on sums.
+FLOAT64_COLUMNS = {"MRP", "NoPromoPrice", "SellingPrice", "BasePrice", "FinalPrice"}
+
+TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+FALSE_VALUES = {"false", "0", "no", "n", "f"}
+
+
+class ColumnSpec:
+    """
+    A single column as declared in a data dictionary.
+    """
+
+    def __init__(self, name, source_dtype, dtype, description=""):
+        self.name = name
+        self.source_dtype = source_dtype
+        self.dtype = dtype
+        self.description = description
+
+    def __repr__(self):
+        return f"ColumnSpec({self.name!r}, {self.source_dtype!r} -> {self.dtype!r})"
+
+
+class TableSchema:
+    """
+    Column specs for one raw source, with helpers to read and coerce CSVs to compact dtypes.
+    """
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = {column.name: column for column in columns}
+
+    @property
+    def date_columns(self):
+        return [name for name, spec in self.columns.items() if spec.dtype == "datetime64[ns]"]
+
+    def read_dtypes(self, columns=None):
+        """
+        Returns the dtype mapping for pd.read_csv (dates are handled through parse_dates).
+        Integers are parsed as int64 and range-checked before downcasting, because
+        read_csv wraps out-of-range values silently when given a narrower int dtype.
+        """
+        return {
+            name: ("int64" if spec.dtype.startswith("int") else spec.dtype)
+            for name, spec in self.columns.items()
+            if spec.dtype != "datetime64[ns]" and (columns is None or name in columns)
+        }
+
+    def fingerprint(self):
+        """
+        Returns a stable hash of the schema, used to key cached copies read with it.
+        """
+        payload = json.dumps({name: spec.dtype for name, spec in self.columns.items()}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def read_csv(self, file_path, columns=None, **kwargs):
+        """
+        Reads file_path (a path or a binary file object) with explicit compact dtypes.
+        Falls back to a lenient read plus per-column coercion when the file does not match
+        the schema. Returns (DataFrame, list of TypeViolation).
+        """
+        date_columns = [c for c in self.date_columns if columns is None or c in columns]
+        try:
+            df = pd.read_csv(
+                file_path, usecols=columns, dtype=self.read_dtypes(columns),
+                parse_dates=date_columns, **kwargs
+            )
+        except (ValueError, TypeError, OverflowError):
+            if hasattr(file_path, "seek"):
+                file_path.seek(0)
+            df = pd.read_csv(file_path, usecols=columns, **kwargs)
+        return self.coerce(df, columns=columns)
+
+    def iter_csv(self, file_path, chunksize, columns=None, **kwargs):
+        """
+        Reads file_path in chunks of chunksize rows, coercing each to the schema.
+        Chunks are parsed leniently because a typed read cannot recover mid-stream.
+        Integer and bool columns always get their nullable dtypes (Int32, boolean), so
+        every chunk has the same dtypes whether or not it has missing values.
+        Yields (DataFrame, list of TypeViolation).
+        """
+        for chunk in pd.read_csv(file_path, usecols=columns, chunksize=chunksize, **kwargs):
+            yield self.coerce(chunk, columns=columns, nullable=True)
+
+    def coerce(self, df, columns=None, nullable=False):
+        """
+        Casts df to the schema's compact dtypes in place of inferred ones.
+        Values that cannot be represented become missing and are reported. With nullable,
+        integer and bool columns are cast to their nullable dtypes even without missing values.
+        Returns (DataFrame, list of TypeViolation).
+        """
+        violations = []
+        expected = [name for name in self.columns if columns is None or name in columns]
+        for name in expected:
+            if name not in df.columns:
+                violations.append(TypeViolation(name, "missing_column", len(df), []))
+                continue
+            spec = self.columns[name]
+            if str(df[name].dtype) == (_nullable(spec.dtype) if nullable else spec.dtype):
+                continue
+            df[name], column_violations = self._coerce_column(df[name], spec)
+            if nullable and str(df[name].dtype) == spec.dtype:
+                df[name] = df[name].astype(_nullable(spec.dtype))
+            violations.extend(column_violations)
+        return df, violations
+
+    def validate(self, df):
+        """
+        Reports columns of df that are missing or not stored with their declared dtype.
+        """
+        violations = []
+        for name, spec in self.columns.items():
+            if name not in df.columns:
+                violations.append(TypeViolation(name, "missing_column", len(df), []))
+            elif not _dtype_matches(df[name].dtype, spec.dtype):
+                violations.append(TypeViolation(name, f"dtype:{df[name].dtype}", len(df), []))
+        return violations
+
+    def _coerce_column(self, series, spec):
+        violations = []
+        if spec.dtype == "datetime64[ns]":
+            coerced = pd.to_datetime(series, errors="coerce")
+            _record(violations, spec.name, "unparseable", coerced.isna() & series.notna(), series)
+            return coerced, violations
+        if spec.dtype == "category":
+            return series.astype("category"), violations
+        if spec.dtype == "bool":
+            text = series.astype(str).str.strip().str.lower()
+            coerced = pd.Series(pd.NA, index=series.index, dtype="boolean")
+            coerced[text.isin(TRUE_VALUES)] = True
+            coerced[text.isin(FALSE_VALUES)] = False
+            _record(violations, spec.name, "unparseable", coerced.isna() & series.notna(), series)
+            return (coerced.astype(bool) if not coerced.isna().any() else coerced), violations
+        if spec.dtype.startswith(("int", "float")):
+            numeric = pd.to_numeric(series, errors="coerce")
+            _record(violations, spec.name, "unparseable", numeric.isna() & series.notna(), series)
+            if spec.dtype.startswith("float"):
+                return numeric.astype(spec.dtype), violations
+            info = np.iinfo(spec.dtype)
+            non_integral = numeric.notna() & (numeric % 1 != 0)
+            _record(violations, spec.name, "non_integral", non_integral, series)
+            out_of_range = (numeric < info.min) | (numeric > info.max)
+            _record(violations, spec.name, "out_of_range", out_of_range, series)
+            if non_integral.any() or out_of_range.any():
+                # Keep the widest faithful representation rather than truncating values.
+                return numeric, violations
+            if numeric.isna().any():
+                return numeric.astype(spec.dtype.capitalize()), violations
+            return numeric.astype(spec.dtype), violations
+        return series, violations
+
+
+def _record(violations, column, kind, mask, series):
+    count = int(mask.sum())
+    if count:
+        sample = series[mask].head(SAMPLE_SIZE).tolist()
+        violations.append(TypeViolation(column, kind, count, sample))
+
+
+def _nullable(dtype):
+    if dtype == "bool":
+        return "boolean"
+    return dtype.capitalize() if dtype.startswith("int") else dtype
+
+
+def _dtype_matches(actual, declared):
+    actual = str(actual)
+    if declared.startswith("int"):
+        return actual in (declared, declared.capitalize())
+    if declared == "bool":
+        return actual in ("bool", "boolean")
+    return actual == declared
+
+
+class SchemaRegistry:
+    """
+    Schemas for the raw sources, built from the *_data_dictionary.csv files in data/raw.
+    """
+
+    DICTIONARY_SUFFIX = "_data_dictionary.csv"
+
+    def __init__(self, schemas=None):
+        self.schemas = dict(schemas or {})
+
+    @classmethod
+    def from_directory(cls, directory, overrides=None):
+        """
+        Builds a registry from every data dictionary in directory.
+        overrides maps source name -> {column: dtype} to replace the default compact dtype.
+        """
+        overrides = overrides or {}
+        registry = cls()
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(cls.DICTIONARY_SUFFIX):
+                name = filename[:-len(cls.DICTIONARY_SUFFIX)]
+                registry.register(cls.load_dictionary(
+                    os.path.join(directory, filename), name, overrides.get(name)
+                ))
+        return registry
+
+    @staticmethod
+    def load_dictionary(file_path, name, overrides=None):
+        """
+        Reads a data dictionary (Column Name, Data Type, Description) into a TableSchema.
+        """
+        overrides = overrides or {}
+        dictionary = pd.read_csv(file_path)
+        columns = []
+        for row in dictionary.itertuples(index=False):
+            column, source_dtype = row[0].strip(), row[1].strip()
+            description = row[2] if len(row) > 2 else ""
+            columns.append(ColumnSpec(
+                column, source_dtype, overrides.get(column, compact_dtype(column, source_dtype)), description
+            ))
+        return TableSchema(name, columns)
+
+    def register(self, schema):
+        self.schemas[schema.name] = schema
+
+    def get(self, name):
+        if name not in self.schemas:
+            raise KeyError(f"No schema registered for source '{name}'.")
+        return self.schemas[name]
+
+    def for_file(self, filename):
+        """
+        Returns the schema whose source name prefixes filename, or None.
+        """
+        base = os.path.basename(filename)
+        for name in sorted(self.schemas, key=len, reverse=True):
+            if base.startswith(name):
+                return self.schemas[name]
+        return None
+
+    def names(self):
+        return list(self.schemas)
+
+
+def compact_dtype(column, source_dtype):
+    """
+    Maps a dictionary data type to the smallest dtype that holds the column.
+    """
+    if column in DATE_COLUMNS:
+        return "datetime64[ns]"
+    if column in CATEGORY_COLUMNS:
+        return "category"
+    if column in FLOAT64_COLUMNS and source_dtype == "float64":
+        return "float64"
+    return COMPACT_DTYPES.get(source_dtype, source_dtype)
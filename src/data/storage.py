@@ -0,0 +1,443 @@
+import abc
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+
+class ObjectInfo:
+    """
+    Size and version of a stored object; etag changes whenever the content does.
+    """
+
+    def __init__(self, name, size, etag):
+        self.name = name
+        self.size = size
+        self.etag = etag
+
+
+# --- Storage backends ---
+class StorageBackend(abc.ABC):
+    """
+    Interface of a raw data store, addressed by object name (e.g. "sales_data_dictionary.csv").
+
+    local_path(name) returns a path on the local disk holding the object, or None when
+    the backend can only stream it through open(name).
+    """
+
+    local = False
+
+    @abc.abstractmethod
+    def stat(self, name):
+        """
+        Returns the ObjectInfo of name; raises FileNotFoundError when it does not exist.
+        """
+
+    @abc.abstractmethod
+    def open(self, name):
+        """
+        Returns a readable binary stream of name.
+        """
+
+    @abc.abstractmethod
+    def list(self, prefix=""):
+        """
+        Returns the sorted names of the objects starting with prefix.
+        """
+
+    def local_path(self, name):
+        return None
+
+    def exists(self, name):
+        try:
+            self.stat(name)
+        except FileNotFoundError:
+            return False
+        return True
+
+
+class LocalStorage(StorageBackend):
+    """
+    Objects are files under root; this is what DataLoader reads data/raw through.
+    """
+
+    local = True
+
+    def __init__(self, root):
+        self.root = root
+
+    def local_path(self, name):
+        return os.path.join(self.root, name)
+
+    def stat(self, name):
+        path = self.local_path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} does not exist.")
+        stat = os.stat(path)
+        return ObjectInfo(name, stat.st_size, f"{stat.st_size}-{stat.st_mtime_ns}")
+
+    def open(self, name):
+        self.stat(name)
+        return open(self.local_path(name), "rb")
+
+    def list(self, prefix=""):
+        return sorted(name for name in os.listdir(self.root) if name.startswith(prefix))
+
+
+def _is_not_found(error):
+    return type(error).__name__ == "ResourceNotFoundError" or getattr(error, "status_code", None) == 404
+
+
+def _unmodified_since(etag):
+    """
+    Download options that make a range fail if the blob changed after etag was read,
+    so one download never mixes two versions of a blob.
+    """
+    try:
+        from azure.core import MatchConditions
+    except ImportError:
+        return {}
+    return {"etag": etag, "match_condition": MatchConditions.IfNotModified}
+
+
+class BlobStorage(StorageBackend):
+    """
+    Azure Blob Storage container (or an emulator such as Azurite), with blob names
+    optionally under prefix.
+
+    open(name) streams a blob as parallel byte-range requests of chunk_size bytes,
+    max_concurrency in flight, so parsers read it while it downloads and at most
+    max_concurrency chunks are held in memory. With cache (a BlobCache), local_path()
+    keeps a content-addressed copy on disk and only checks the blob's ETag on later
+    reads; without one it returns None and readers stream every time.
+    """
+
+    def __init__(self, container_client, prefix="", cache=None, chunk_size=8 * 1024 ** 2, max_concurrency=8):
+        self.container = container_client
+        self.prefix = prefix
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+
+    @classmethod
+    def from_connection_string(cls, connection_string, container_name, **kwargs):
+        """
+        Connects with a connection string; "UseDevelopmentStorage=true" targets Azurite.
+        """
+        from azure.storage.blob import ContainerClient
+
+        return cls(ContainerClient.from_connection_string(connection_string, container_name), **kwargs)
+
+    @classmethod
+    def from_account(cls, account_url, container_name, credential=None, **kwargs):
+        """
+        Connects to https://<account>.blob.core.windows.net with credential, defaulting
+        to DefaultAzureCredential (managed identity, environment, CLI login).
+        """
+        from azure.storage.blob import ContainerClient
+
+        if credential is None:
+            from azure.identity import DefaultAzureCredential
+
+            credential = DefaultAzureCredential()
+        return cls(ContainerClient(account_url, container_name, credential=credential), **kwargs)
+
+    def _blob_name(self, name):
+        return f"{self.prefix.rstrip('/')}/{name}" if self.prefix else name
+
+    def stat(self, name):
+        try:
+            properties = self.container.get_blob_client(self._blob_name(name)).get_blob_properties()
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(f"Blob {self._blob_name(name)} does not exist.") from e
+            raise
+        return ObjectInfo(name, properties.size, properties.etag)
+
+    def list(self, prefix=""):
+        start = len(self._blob_name(""))
+        return sorted(blob.name[start:] for blob in self.container.list_blobs(name_starts_with=self._blob_name(prefix)))
+
+    def open(self, name, info=None):
+        """
+        Returns a buffered, read-only stream of the blob downloaded in parallel ranges.
+        """
+        info = info or self.stat(name)
+        blob = self.container.get_blob_client(self._blob_name(name))
+        options = _unmodified_since(info.etag)
+
+        def fetch(offset, length):
+            return blob.download_blob(offset=offset, length=length, **options).readall()
+
+        reader = RangeReader(fetch, info.size, self.chunk_size, self.max_concurrency)
+        return io.BufferedReader(reader, buffer_size=min(self.chunk_size, 1024 ** 2))
+
+    def local_path(self, name):
+        if self.cache is None:
+            return None
+        info = self.stat(name)
+        key = f"{getattr(self.container, 'url', '')}/{self._blob_name(name)}"
+        path = self.cache.lookup(key, info.etag)
+        if path is not None:
+            return path
+
+        def download(f):
+            with self.open(name, info) as stream:
+                for block in iter(lambda: stream.read(1024 ** 2), b""):
+                    f.write(block)
+
+        return self.cache.store(key, info.etag, download)
+
+
+class RangeReader(io.RawIOBase):
+    """
+    Sequential reader over an object of size bytes fetched by fetch(offset, length).
+
+    The next max_concurrency chunks are always being downloaded on a thread pool
+    while the caller consumes the current one, and chunks are handed out in order.
+    Seeking restarts the prefetch at the new position.
+    """
+
+    def __init__(self, fetch, size, chunk_size=8 * 1024 ** 2, max_concurrency=8):
+        super().__init__()
+        self._fetch = fetch
+        self.size = size
+        self.chunk_size = chunk_size
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="range-reader")
+        self._pending = deque()
+        self._buffer = memoryview(b"")
+        self._position = 0
+        self._next_offset = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._cancel()
+        self._position = self._next_offset = min(max(offset, 0), self.size)
+        return self._position
+
+    def _schedule(self):
+        while len(self._pending) < self.max_concurrency and self._next_offset < self.size:
+            length = min(self.chunk_size, self.size - self._next_offset)
+            self._pending.append(self._executor.submit(self._fetch, self._next_offset, length))
+            self._next_offset += length
+
+    def readinto(self, b):
+        if not self._buffer:
+            self._schedule()
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._schedule()
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        self._position += n
+        return n
+
+    def _cancel(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._buffer = memoryview(b"")
+
+    def close(self):
+        if not self.closed:
+            self._cancel()
+            self._executor.shutdown(wait=True)
+        super().close()
+
+
+# --- Download cache ---
+@contextmanager
+def file_lock(path, thread_lock=None):
+    """
+    Holds an exclusive flock on path (created if missing) and, optionally, thread_lock,
+    so that threads and processes sharing a cache serialize their index updates. The
+    lock file is separate from the index, which is replaced rather than rewritten.
+    Without fcntl (non-POSIX), only thread_lock is taken.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with thread_lock or nullcontext(), open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def last_access(path):
+    """
+    Returns the time path was last used (its mtime, bumped with os.utime on cache
+    hits), or 0 when it is missing.
+    """
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+class BlobCache:
+    """
+    Content-addressed disk cache for downloaded objects.
+
+    Each object is stored once under objects/<sha256>, however many names or versions
+    point at it; the index maps a key (container and blob name) to the ETag and hash it
+    was downloaded at. A lookup is only a hit while the ETag is unchanged. Once the
+    stored objects exceed max_bytes, the least recently used ones are evicted.
+
+    Index updates hold a file lock, so several processes can share the cache. Hits do
+    not rewrite the index: they only touch the object file, whose mtime is its last use.
+    """
+
+    INDEX_NAME = "index.json"
+    LOCK_NAME = "index.lock"
+
+    def __init__(self, cache_dir, max_bytes=10 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # --- Index ---
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_NAME)
+
+    def _locked(self):
+        return file_lock(os.path.join(self.cache_dir, self.LOCK_NAME), self._lock)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"blobs": {}, "objects": {}}
+
+    def _write_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path())
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, "objects", digest)
+
+    # --- Entries ---
+    def lookup(self, key, etag):
+        """
+        Returns the cached path of key at etag, or None when it is missing or outdated.
+        """
+        with self._locked():
+            index = self._read_index()
+            entry = index["blobs"].get(key)
+            if entry is None or entry["etag"] != etag:
+                return None
+            path = self._object_path(entry["sha256"])
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                index["blobs"].pop(key)
+                index["objects"].pop(entry["sha256"], None)
+                self._write_index(index)
+                return None
+            return path
+
+    def store(self, key, etag, write):
+        """
+        Calls write(file) to download the object, stores it by content hash and returns
+        its path. The download is hashed as it is written, without a second read.
+        """
+        os.makedirs(os.path.join(self.cache_dir, "objects"), exist_ok=True)
+        tmp_path = os.path.join(self.cache_dir, "objects", f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            hashing = _HashingWriter(f)
+            write(hashing)
+        digest, size = hashing.digest.hexdigest(), hashing.size
+        path = self._object_path(digest)
+        os.replace(tmp_path, path)
+        with self._locked():
+            index = self._read_index()
+            index["blobs"][key] = {"etag": etag, "sha256": digest}
+            index["objects"][digest] = {"bytes": size}
+            self._evict(index, keep=digest)
+            self._write_index(index)
+        return path
+
+    def _evict(self, index, keep=None):
+        objects = index["objects"]
+        total = sum(o["bytes"] for o in objects.values())
+        for digest in sorted(objects, key=lambda d: last_access(self._object_path(d))):
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            total -= objects.pop(digest)["bytes"]
+            for key in [k for k, e in index["blobs"].items() if e["sha256"] == digest]:
+                del index["blobs"][key]
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                logging.debug(f"Cached object {digest} was already removed.")
+
+    def size_bytes(self):
+        return sum(o["bytes"] for o in self._read_index()["objects"].values())
+
+
+class _HashingWriter:
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.digest.update(data)
+        self.size += len(data)
+        return self.f.write(data)
+
+
+def storage_from_env(default_root):
+    """
+    Returns BlobStorage when DATA_STORAGE_CONTAINER is set, else LocalStorage(default_root).
+
+    The blob container is reached through DATA_STORAGE_CONNECTION_STRING, or
+    DATA_STORAGE_ACCOUNT_URL with DefaultAzureCredential; DATA_STORAGE_PREFIX selects
+    a folder and DATA_STORAGE_CACHE_DIR enables the download cache.
+    """
+    container = os.environ.get("DATA_STORAGE_CONTAINER")
+    if not container:
+        return LocalStorage(default_root)
+    cache_dir = os.environ.get("DATA_STORAGE_CACHE_DIR")
+    kwargs = {
+        "prefix": os.environ.get("DATA_STORAGE_PREFIX", ""),
+        "cache": BlobCache(cache_dir) if cache_dir else None,
+    }
+    connection_string = os.environ.get("DATA_STORAGE_CONNECTION_STRING")
+    if connection_string:
+        return BlobStorage.from_connection_string(connection_string, container, **kwargs)
+    account_url = os.environ.get("DATA_STORAGE_ACCOUNT_URL")
+    if not account_url:
+        raise ValueError("DATA_STORAGE_CONTAINER needs DATA_STORAGE_CONNECTION_STRING or DATA_STORAGE_ACCOUNT_URL.")
+    return BlobStorage.from_account(account_url, container, **kwargs)
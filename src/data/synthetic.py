@@ -0,0 +1,219 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data.schema import SchemaRegistry
+
+# The shipped data dictionaries, independent of where DataLoader currently reads from.
+DICTIONARY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              "data", "raw")
+SOURCES = ("sales", "competitor", "customer_behavior", "inventory")
+
+
+class SyntheticDataGenerator:
+    """
+    Seeded raw data for the four sources, shaped by the data dictionaries.
+
+    Every source has exactly the columns of its *_data_dictionary.csv, in order.
+    Columns the generator knows follow realistic relationships:
+    - SellingPrice <= NoPromoPrice <= MRP, with brand-level price points
+    - units sold respond to the discount through a per-brand elasticity
+    - competitor prices cluster around each brand's MRP
+    - inventory is simulated day by day per FC, with reorders and lead times
+    Other dictionary columns are filled with plausible values for their declared type.
+
+    Sales are generated in blocks of block_rows, each seeded from (seed, source, block).
+    Any number of rows can therefore be streamed to disk, and the same seed and
+    block_rows always produce the same data. Sales dates are spread evenly over days
+    and are in time order. With sales_keys, sales rows also carry FC_ID and Brand so
+    the dimension joins happen at that grain.
+    """
+
+    def __init__(self, rows=10_000, days=365, fcs=4, brands=3, seed=0, start_date="2024-01-01",
+                 sales_keys=False, block_rows=100_000, dictionary_dir=DICTIONARY_DIR):
+        if rows < 1 or days < 1 or fcs < 1 or brands < 1:
+            raise ValueError("rows, days, fcs and brands must be positive.")
+        self.rows = int(rows)
+        self.days = int(days)
+        self.seed = seed
+        self.sales_keys = sales_keys
+        self.block_rows = int(block_rows)
+        self.registry = SchemaRegistry.from_directory(dictionary_dir)
+        self.dates = pd.date_range(start_date, periods=self.days, freq="D")
+        self.fc_ids = np.array([f"FC{i + 1:03d}" for i in range(fcs)])
+        self.brands = np.array([f"Brand{i + 1:03d}" for i in range(brands)])
+
+        rng = self._rng("economics")
+        self.brand_mrp = rng.uniform(150, 600, brands).round(-1)
+        self.brand_demand = rng.uniform(5, 40, brands)
+        self.brand_elasticity = rng.uniform(1.2, 3.0, brands)
+        self.fc_metro = rng.random(fcs) < 0.5
+        self.fc_demand = rng.uniform(80, 400, fcs) * np.where(self.fc_metro, 1.5, 1.0)
+
+    def _rng(self, source, block=0):
+        key = SOURCES.index(source) if source in SOURCES else len(SOURCES)
+        return np.random.default_rng(np.random.SeedSequence([self.seed, key, block]))
+
+    def _weekend(self, dates):
+        return np.asarray(pd.DatetimeIndex(dates).dayofweek >= 5)
+
+    # --- Sources ---
+    def sales_blocks(self):
+        """
+        Yields the sales rows block by block.
+        """
+        for block, start in enumerate(range(0, self.rows, self.block_rows)):
+            yield self._sales_block(block, start, min(start + self.block_rows, self.rows))
+
+    def _sales_block(self, block, start, stop):
+        rng = self._rng("sales", block)
+        n = stop - start
+        day = np.arange(start, stop, dtype=np.int64) * self.days // self.rows
+        dates = self.dates[day]
+        brand = rng.integers(0, len(self.brands), n)
+        mrp = (self.brand_mrp[brand] * rng.uniform(0.9, 1.1, n)).round(2)
+        no_promo = (mrp * (1 - rng.beta(2, 18, n))).round(2)
+        promo = np.where(rng.random(n) < 0.3, rng.uniform(0.05, 0.25, n), 0.0)
+        selling = np.minimum((no_promo * (1 - promo)).round(2), no_promo)
+        demand = self.brand_demand[brand] * (selling / mrp) ** -self.brand_elasticity[brand]
+        demand *= np.where(self._weekend(dates), 1.2, 1.0)
+        columns = {
+            "TransactionDate": dates,
+            "MRP": mrp,
+            "NoPromoPrice": no_promo,
+            "SellingPrice": selling,
+            "UnitsSold": 1 + rng.poisson(demand),
+        }
+        df = self._conform("sales", columns, n, rng)
+        if self.sales_keys:
+            df["FC_ID"] = self.fc_ids[rng.integers(0, len(self.fc_ids), n)]
+            df["Brand"] = self.brands[brand]
+        return df
+
+    def sales(self):
+        return pd.concat(self.sales_blocks(), ignore_index=True)
+
+    def competitor(self):
+        rng = self._rng("competitor")
+        n_brands = len(self.brands)
+        n = self.days * n_brands
+        brand = np.tile(np.arange(n_brands), self.days)
+        mrp = (self.brand_mrp[brand] * rng.uniform(0.95, 1.05, n)).round(2)
+        discount = rng.uniform(0, 30, n).round(1)
+        base = (mrp * (1 - discount / 100)).round(2)
+        columns = {
+            "Date": np.repeat(self.dates, n_brands),
+            "Brand": self.brands[brand],
+            "MRP": mrp,
+            "DiscountRate": discount,
+            "BasePrice": base,
+            "FinalPrice": (base * rng.uniform(0.97, 1.0, n)).round(2),
+        }
+        return self._conform("competitor", columns, n, rng)
+
+    def customer_behavior(self):
+        rng = self._rng("customer_behavior")
+        n = self.days
+        weekend = self._weekend(self.dates)
+        view_to_cart = rng.uniform(0.5, 0.8, n)
+        columns = {
+            "Date": self.dates,
+            "CTR": np.clip(rng.normal(0.04, 0.008, n) + 0.01 * weekend, 0.005, 0.2),
+            "AbandonedCartRate": rng.uniform(0.55, 0.8, n),
+            "BounceRate": rng.uniform(0.3, 0.6, n),
+            "FunnelDrop_ViewToCart": view_to_cart,
+            "FunnelDrop_CartToCheckout": view_to_cart * rng.uniform(0.3, 0.6, n),
+            "ReturningVisitorRatio": rng.uniform(0.2, 0.6, n),
+            "AvgSessionDuration_sec": rng.lognormal(np.log(180), 0.3, n).round(1),
+        }
+        return self._conform("customer_behavior", columns, n, rng)
+
+    def inventory(self):
+        rng = self._rng("inventory")
+        n_fcs = len(self.fc_ids)
+        reorder_point = (self.fc_demand * 5).astype(np.int64)
+        safety_stock = (self.fc_demand * 1.5).astype(np.int64)
+        order_qty = (self.fc_demand * 7).astype(np.int64)
+        stock = (self.fc_demand * rng.uniform(5, 10, n_fcs)).astype(np.int64)
+        arrival = np.full(n_fcs, -1)
+        pending = np.zeros(n_fcs, dtype=np.int64)
+        weekend = self._weekend(self.dates)
+        days = []
+        for day in range(self.days):
+            demand = rng.poisson(self.fc_demand * (1.2 if weekend[day] else 1.0))
+            fulfilled = np.minimum(demand, stock)
+            received = np.where(arrival == day, pending, 0)
+            pending = np.where(arrival == day, 0, pending)
+            arrival = np.where(arrival == day, -1, arrival)
+            end = stock - fulfilled + received
+            lead_time = rng.uniform(1, 4, n_fcs).round(2)
+            placed = (end < reorder_point) & (arrival < 0)
+            arrival = np.where(placed, day + np.ceil(lead_time).astype(np.int64), arrival)
+            pending = np.where(placed, order_qty, pending)
+            days.append((demand, fulfilled, end, placed, lead_time, stock))
+            stock = end
+        demand, fulfilled, end, placed, lead_time, start = (np.concatenate(part) for part in zip(*days))
+        columns = {
+            "Date": np.repeat(self.dates, n_fcs),
+            "FC_ID": np.tile(self.fc_ids, self.days),
+            "IsMetro": np.tile(self.fc_metro, self.days),
+            "StockStart": start,
+            "Demand": demand,
+            "DemandFulfilled": fulfilled,
+            "Backorders": demand - fulfilled,
+            "StockEnd": end,
+            "ReorderPoint": np.tile(reorder_point, self.days),
+            "OrderPlaced": placed.astype(np.int64),
+            "OrderQty": np.where(placed, np.tile(order_qty, self.days), 0),
+            "LeadTimeFloat": lead_time,
+            "SafetyStock": np.tile(safety_stock, self.days),
+        }
+        return self._conform("inventory", columns, self.days * n_fcs, rng)
+
+    def _conform(self, source, columns, n, rng):
+        """
+        Returns a frame with exactly the dictionary's columns, in its order.
+        """
+        schema = self.registry.get(source)
+        data = {}
+        for name, spec in schema.columns.items():
+            data[name] = columns[name] if name in columns else self._fallback(spec, n, rng)
+        return pd.DataFrame(data)
+
+    @staticmethod
+    def _fallback(spec, n, rng):
+        if spec.source_dtype == "float64":
+            return rng.random(n).round(4)
+        if spec.source_dtype == "int64":
+            return rng.integers(0, 100, n)
+        if spec.source_dtype == "bool":
+            return rng.random(n) < 0.5
+        return np.array([f"{spec.name}_{i}" for i in range(8)])[rng.integers(0, 8, n)]
+
+    # --- Output ---
+    def generate(self):
+        """
+        Returns {source: DataFrame} for all four sources, with sales held in memory.
+        """
+        return {
+            "sales": self.sales(),
+            "competitor": self.competitor(),
+            "customer_behavior": self.customer_behavior(),
+            "inventory": self.inventory(),
+        }
+
+    def write(self, directory):
+        """
+        Writes the sources as the pipeline's raw files (<source>_data_dictionary.csv)
+        into directory, streaming sales one block at a time. Returns {source: path}.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {source: os.path.join(directory, f"{source}{SchemaRegistry.DICTIONARY_SUFFIX}")
+                 for source in SOURCES}
+        for header, block in enumerate(self.sales_blocks(), start=-1):
+            block.to_csv(paths["sales"], mode="a" if header >= 0 else "w", header=header < 0,
+                         index=False, date_format="%Y-%m-%d")
+        for source in SOURCES[1:]:
+            getattr(self, source)().to_csv(paths[source], index=False, date_format="%Y-%m-%d")
+        return paths
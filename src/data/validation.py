@@ -0,0 +1,315 @@
+import abc
+import operator
+
+import numpy as np
+import pandas as pd
+
+from src.utils.error_handler import DataValidationError
+
+ERROR = "error"
+WARNING = "warning"
+
+SAMPLE_SIZE = 5
+
+_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+# --- Rules ---
+class Rule(abc.ABC):
+    """
+    Base class for a declarative column rule.
+    Subclasses implement violations(df) returning a boolean mask that is True for
+    offending rows. Missing values pass every rule except NotNullRule.
+    """
+
+    def __init__(self, name, columns, severity=ERROR):
+        self.name = name
+        self.columns = list(columns)
+        self.severity = severity
+
+    def applies_to(self, df):
+        return all(column in df.columns for column in self.columns)
+
+    @abc.abstractmethod
+    def violations(self, df):
+        """
+        Returns a boolean mask of the rows of df that break the rule.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class RangeRule(Rule):
+    """
+    Values of column must lie within [min_value, max_value]; bounds are exclusive
+    when inclusive is False.
+    """
+
+    def __init__(self, column, min_value=None, max_value=None, inclusive=True, severity=ERROR, name=None):
+        super().__init__(name or f"{column}_range", [column], severity)
+        self.column = column
+        self.min_value = min_value
+        self.max_value = max_value
+        self.inclusive = inclusive
+
+    def violations(self, df):
+        values = df[self.column].to_numpy(dtype="float64", na_value=np.nan)
+        mask = np.zeros(len(values), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if self.min_value is not None:
+                mask |= values < self.min_value if self.inclusive else values <= self.min_value
+            if self.max_value is not None:
+                mask |= values > self.max_value if self.inclusive else values >= self.max_value
+        return mask
+
+
+class NotNullRule(Rule):
+    """
+    Column must not contain missing values.
+    """
+
+    def __init__(self, column, severity=ERROR, name=None):
+        super().__init__(name or f"{column}_not_null", [column], severity)
+        self.column = column
+
+    def violations(self, df):
+        return df[self.column].isna().to_numpy()
+
+
+class NonEmptyRowRule(Rule):
+    """
+    Rows must have at least one non-missing value.
+    """
+
+    def __init__(self, severity=ERROR, name="non_empty_row"):
+        super().__init__(name, [], severity)
+
+    def violations(self, df):
+        return df.isna().all(axis=1).to_numpy()
+
+
+class MonotonicRule(Rule):
+    """
+    Column must be non-decreasing (or strictly increasing) in row order, optionally
+    within groups of the by columns.
+    """
+
+    def __init__(self, column, strict=False, by=None, severity=ERROR, name=None):
+        by = [by] if isinstance(by, str) else list(by or [])
+        super().__init__(name or f"{column}_monotonic", [column] + by, severity)
+        self.column = column
+        self.strict = strict
+        self.by = by
+
+    def violations(self, df):
+        if self.by:
+            diff = df.groupby(self.by, sort=False, observed=True)[self.column].diff()
+        else:
+            diff = df[self.column].diff()
+        zero = pd.Timedelta(0) if pd.api.types.is_timedelta64_dtype(diff) else 0
+        mask = diff <= zero if self.strict else diff < zero
+        return mask.fillna(False).to_numpy(dtype=bool)
+
+
+class ReferentialRule(Rule):
+    """
+    Every value of column must appear in reference (e.g. the dates of another source).
+    """
+
+    def __init__(self, column, reference, reference_name="reference", severity=ERROR, name=None):
+        super().__init__(name or f"{column}_in_{reference_name}", [column], severity)
+        self.column = column
+        self.reference = pd.Index(pd.unique(pd.Series(reference).dropna()))
+
+    def violations(self, df):
+        values = df[self.column]
+        return (values.notna() & ~values.isin(self.reference)).to_numpy()
+
+
+class CompareRule(Rule):
+    """
+    Cross-column comparison: left <op> right must hold, where right is a column
+    name or a constant.
+    """
+
+    def __init__(self, left, op, right, severity=ERROR, name=None):
+        if op not in _OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        columns = [left] + ([right] if isinstance(right, str) else [])
+        super().__init__(name or f"{left}{op}{right}", columns, severity)
+        self.left = left
+        self.op = op
+        self.right = right
+
+    def violations(self, df):
+        left = df[self.left]
+        right = df[self.right] if isinstance(self.right, str) else self.right
+        holds = _OPERATORS[self.op](left, right)
+        missing = left.isna() | (right.isna() if isinstance(right, pd.Series) else False)
+        return (~holds & ~missing).to_numpy()
+
+
+class ExpressionRule(Rule):
+    """
+    Arbitrary vectorized check: func(df) returns a boolean Series/array that is True
+    for valid rows.
+    """
+
+    def __init__(self, name, columns, func, severity=ERROR):
+        super().__init__(name, columns, severity)
+        self.func = func
+
+    def violations(self, df):
+        valid = self.func(df)
+        if isinstance(valid, pd.Series):
+            valid = valid.fillna(True).to_numpy(dtype=bool)
+        mask = ~np.asarray(valid, dtype=bool)
+        if self.columns:
+            mask &= ~df[self.columns].isna().any(axis=1).to_numpy()
+        return mask
+
+
+# --- Report ---
+class RuleResult:
+    """
+    Outcome of one rule: violation count and a sample of offending row labels.
+    """
+
+    def __init__(self, rule, violations, sample_indices, skipped=False):
+        self.rule = rule
+        self.violations = violations
+        self.sample_indices = sample_indices
+        self.skipped = skipped
+
+    @property
+    def name(self):
+        return self.rule.name
+
+    @property
+    def severity(self):
+        return self.rule.severity
+
+    def to_dict(self):
+        return {
+            "rule": self.name,
+            "severity": self.severity,
+            "violations": self.violations,
+            "sample_indices": self.sample_indices,
+            "skipped": self.skipped,
+        }
+
+
+class ValidationReport:
+    """
+    Structured result of running a Validator over a frame.
+    """
+
+    def __init__(self, total_rows, results, invalid_mask):
+        self.total_rows = total_rows
+        self.results = results
+        self.invalid_mask = invalid_mask
+
+    @property
+    def errors(self):
+        return [r for r in self.results if r.severity == ERROR and r.violations]
+
+    @property
+    def warnings(self):
+        return [r for r in self.results if r.severity == WARNING and r.violations]
+
+    @property
+    def passed(self):
+        return not self.errors
+
+    @property
+    def invalid_rows(self):
+        return int(self.invalid_mask.sum())
+
+    def summary(self):
+        failing = self.errors + self.warnings
+        if not failing:
+            return f"All {len(self.results)} rules passed on {self.total_rows} rows."
+        return "; ".join(
+            f"{r.name} [{r.severity}]: {r.violations} rows, e.g. {r.sample_indices}" for r in failing
+        )
+
+    def to_dict(self):
+        return {
+            "total_rows": self.total_rows,
+            "invalid_rows": self.invalid_rows,
+            "passed": self.passed,
+            "results": [r.to_dict() for r in self.results],
+        }
+
+    def raise_for_errors(self):
+        """
+        Raises DataValidationError when any error-severity rule was violated.
+        """
+        if not self.passed:
+            raise DataValidationError(f"Data validation failed: {self.summary()}", report=self)
+
+
+# --- Engine ---
+class Validator:
+    """
+    Evaluates a set of rules as vectorized masks in a single pass over a frame.
+    Rules whose columns are absent are reported as skipped rather than failing.
+    """
+
+    def __init__(self, rules, sample_size=SAMPLE_SIZE):
+        self.rules = list(rules)
+        self.sample_size = sample_size
+
+    def validate(self, df):
+        results = []
+        invalid = np.zeros(len(df), dtype=bool)
+        for rule in self.rules:
+            if not rule.applies_to(df):
+                results.append(RuleResult(rule, 0, [], skipped=True))
+                continue
+            mask = rule.violations(df)
+            count = int(mask.sum())
+            sample = df.index[mask][:self.sample_size].tolist() if count else []
+            if rule.severity == ERROR:
+                invalid |= mask
+            results.append(RuleResult(rule, count, sample))
+        return ValidationReport(len(df), results, invalid)
+
+
+def default_rules():
+    """
+    Rules applied to the merged pricing frame.
+    """
+    positive = [
+        RangeRule(col, min_value=0, inclusive=False, name=f"{col}_positive")
+        for col in ['MRP', 'NoPromoPrice', 'SellingPrice', 'UnitsSold']
+    ]
+    return [NonEmptyRowRule()] + positive + [
+        CompareRule('SellingPrice', '<=', 'MRP', severity=WARNING),
+        # There is no receipts column, so StockEnd = StockStart - DemandFulfilled + received
+        # is checked through its implication received >= 0, up to the rounding of counts
+        # averaged across FCs by the join.
+        ExpressionRule(
+            'stock_balance', ['StockEnd', 'StockStart', 'DemandFulfilled'],
+            lambda df: df['StockEnd'] >= df['StockStart'] - df['DemandFulfilled'] - 1e-6,
+            severity=WARNING,
+        ),
+    ]
+
+
+def referential_rules(dimensions, column='TransactionDate', reference_column='Date'):
+    """
+    Rules requiring every sales date to be present in each dimension source.
+    """
+    return [
+        ReferentialRule(column, table[reference_column], reference_name=name, severity=WARNING)
+        for name, table in dimensions.items() if reference_column in table.columns
+    ]
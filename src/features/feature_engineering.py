@@ -1,11 +1,255 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+
 class FeatureEngineer:
-    def __init__(self):
-        pass
+    """
+    Builds the dynamic pricing features and keeps enough state to extend them incrementally.
+
+    PriceElasticity needs the previous row's SellingPrice and UnitsSold, and rolling
+    features need the last window-1 values. Both are kept per partition (e.g. FC_ID), so
+    transform() on newly appended days only touches the new rows and matches a full
+    recompute over the whole history. Rows are expected in time order within a partition.
+    """
+
+    LAG_COLUMNS = ("SellingPrice", "UnitsSold")
+    ENGAGEMENT_WEIGHTS = {"CTR": 0.4, "ReturningVisitorRatio": 0.3, "AvgSessionDuration_sec": 0.3}
+
+    # Bump a feature's version whenever its definition changes, so materialized
+    # copies of it in the feature store are recomputed.
+    FEATURE_VERSIONS = {
+        "PriceElasticity": 1,
+        "EngagementScore": 1,
+        "InventoryHealth": 1,
+        "CompetitorPriceGap": 1,
+    }
+    ROLLING_VERSION = 1
+
+    def __init__(self, partition_cols=None, rolling_windows=None):
+        self.partition_cols = list(partition_cols or [])
+        self.rolling_windows = dict(rolling_windows or {})
+        self.last_values = {}
+        self.buffers = {}
+
+    def feature_versions(self):
+        """
+        Returns {feature name: version string} for the features this engineer produces.
+        Versions of stateful features include the partitioning they were computed with.
+        """
+        partitioned = f"+by={','.join(self.partition_cols)}" if self.partition_cols else ""
+        versions = {name: f"v{version}" for name, version in self.FEATURE_VERSIONS.items()}
+        versions["PriceElasticity"] += partitioned
+        for col, window in self.rolling_windows.items():
+            versions[f"{col}_rolling_mean_{window}"] = f"v{self.ROLLING_VERSION}{partitioned}"
+        return versions
+
+    # --- Public API ---
+    def fit(self, data):
+        """
+        Resets the state and records the tail of data without computing features.
+        """
+        self.last_values, self.buffers = {}, {}
+        self._update_state(data)
+        return self
+
+    def transform(self, data, features=None):
+        """
+        Adds the feature columns to data, continuing from the stored state, and
+        advances the state past data. features restricts which columns are computed.
+        """
+        wanted = set(features) if features is not None else None
+        df = data.copy()
+        if wanted is None or 'PriceElasticity' in wanted:
+            self._add_elasticity(df)
+        self._add_row_features(df, wanted)
+        self._add_rolling_features(df, wanted)
+        self._update_state(data)
+        return df
+
+    def fit_transform(self, data, features=None):
+        """
+        Computes the features over the full history, starting from empty state.
+        """
+        self.last_values, self.buffers = {}, {}
+        return self.transform(data, features)
 
     def create_features(self, data):
-        # Implement feature extraction logic here
-        pass
+        """
+        Full recompute of the features for data.
+        """
+        return self.fit_transform(data)
 
     def transform_data(self, data):
-        # Implement data transformation logic here
-        pass
\ No newline at end of file
+        """
+        Incremental feature computation for rows appended after the last call.
+        """
+        return self.transform(data)
+
+    # --- Features ---
+    def _add_elasticity(self, df):
+        if not all(col in df.columns for col in self.LAG_COLUMNS):
+            return
+        # Price elasticity: % change in units sold / % change in price
+        changes = {}
+        # Zero prices or unchanged prices give inf/NaN, as pct_change does, without warnings.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for col in self.LAG_COLUMNS:
+                filled, previous = self._lagged(df, col)
+                changes[col] = filled / previous - 1
+            df['PriceElasticity'] = changes['UnitsSold'] / changes['SellingPrice']
+
+    def _add_row_features(self, df, wanted=None):
+        # Customer engagement: combine CTR, ReturningVisitorRatio, AvgSessionDuration_sec
+        if wanted is None or 'EngagementScore' in wanted:
+            engagement = 0
+            for col, weight in self.ENGAGEMENT_WEIGHTS.items():
+                if col in df.columns:
+                    engagement = engagement + df[col].fillna(0) * weight
+            df['EngagementScore'] = engagement
+        # Inventory health: (StockEnd - SafetyStock) / Demand
+        if wanted is None or 'InventoryHealth' in wanted:
+            if 'StockEnd' in df.columns and 'SafetyStock' in df.columns and 'Demand' in df.columns:
+                df['InventoryHealth'] = (df['StockEnd'] - df['SafetyStock']) / (df['Demand'] + 1e-5)
+        # Competitor price gap
+        if wanted is None or 'CompetitorPriceGap' in wanted:
+            if 'FinalPrice' in df.columns:
+                df['CompetitorPriceGap'] = df['SellingPrice'] - df['FinalPrice']
+
+    def _add_rolling_features(self, df, wanted=None):
+        for col, window in self.rolling_windows.items():
+            name = f"{col}_rolling_mean_{window}"
+            if col not in df.columns or (wanted is not None and name not in wanted):
+                continue
+            history = self._with_buffer(df, col, window)
+            if self.partition_cols:
+                rolled = history.groupby(self.partition_cols, sort=False, observed=True)[col] \
+                    .rolling(window, min_periods=1).mean() \
+                    .reset_index(level=list(range(len(self.partition_cols))), drop=True)
+            else:
+                rolled = history[col].rolling(window, min_periods=1).mean()
+            df[name] = rolled.loc[history.index[history['_new']]].to_numpy()
+
+    # --- State ---
+    def _state_for_rows(self, df, col):
+        """
+        Returns the stored last value of col for each row's partition (NaN when unseen).
+        """
+        if not self.partition_cols:
+            value = self.last_values.get((), {}).get(col, np.nan)
+            return np.full(len(df), value, dtype="float64")
+        if not self.last_values:
+            return np.full(len(df), np.nan)
+        state = pd.Series(
+            [values.get(col, np.nan) for values in self.last_values.values()],
+            index=pd.MultiIndex.from_tuples(list(self.last_values), names=self.partition_cols),
+            dtype="float64",
+        )
+        rows = pd.MultiIndex.from_frame(df[self.partition_cols].astype(object))
+        return state.reindex(rows).to_numpy()
+
+    def _lagged(self, df, col):
+        """
+        Returns (padded values, previous padded values) of col, continuing from the state.
+        Missing values are forward-filled first, as Series.pct_change does.
+        """
+        values = df[col].astype("float64").reset_index(drop=True)
+        last = self._state_for_rows(df, col)
+        if self.partition_cols:
+            groups = [df[c].reset_index(drop=True) for c in self.partition_cols]
+            filled = values.groupby(groups, sort=False, observed=True).ffill()
+            first = ~df.duplicated(self.partition_cols).to_numpy()
+        else:
+            filled = values.ffill()
+            first = np.zeros(len(df), dtype=bool)
+            first[:1] = True
+        # Only leading gaps of a partition remain after ffill; they continue the state.
+        filled = filled.fillna(pd.Series(last))
+        if self.partition_cols:
+            previous = filled.groupby(groups, sort=False, observed=True).shift(1)
+        else:
+            previous = filled.shift(1)
+        previous[first] = last[first]
+        return filled.to_numpy(), previous.to_numpy()
+
+    def _with_buffer(self, df, col, window):
+        new = df[self.partition_cols + [col]].reset_index(drop=True).assign(_new=True)
+        rows = [
+            dict(zip(self.partition_cols, key), **{col: value, "_new": False})
+            for key, buffer in self.buffers.get(col, {}).items() for value in buffer
+        ]
+        if not rows:
+            return new
+        history = pd.concat([pd.DataFrame(rows), new], ignore_index=True)
+        for c in self.partition_cols:
+            history[c] = history[c].astype(object)
+        return history
+
+    def _update_state(self, df):
+        if df.empty:
+            return
+        for col in self.LAG_COLUMNS:
+            if col not in df.columns:
+                continue
+            if self.partition_cols:
+                last = df.groupby(self.partition_cols, sort=False, observed=True)[col].last()
+                items = zip(_as_tuples(last.index), last.to_numpy())
+            else:
+                non_null = df[col].dropna()
+                items = [((), non_null.iloc[-1])] if len(non_null) else []
+            for key, value in items:
+                if not pd.isna(value):
+                    self.last_values.setdefault(key, {})[col] = float(value)
+        for col, window in self.rolling_windows.items():
+            if col not in df.columns or window <= 1:
+                continue
+            history = self._with_buffer(df, col, window)
+            if self.partition_cols:
+                tails = history.groupby(self.partition_cols, sort=False, observed=True).tail(window - 1)
+                buffers = {}
+                group_keys = self.partition_cols if len(self.partition_cols) > 1 else self.partition_cols[0]
+                for key, group in tails.groupby(group_keys, sort=False, observed=True):
+                    buffers[_as_tuples([key])[0]] = group[col].astype(float).tolist()
+            else:
+                buffers = {(): history[col].tail(window - 1).astype(float).tolist()}
+            self.buffers.setdefault(col, {}).update(buffers)
+
+    # --- Persistence ---
+    def get_state(self):
+        return {
+            "partition_cols": self.partition_cols,
+            "rolling_windows": self.rolling_windows,
+            "last_values": [[list(key), values] for key, values in self.last_values.items()],
+            "buffers": {
+                col: [[list(key), buffer] for key, buffer in buffers.items()]
+                for col, buffers in self.buffers.items()
+            },
+        }
+
+    def save_state(self, path):
+        """
+        Persists the incremental state as JSON.
+        """
+        with open(path, "w") as f:
+            json.dump(self.get_state(), f)
+
+    @classmethod
+    def load_state(cls, path):
+        """
+        Restores a FeatureEngineer saved with save_state.
+        """
+        with open(path, "r") as f:
+            state = json.load(f)
+        engineer = cls(state["partition_cols"], state["rolling_windows"])
+        engineer.last_values = {tuple(key): values for key, values in state["last_values"]}
+        engineer.buffers = {
+            col: {tuple(key): buffer for key, buffer in buffers}
+            for col, buffers in state["buffers"].items()
+        }
+        return engineer
+
+
+def _as_tuples(index):
+    keys = [key if isinstance(key, tuple) else (key,) for key in index]
+    return [tuple(k.item() if isinstance(k, np.generic) else k for k in key) for key in keys]
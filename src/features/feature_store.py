@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+from src.data.storage import file_lock
+
+
+class FeatureStore:
+    """
+    Materialized feature matrices under data/processed, keyed by input fingerprint.
+
+    Layout per fingerprint of the raw inputs:
+        <root>/<fingerprint>/base.arrow                       merged, validated input
+        <root>/<fingerprint>/features/<name>@<version>.arrow  one file per feature column
+        <root>/<fingerprint>/meta.json                        row count and last use
+
+    Each feature column is stored on its own, so bumping one feature's version only
+    recomputes that column. Files are uncompressed Arrow IPC and are memory-mapped
+    on read. Writes, reads and gc hold <root>/store.lock, so a run collecting garbage
+    never deletes an entry another run is writing or reading.
+    """
+
+    BASE_NAME = "base.arrow"
+    META_NAME = "meta.json"
+    FEATURES_DIR = "features"
+    ABSENT_SUFFIX = ".absent"
+    LOCK_NAME = "store.lock"
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _locked(self):
+        return file_lock(os.path.join(self.root, self.LOCK_NAME), self._lock)
+
+    # --- Paths ---
+    def _dir(self, fingerprint):
+        return os.path.join(self.root, fingerprint)
+
+    def _feature_path(self, fingerprint, name, version, suffix=".arrow"):
+        return os.path.join(self._dir(fingerprint), self.FEATURES_DIR, f"{name}@{version}{suffix}")
+
+    # --- IO ---
+    @staticmethod
+    def _write(df, path):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path, columns=None):
+        import pyarrow.feather as feather
+
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    def _touch(self, fingerprint, rows=None):
+        # Callers hold the store lock; meta.json is replaced, never rewritten in place.
+        meta_path = os.path.join(self._dir(fingerprint), self.META_NAME)
+        meta = {}
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            pass
+        meta["last_used"] = time.time()
+        if rows is not None:
+            meta["rows"] = rows
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    # --- Lookup ---
+    def has_base(self, fingerprint):
+        return os.path.exists(os.path.join(self._dir(fingerprint), self.BASE_NAME))
+
+    def missing_features(self, fingerprint, versions):
+        """
+        Returns the feature names not materialized at the requested versions.
+        """
+        return [
+            name for name, version in versions.items()
+            if not os.path.exists(self._feature_path(fingerprint, name, version))
+            and not os.path.exists(self._feature_path(fingerprint, name, version, self.ABSENT_SUFFIX))
+        ]
+
+    def save_base(self, fingerprint, df):
+        with self._locked():
+            self._write(df, os.path.join(self._dir(fingerprint), self.BASE_NAME))
+            self._touch(fingerprint, rows=len(df))
+
+    def save_features(self, fingerprint, df, versions):
+        """
+        Stores each column of df named in versions as its own feature file. Features
+        df does not have (their inputs are missing) are recorded as absent so they are
+        not recomputed on every lookup.
+        """
+        with self._locked():
+            for name, version in versions.items():
+                if name in df.columns:
+                    self._write(df[[name]], self._feature_path(fingerprint, name, version))
+                else:
+                    path = self._feature_path(fingerprint, name, version, self.ABSENT_SUFFIX)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    open(path, "w").close()
+            self._touch(fingerprint)
+
+    def load(self, fingerprint, versions, columns=None):
+        """
+        Returns the base frame joined with the requested feature versions.
+        columns restricts the base columns that are read.
+        """
+        with self._locked():
+            df = self._read(os.path.join(self._dir(fingerprint), self.BASE_NAME), columns)
+            for name, version in versions.items():
+                path = self._feature_path(fingerprint, name, version)
+                if os.path.exists(path):
+                    df[name] = self._read(path)[name].to_numpy()
+            self._touch(fingerprint)
+        return df
+
+    def materialize(self, fingerprint, versions, build_base, compute_features):
+        """
+        Returns the feature frame for fingerprint, building only what is missing.
+        build_base() produces the merged input; compute_features(base, names) returns a
+        frame holding at least the named feature columns.
+        """
+        if not self.has_base(fingerprint):
+            self.save_base(fingerprint, build_base())
+        missing = self.missing_features(fingerprint, versions)
+        if missing:
+            with self._locked():
+                base = self._read(os.path.join(self._dir(fingerprint), self.BASE_NAME))
+            computed = compute_features(base, missing)
+            self.save_features(fingerprint, computed, {name: versions[name] for name in missing})
+        return self.load(fingerprint, versions)
+
+    # --- Garbage collection ---
+    def fingerprints(self):
+        if not os.path.isdir(self.root):
+            return []
+        return [name for name in os.listdir(self.root) if os.path.isdir(self._dir(name))]
+
+    def _last_used(self, fingerprint):
+        try:
+            with open(os.path.join(self._dir(fingerprint), self.META_NAME), "r") as f:
+                return json.load(f).get("last_used", 0)
+        except (OSError, ValueError):
+            return 0
+
+    def gc(self, keep=(), keep_latest=1, versions=None):
+        """
+        Removes stale entries and returns the removed paths.
+        Fingerprints other than keep and the keep_latest most recently used are
+        deleted. With versions, feature files of other versions are deleted from the
+        remaining fingerprints.
+        """
+        with self._locked():
+            return self._gc(keep, keep_latest, versions)
+
+    def _gc(self, keep, keep_latest, versions):
+        removed = []
+        ranked = sorted(self.fingerprints(), key=self._last_used, reverse=True)
+        kept = set(keep) | set(ranked[:keep_latest])
+        for fingerprint in ranked:
+            if fingerprint not in kept:
+                shutil.rmtree(self._dir(fingerprint), ignore_errors=True)
+                removed.append(self._dir(fingerprint))
+        if versions is None:
+            return removed
+        current = {
+            f"{name}@{version}{suffix}"
+            for name, version in versions.items() for suffix in (".arrow", self.ABSENT_SUFFIX)
+        }
+        for fingerprint in kept & set(ranked):
+            features_dir = os.path.join(self._dir(fingerprint), self.FEATURES_DIR)
+            if not os.path.isdir(features_dir):
+                continue
+            for filename in os.listdir(features_dir):
+                if filename not in current:
+                    os.remove(os.path.join(features_dir, filename))
+                    removed.append(os.path.join(features_dir, filename))
+        return removed
+
@@ -0,0 +1,273 @@
+import hashlib
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils.error_handler import CircuitBreaker, ExperimentLoggingError, RetryBudget, retry_on_exception
+
+# MLflow rejects log_batch calls above these sizes.
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+
+ARTIFACT_STORE_TAG = "artifact_store"
+ARTIFACT_TAG_PREFIX = "artifact."
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _is_permanent(error):
+    return isinstance(error, (FileNotFoundError, PermissionError, ValueError, TypeError))
+
+
+class ArtifactStore:
+    """
+    Content-addressed artifacts for one experiment.
+
+    Every distinct file is uploaded once, to sha256/<hash>/<filename> of a dedicated
+    run tagged artifact_store=true; runs that log the same content again only record a
+    runs:/ URI pointing at the stored copy.
+    """
+
+    PREFIX = "sha256"
+
+    def __init__(self, client, experiment_id):
+        self.client = client
+        self.experiment_id = experiment_id
+        self.run_id = None
+        self.known = set()
+
+    def _ensure_run(self):
+        if self.run_id is not None:
+            return
+        runs = self.client.search_runs(
+            [self.experiment_id], filter_string=f"tags.{ARTIFACT_STORE_TAG} = 'true'", max_results=1,
+        )
+        if runs:
+            self.run_id = runs[0].info.run_id
+            self.known = {os.path.basename(f.path) for f in self.client.list_artifacts(self.run_id, self.PREFIX)}
+        else:
+            run = self.client.create_run(self.experiment_id, tags={ARTIFACT_STORE_TAG: "true"},
+                                         run_name="artifact-store")
+            self.run_id = run.info.run_id
+
+    def put(self, local_path):
+        """
+        Uploads local_path unless its content is already stored; returns its runs:/ URI.
+        """
+        self._ensure_run()
+        digest = file_sha256(local_path)
+        artifact_path = f"{self.PREFIX}/{digest}"
+        if digest not in self.known:
+            self.client.log_artifact(self.run_id, local_path, artifact_path)
+            self.known.add(digest)
+        return f"runs:/{self.run_id}/{artifact_path}/{os.path.basename(local_path)}"
+
+
+class ExperimentLogger:
+    """
+    Batched, background MLflow logging.
+
+    Params, metrics and tags are buffered per run and sent as log_batch calls (split at
+    MLflow's batch limits); artifacts and models are uploaded through the
+    ArtifactStore. All tracking calls run on one worker thread in submission order, so
+    the caller never waits on the tracking server until flush() or close(), which
+    block until everything queued has been sent and raise the first failure. Failed
+    calls are retried with backoff behind a circuit breaker.
+    """
+
+    def __init__(self, tracking_uri=None, experiment_name=None, client=None, breaker=None):
+        if client is None:
+            from mlflow.tracking import MlflowClient
+
+            client = MlflowClient(tracking_uri)
+        self.client = client
+        self.experiment_id = self._experiment_id(experiment_name)
+        self.artifacts = ArtifactStore(client, self.experiment_id)
+        self.buffers = {}
+        self.errors = []
+        # Transient tracking-server errors are retried; once the server keeps failing,
+        # the breaker opens and the remaining calls fail fast instead of each timing out.
+        self.breaker = breaker or CircuitBreaker(max_failures=3, reset_timeout=30)
+        self._call = retry_on_exception(
+            retries=3, delay=0.5, budget=RetryBudget(), give_up=_is_permanent,
+        )(self.breaker.call)
+        self.tasks = queue.Queue()
+        self.worker = threading.Thread(target=self._work, name="mlflow-logger", daemon=True)
+        self.worker.start()
+
+    def _experiment_id(self, experiment_name):
+        if experiment_name is None:
+            # MLFLOW_EXPERIMENT_ID / MLFLOW_EXPERIMENT_NAME (setup_mlflow_tracking exports
+            # the latter), or MLflow's default experiment.
+            from mlflow.entities import Experiment
+
+            experiment_id = os.environ.get("MLFLOW_EXPERIMENT_ID")
+            if experiment_id:
+                return experiment_id
+            experiment_name = os.environ.get("MLFLOW_EXPERIMENT_NAME") or Experiment.DEFAULT_EXPERIMENT_NAME
+        experiment = self.client.get_experiment_by_name(experiment_name)
+        if experiment is not None:
+            return experiment.experiment_id
+        return self.client.create_experiment(experiment_name)
+
+    # --- Runs ---
+    def create_run(self, run_name=None, tags=None):
+        """
+        Creates a run synchronously (its id is needed by the caller) and returns its id.
+        """
+        run = self.client.create_run(self.experiment_id, tags=tags, run_name=run_name)
+        self.buffers[run.info.run_id] = {"params": [], "metrics": [], "tags": []}
+        return run.info.run_id
+
+    def end_run(self, run_id, status="FINISHED"):
+        self._flush_buffer(run_id)
+        self.buffers.pop(run_id, None)
+        self._submit(self.client.set_terminated, run_id, status)
+
+    @contextmanager
+    def start_run(self, run_name=None, tags=None):
+        run_id = self.create_run(run_name, tags)
+        try:
+            yield run_id
+        except BaseException:
+            self.end_run(run_id, "FAILED")
+            raise
+        self.end_run(run_id)
+
+    # --- Params, metrics and tags ---
+    def log_params(self, run_id, params):
+        from mlflow.entities import Param
+
+        self._buffer(run_id, "params", [Param(key, str(value)) for key, value in params.items()])
+
+    def log_metrics(self, run_id, metrics, step=0):
+        from mlflow.entities import Metric
+
+        timestamp = int(time.time() * 1000)
+        entries = []
+        for key, value in metrics.items():
+            if value is None:
+                logging.debug(f"Skipping metric {key} without a value.")
+                continue
+            entries.append(Metric(key, float(value), timestamp, step))
+        self._buffer(run_id, "metrics", entries)
+
+    def set_tags(self, run_id, tags):
+        from mlflow.entities import RunTag
+
+        self._buffer(run_id, "tags", [RunTag(key, str(value)) for key, value in tags.items()])
+
+    def _buffer(self, run_id, kind, entries):
+        buffer = self.buffers.setdefault(run_id, {"params": [], "metrics": [], "tags": []})
+        buffer[kind].extend(entries)
+        self._flush_buffer(run_id, full_only=True)
+
+    def _flush_buffer(self, run_id, full_only=False):
+        """
+        Submits the run's buffered entries as log_batch calls. With full_only, only
+        batches that reach one of MLflow's limits are sent and the rest stays buffered.
+        """
+        buffer = self.buffers.get(run_id)
+        if not buffer:
+            return
+        params, metrics, tags = buffer["params"], buffer["metrics"], buffer["tags"]
+        while params or metrics or tags:
+            # Params and tags are capped at 100 per batch, and everything at 1000 in total.
+            room = MAX_METRICS_PER_BATCH - min(len(params), MAX_PARAMS_PER_BATCH) - min(len(tags), MAX_TAGS_PER_BATCH)
+            full = len(params) >= MAX_PARAMS_PER_BATCH or len(tags) >= MAX_TAGS_PER_BATCH or len(metrics) >= room
+            if full_only and not full:
+                break
+            batch_params, params = params[:MAX_PARAMS_PER_BATCH], params[MAX_PARAMS_PER_BATCH:]
+            batch_tags, tags = tags[:MAX_TAGS_PER_BATCH], tags[MAX_TAGS_PER_BATCH:]
+            batch_metrics, metrics = metrics[:room], metrics[room:]
+            self._submit(self.client.log_batch, run_id, batch_metrics, batch_params, batch_tags)
+        self.buffers[run_id] = {"params": params, "metrics": metrics, "tags": tags}
+
+    # --- Artifacts ---
+    def log_artifact(self, run_id, local_path):
+        """
+        Queues local_path for content-addressed upload; the run gets an
+        artifact.<filename> tag with the stored copy's URI. The file must not change
+        until the upload has completed (see flush()).
+        """
+        self._submit(self._log_artifact, run_id, local_path)
+
+    def _log_artifact(self, run_id, local_path):
+        uri = self.artifacts.put(local_path)
+        self.client.set_tag(run_id, f"{ARTIFACT_TAG_PREFIX}{os.path.basename(local_path)}", uri)
+
+    def log_model(self, run_id, model, artifact_path):
+        """
+        Serializes an sklearn model now and uploads it to the run in the background.
+        """
+        import mlflow.sklearn
+
+        local_dir = tempfile.mkdtemp(prefix="mlflow_model_")
+        model_dir = os.path.join(local_dir, artifact_path)
+        mlflow.sklearn.save_model(model, model_dir)
+        self._submit(self._log_model, run_id, local_dir, model_dir, artifact_path)
+
+    def _log_model(self, run_id, local_dir, model_dir, artifact_path):
+        try:
+            self.client.log_artifacts(run_id, model_dir, artifact_path)
+        finally:
+            shutil.rmtree(local_dir, ignore_errors=True)
+
+    # --- Worker ---
+    def _submit(self, fn, *args):
+        if not self.worker.is_alive():
+            raise ExperimentLoggingError("The experiment logger is closed.")
+        self.tasks.put((fn, args))
+
+    def _work(self):
+        while True:
+            task = self.tasks.get()
+            try:
+                if task is None:
+                    return
+                fn, args = task
+                try:
+                    self._call(fn, *args)
+                except Exception as e:
+                    logging.error(f"MLflow call {getattr(fn, '__name__', fn)} failed: {e}")
+                    self.errors.append(e)
+            finally:
+                self.tasks.task_done()
+
+    def flush(self):
+        """
+        Sends all buffered entries, waits until every queued call has completed and
+        raises ExperimentLoggingError if any of them failed.
+        """
+        for run_id in list(self.buffers):
+            self._flush_buffer(run_id)
+        self.tasks.join()
+        if self.errors:
+            errors, self.errors = self.errors, []
+            raise ExperimentLoggingError(f"{len(errors)} MLflow call(s) failed; first: {errors[0]}")
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.worker.is_alive():
+                self.tasks.put(None)
+                self.worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,28 +1,50 @@
-import mlflow
-from mlflow import log_param, log_metric, start_run, end_run
+import os
+import time
+
+from src.mlflow_integration.experiment_logger import MAX_PARAMS_PER_BATCH
 
 def setup_mlflow_tracking(uri: str = None, experiment_name: str = None):
     """
-    Sets up MLflow tracking URI and experiment name.
+    Sets up MLflow tracking URI and experiment name. The name is also exported as
+    MLFLOW_EXPERIMENT_NAME, which is how ExperimentLogger picks it up.
     """
+    import mlflow
+
     if uri:
         mlflow.set_tracking_uri(uri)
     if experiment_name:
         mlflow.set_experiment(experiment_name)
+        os.environ["MLFLOW_EXPERIMENT_NAME"] = experiment_name
+
+def _log_batch(metrics=(), params=()):
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    run_id = mlflow.active_run().info.run_id
+    client = MlflowClient()
+    for start in range(0, max(len(metrics), len(params)), MAX_PARAMS_PER_BATCH):
+        client.log_batch(
+            run_id,
+            metrics=metrics[start:start + MAX_PARAMS_PER_BATCH],
+            params=params[start:start + MAX_PARAMS_PER_BATCH],
+        )
 
 def log_experiment_params(params):
     """
-    Logs experiment parameters to MLflow.
+    Logs experiment parameters to MLflow in batched calls.
     """
-    for key, value in params.items():
-        log_param(key, value)
+    from mlflow.entities import Param
+
+    _log_batch(params=[Param(key, str(value)) for key, value in params.items()])
 
 def log_experiment_metrics(metrics):
     """
-    Logs experiment metrics to MLflow.
+    Logs experiment metrics to MLflow in batched calls.
     """
-    for key, value in metrics.items():
-        log_metric(key, value)
+    from mlflow.entities import Metric
+
+    timestamp = int(time.time() * 1000)
+    _log_batch(metrics=[Metric(key, float(value), timestamp, 0) for key, value in metrics.items()])
 
 def log_model(model, model_name):
     """
@@ -35,6 +57,8 @@ def run_mlflow_experiment(params, metrics, model, model_name, uri=None, experime
     """
     Complete MLflow experiment run: setup, log params, metrics, and model.
     """
+    from mlflow import end_run, start_run
+
     setup_mlflow_tracking(uri, experiment_name)
     with start_run():
         log_experiment_params(params)
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import time
+
+import numpy as np
+
+from src.utils.error_handler import ModelArtifactError
+
+MAGIC = b"PRICEMDL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+# Magic bytes, then the length of the JSON header that follows.
+_PREAMBLE = struct.Struct("<8sQ")
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _pickle_out_of_band(obj):
+    """
+    Pickles obj with protocol 5, keeping its NumPy arrays out of the pickle stream.
+    Returns (pickle bytes, list of raw buffers).
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return data, [buffer.raw() for buffer in buffers]
+
+
+# --- Writing ---
+def save_model(model, path, compile=True, X_check=None, rtol=1e-7, atol=1e-9):
+    """
+    Writes a PricingModel as a model artifact and returns its header.
+
+    Layout: MAGIC, header length, a JSON header, then 64-byte aligned raw buffers.
+    The buffers hold the compiled predictor's arrays (tree node tables or folded
+    coefficients) and the NumPy arrays of the pickled scaler and estimator, which are
+    stored out of band (pickle protocol 5). The header lists every buffer's offset,
+    dtype and shape, the format version and a SHA-256 of everything after the header.
+
+    With compile, a model that is not compiled yet is compiled for the artifact (when
+    its estimator supports it); X_check compares the compiled predictions with the
+    sklearn path first, as in PricingModel.compile().
+    """
+    from src.models.compiled import check_equivalence, compile_model, predictor_arrays
+
+    predictor = getattr(model, "compiled", None)
+    if predictor is None and compile:
+        try:
+            predictor = compile_model(model.model, model.scaler)
+        except TypeError:
+            predictor = None
+        if predictor is not None and X_check is not None:
+            check_equivalence(model._predict(X_check), predictor.predict(model._as_array(X_check)), rtol, atol)
+
+    feature_names = getattr(model.scaler, "feature_names_in_", None)
+    sections = []  # (bytes-like, header entry to receive offset and nbytes)
+    header = {
+        "format_version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "model_version": getattr(model, "version", 0),
+        "estimator": type(model.model).__name__,
+        "scaler": type(model.scaler).__name__,
+        "feature_names": [str(name) for name in feature_names] if feature_names is not None else None,
+        "compiled": None,
+        "pickles": {},
+    }
+    if predictor is not None:
+        kind, arrays, state = predictor_arrays(predictor)
+        header["compiled"] = {"kind": kind, "state": state, "arrays": {}}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            entry = {"dtype": array.dtype.str, "shape": list(array.shape)}
+            header["compiled"]["arrays"][name] = entry
+            sections.append((array.view(np.uint8).reshape(-1) if array.size else b"", entry))
+    for name in ("scaler", "estimator"):
+        data, buffers = _pickle_out_of_band(model.scaler if name == "scaler" else model.model)
+        entry = {"buffers": [{} for _ in buffers]}
+        header["pickles"][name] = entry
+        sections.append((data, entry))
+        sections.extend(zip(buffers, entry["buffers"]))
+
+    # Offsets are relative to the start of the payload, which follows the header.
+    offset = 0
+    for data, entry in sections:
+        offset = _aligned(offset)
+        entry.update(offset=offset, nbytes=memoryview(data).nbytes)
+        offset += entry["nbytes"]
+    digest = hashlib.sha256()
+    position = 0
+    for data, entry in sections:
+        digest.update(b"\0" * (entry["offset"] - position))
+        digest.update(data)
+        position = entry["offset"] + entry["nbytes"]
+    header.update(payload_bytes=position, checksum={"algorithm": "sha256", "digest": digest.hexdigest()})
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    payload_start = _aligned(_PREAMBLE.size + len(header_bytes))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (payload_start - _PREAMBLE.size - len(header_bytes)))
+        position = 0
+        for data, entry in sections:
+            f.write(b"\0" * (entry["offset"] - position))
+            f.write(data)
+            position = entry["offset"] + entry["nbytes"]
+    os.replace(tmp_path, path)
+    return header
+
+
+# --- Reading ---
+def is_artifact(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _open(path):
+    """
+    Memory-maps path read-only and returns (mmap, header, payload start).
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            raise ModelArtifactError(f"{path} is empty.") from e
+    if len(mapped) < _PREAMBLE.size:
+        raise ModelArtifactError(f"{path} is not a model artifact.")
+    magic, header_length = _PREAMBLE.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ModelArtifactError(f"{path} is not a model artifact.")
+    try:
+        header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length])
+    except ValueError as e:
+        raise ModelArtifactError(f"{path} has an unreadable header.") from e
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ModelArtifactError(
+            f"{path} has format version {header.get('format_version')}; this code reads version {FORMAT_VERSION}."
+        )
+    payload_start = _aligned(_PREAMBLE.size + header_length)
+    if len(mapped) < payload_start + header["payload_bytes"]:
+        raise ModelArtifactError(f"{path} is truncated.")
+    return mapped, header, payload_start
+
+
+def _verify(path, mapped, header, payload_start):
+    view = memoryview(mapped)[payload_start:payload_start + header["payload_bytes"]]
+    try:
+        digest = hashlib.sha256(view).hexdigest()
+    finally:
+        view.release()
+    if digest != header["checksum"]["digest"]:
+        raise ModelArtifactError(f"{path} failed its checksum; the file is corrupted.")
+
+
+def read_header(path):
+    mapped, header, _ = _open(path)
+    mapped.close()
+    return header
+
+
+def verify_artifact(path):
+    """
+    Checks the artifact's format version and checksum; returns its header.
+    """
+    mapped, header, payload_start = _open(path)
+    try:
+        _verify(path, mapped, header, payload_start)
+    finally:
+        mapped.close()
+    return header
+
+
+def load_model(path, verify=True):
+    """
+    Loads a model artifact as a PricingModel whose arrays are read-only views of
+    the memory-mapped file, so processes loading the same file share one physical
+    copy through the page cache and loading costs no copying or unpickling.
+
+    The compiled predictor (if saved) is ready at once; the scaler and estimator are
+    unpickled on first access, e.g. for retraining or the sklearn predict path.
+    verify reads the whole file to check its checksum; a server can verify once and
+    have its workers load with verify=False.
+    """
+    from src.models.compiled import predictor_from_arrays
+    from src.models.model import PricingModel
+
+    mapped, header, payload_start = _open(path)
+    if verify:
+        _verify(path, mapped, header, payload_start)
+
+    def buffer(entry):
+        start = payload_start + entry["offset"]
+        return memoryview(mapped)[start:start + entry["nbytes"]]
+
+    def unpickle(entry):
+        return lambda: pickle.loads(buffer(entry), buffers=[buffer(b) for b in entry["buffers"]])
+
+    model = PricingModel.__new__(PricingModel)
+    model.__dict__.update(compiled=None, cache=None, version=header["model_version"], _deferred={
+        "scaler": unpickle(header["pickles"]["scaler"]),
+        "model": unpickle(header["pickles"]["estimator"]),
+    })
+    if header["compiled"] is not None:
+        arrays = {
+            name: np.frombuffer(mapped, dtype=np.dtype(entry["dtype"]),
+                                count=int(np.prod(entry["shape"], dtype=np.int64)),
+                                offset=payload_start + entry["offset"]).reshape(entry["shape"])
+            for name, entry in header["compiled"]["arrays"].items()
+        }
+        model.compiled = predictor_from_arrays(header["compiled"]["kind"], arrays, header["compiled"]["state"])
+    if header["feature_names"]:
+        model.feature_names_in_ = np.asarray(header["feature_names"], dtype=object)
+    return model
@@ -0,0 +1,230 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+from src.utils.error_handler import ModelTrainingError
+from src.utils.worker_pool import WORKER, SharedArrays, load_shared, worker_pool
+
+# Per-fold sufficient statistics; every metric (and every bootstrap replicate of it)
+# is a function of their sums over folds.
+STATS = ("n", "sse", "sae", "sum_y", "sum_y2", "revenue", "actual_revenue")
+
+
+class Fold:
+    """
+    One rolling-origin split as row ranges over date-sorted data: train on
+    [train_start, train_stop), test on [test_start, test_stop).
+    """
+
+    def __init__(self, index, train_start, train_stop, test_start, test_stop, test_from, test_to):
+        self.index = index
+        self.train_start = train_start
+        self.train_stop = train_stop
+        self.test_start = test_start
+        self.test_stop = test_stop
+        self.test_from = test_from
+        self.test_to = test_to
+
+    def to_dict(self):
+        return {
+            "fold": self.index,
+            "train_rows": self.train_stop - self.train_start,
+            "test_rows": self.test_stop - self.test_start,
+            "test_from": self.test_from,
+            "test_to": self.test_to,
+        }
+
+
+def rolling_origin_folds(dates, n_folds=12, horizon=7, step=None, window=None, min_train=28, gap=0):
+    """
+    Returns up to n_folds Folds over rows sorted by date. Sizes count distinct dates:
+    the last fold tests the final horizon dates, each earlier fold starts step
+    (default horizon) dates before the next, and training uses every earlier date
+    (or the last window of them), ending gap dates before the test window. Folds with
+    fewer than min_train training dates are dropped.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if not dates.is_monotonic_increasing:
+        raise ValueError("Backtest rows must be sorted by date.")
+    days = dates.unique()
+    offsets = np.append(np.searchsorted(dates.values, days.values, side="left"), len(dates))
+    step = step or horizon
+    folds = []
+    for k in range(n_folds - 1, -1, -1):
+        test_stop = len(days) - k * step
+        test_start = test_stop - horizon
+        train_stop = test_start - gap
+        train_start = max(train_stop - window, 0) if window else 0
+        if test_start < 0 or train_stop - train_start < max(min_train, 1):
+            continue
+        folds.append(Fold(
+            len(folds), int(offsets[train_start]), int(offsets[train_stop]),
+            int(offsets[test_start]), int(offsets[test_stop]), days[test_start], days[test_stop - 1],
+        ))
+    if not folds:
+        raise ValueError(f"{len(days)} dates are too few for a {horizon}-date test window after "
+                         f"{min_train} training dates.")
+    return folds
+
+
+# --- Worker side ---
+# Rows are sorted by date, so a fold is two slices of the memory-mapped feature matrix
+# and no rows are copied per fold.
+def _init_worker(paths):
+    WORKER.update(load_shared(paths))
+
+
+def _run_fold(task):
+    """
+    Fits one model on one fold's training rows and predicts its test rows.
+    """
+    X, y = WORKER["X"], WORKER["y"]
+    result = {
+        "model": task["model"], "fold": task["fold"], "predictions": None,
+        "fit_time": None, "predict_time": None, "status": "ok", "error": None,
+    }
+    try:
+        estimator = clone(task["estimator"])
+        start = time.perf_counter()
+        estimator.fit(X[task["train_start"]:task["train_stop"]], y[task["train_start"]:task["train_stop"]])
+        result["fit_time"] = time.perf_counter() - start
+        start = time.perf_counter()
+        predictions = estimator.predict(X[task["test_start"]:task["test_stop"]])
+        result.update(predictions=np.asarray(predictions, dtype=np.float64),
+                      predict_time=time.perf_counter() - start)
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    return result
+
+
+# --- Metrics ---
+def fold_statistics(y_true, y_pred, units=None):
+    """
+    Returns the STATS of one fold's predictions as a vector.
+    """
+    errors = y_pred - y_true
+    revenue = float(np.dot(y_pred, units)) if units is not None else 0.0
+    actual = float(np.dot(y_true, units)) if units is not None else 0.0
+    return np.array([len(y_true), np.dot(errors, errors), np.abs(errors).sum(),
+                     y_true.sum(), np.dot(y_true, y_true), revenue, actual])
+
+
+def metrics_from_statistics(stats):
+    """
+    Returns {metric: values} from summed STATS (shape (..., len(STATS))); works on
+    one row or on a whole matrix of bootstrap replicates at once.
+    """
+    n, sse, sae, sum_y, sum_y2, revenue, actual = np.moveaxis(stats, -1, 0)
+    sst = sum_y2 - sum_y ** 2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "mse": sse / n,
+            "mae": sae / n,
+            "r2": 1 - sse / sst,
+            "revenue": revenue,
+            "revenue_error": (revenue - actual) / actual,
+        }
+
+
+# --- Backtest ---
+class Backtest:
+    """
+    Rolling-origin backtest of several models over the same folds, with every
+    (model, fold) fit run across a process pool.
+
+    Metrics are pooled over all test rows of all folds: MSE, MAE, R², and with units
+    (units sold per row) the revenue at the predicted prices and its relative error
+    against actual revenue. Confidence intervals come from n_bootstrap resamples of
+    the folds (each fold is one block of consecutive dates, which keeps the serial
+    correlation within a window); all replicates are one matrix product over the
+    per-fold statistics, and every model sees the same resamples.
+
+    After fit(), results_ holds one dict per (model, fold), fold_metrics_ one row per
+    (model, fold) and metrics_ {model: {metric, metric_low, metric_high}}.
+    """
+
+    def __init__(self, estimators, folds, n_jobs=None, n_bootstrap=1000, confidence=0.95, random_state=42):
+        self.estimators = estimators
+        self.folds = folds
+        self.n_jobs = n_jobs
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.random_state = random_state
+
+    def fit(self, X, y, units=None):
+        y = np.asarray(y, dtype=np.float64)
+        units = np.asarray(units, dtype=np.float64) if units is not None else None
+        shared = SharedArrays("backtest_", X=np.asarray(X, dtype=np.float64), y=y)
+
+        start = time.monotonic()
+        executor = worker_pool(self.n_jobs, _init_worker, (shared.paths,))
+        try:
+            # Largest training sets first, so the longest fits do not start last.
+            tasks = [
+                {"model": name, "estimator": estimator, "fold": fold.index,
+                 "train_start": fold.train_start, "train_stop": fold.train_stop,
+                 "test_start": fold.test_start, "test_stop": fold.test_stop}
+                for fold in sorted(self.folds, key=lambda f: f.train_stop - f.train_start, reverse=True)
+                for name, estimator in self.estimators.items()
+            ]
+            futures = [executor.submit(_run_fold, task) for task in tasks]
+            self.results_ = [future.result() for future in futures]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            shared.close()
+        self.elapsed_ = time.monotonic() - start
+        self._aggregate(y, units)
+        return self
+
+    def _aggregate(self, y, units):
+        folds = {fold.index: fold for fold in self.folds}
+        stats, rows = {}, []
+        for result in sorted(self.results_, key=lambda r: (r["model"], r["fold"])):
+            fold = folds[result["fold"]]
+            row = dict(model=result["model"], **fold.to_dict(), fit_time=result["fit_time"],
+                       status=result["status"], error=result["error"])
+            if result["status"] == "ok":
+                window = slice(fold.test_start, fold.test_stop)
+                fold_stats = fold_statistics(y[window], result["predictions"],
+                                             units[window] if units is not None else None)
+                stats.setdefault(result["model"], []).append(fold_stats)
+                row.update({k: float(v) for k, v in metrics_from_statistics(fold_stats).items()})
+            rows.append(row)
+        self.fold_metrics_ = pd.DataFrame(rows)
+
+        self.metrics_ = {}
+        for name in self.estimators:
+            failed = [r for r in self.results_ if r["model"] == name and r["status"] != "ok"]
+            if failed:
+                # A model is only comparable over the same folds as the others.
+                logging.warning(f"Backtest of {name} failed on {len(failed)} folds: {failed[0]['error']}")
+                continue
+            self.metrics_[name] = self._metrics(np.vstack(stats[name]), units is not None)
+        if not self.metrics_:
+            if not self.results_:
+                raise ModelTrainingError("There are no models or folds to backtest.")
+            raise ModelTrainingError(f"Every model failed its backtest: {self.results_[0]['error']}")
+
+    def _metrics(self, stats, with_revenue):
+        rng = np.random.default_rng(self.random_state)
+        counts = rng.multinomial(len(stats), np.full(len(stats), 1 / len(stats)), size=self.n_bootstrap)
+        point = metrics_from_statistics(stats.sum(axis=0))
+        replicates = metrics_from_statistics(counts @ stats)
+        tail = (1 - self.confidence) / 2 * 100
+        metrics = {"folds": len(stats)}
+        for name, value in point.items():
+            if name.startswith("revenue") and not with_revenue:
+                metrics[name] = None
+                continue
+            low, high = np.nanpercentile(replicates[name], [tail, 100 - tail])
+            metrics.update({name: float(value), f"{name}_low": float(low), f"{name}_high": float(high)})
+        return metrics
+
+    def summary(self):
+        """
+        Returns one row per model with its pooled metrics and confidence bounds.
+        """
+        return pd.DataFrame.from_dict(self.metrics_, orient="index").rename_axis("model").reset_index()
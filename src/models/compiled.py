@@ -0,0 +1,220 @@
+import numpy as np
+
+from src.utils.error_handler import PredictionError
+
+# Estimator and scaler classes by name; sklearn itself is only imported by
+# compile_model(), so compiled predictors can be rebuilt and used without it.
+LINEAR_MODELS = ("LinearRegression", "Ridge", "SGDRegressor", "Lasso", "ElasticNet")
+TREE_MODELS = ("RandomForestRegressor", "ExtraTreesRegressor", "DecisionTreeRegressor")
+
+
+def _is_instance(obj, module, names):
+    import importlib
+
+    classes = tuple(getattr(importlib.import_module(module), name) for name in names)
+    return isinstance(obj, classes)
+
+
+# --- Scalers ---
+class FrozenScaler:
+    """
+    The fitted transform of a StandardScaler or MinMaxScaler as plain arrays:
+    X - subtract, / divide, * multiply, + add, in sklearn's operation order, so tree
+    splits see bit-identical inputs. Steps that are None are skipped.
+    """
+
+    ARRAYS = ("subtract", "divide", "multiply", "add")
+
+    def __init__(self, subtract=None, divide=None, multiply=None, add=None):
+        self.subtract = subtract
+        self.divide = divide
+        self.multiply = multiply
+        self.add = add
+
+    @classmethod
+    def from_scaler(cls, scaler):
+        if scaler is None:
+            return None
+        if _is_instance(scaler, "sklearn.preprocessing", ("StandardScaler",)):
+            return cls(subtract=scaler.mean_ if scaler.with_mean else None,
+                       divide=scaler.scale_ if scaler.with_std else None)
+        if _is_instance(scaler, "sklearn.preprocessing", ("MinMaxScaler",)) and not scaler.clip:
+            return cls(multiply=scaler.scale_, add=scaler.min_)
+        raise TypeError(f"{type(scaler).__name__} cannot be compiled.")
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAYS if getattr(self, name) is not None}
+
+    def transform(self, X):
+        if self.subtract is not None:
+            X = X - self.subtract
+        if self.divide is not None:
+            X = X / self.divide
+        if self.multiply is not None:
+            X = X * self.multiply
+        if self.add is not None:
+            X = X + self.add
+        return X
+
+
+def _affine(scaler, n_features):
+    """
+    Returns (a, b) such that scaler.transform(X) == X * a + b up to rounding.
+    """
+    frozen = FrozenScaler.from_scaler(scaler)
+    if frozen is None:
+        return np.ones(n_features), np.zeros(n_features)
+    a, b = np.ones(n_features), np.zeros(n_features)
+    if frozen.subtract is not None:
+        b = b - frozen.subtract
+    if frozen.divide is not None:
+        a, b = a / frozen.divide, b / frozen.divide
+    if frozen.multiply is not None:
+        a, b = a * frozen.multiply, b * frozen.multiply
+    if frozen.add is not None:
+        b = b + frozen.add
+    return a, b
+
+
+# --- Predictors ---
+class CompiledLinear:
+    """
+    Linear model with the scaler folded in: predict(X) == X @ coef + intercept.
+    """
+
+    ARRAYS = ("coef",)
+
+    def __init__(self, model, scaler=None):
+        coef = np.ravel(model.coef_).astype(np.float64)
+        a, b = _affine(scaler, len(coef))
+        self.coef = np.ascontiguousarray(coef * a)
+        self.intercept = float(np.ravel(model.intercept_)[0]) + float(coef @ b)
+
+    def predict(self, X):
+        return X @ self.coef + self.intercept
+
+    def state(self):
+        return {"intercept": self.intercept}
+
+
+class CompiledForest:
+    """
+    Tree ensemble flattened into contiguous node arrays.
+
+    All trees share one set of arrays and children are global node indices, so a batch
+    of rows descends every tree at once: each vectorized step advances all (row, tree)
+    pairs that have not reached a leaf yet, then the leaf values are averaged.
+    """
+
+    ARRAYS = ("feature", "threshold", "left", "right", "value", "missing_left", "roots", "is_leaf")
+
+    def __init__(self, model, scaler=None):
+        trees = getattr(model, "estimators_", [model])
+        features, thresholds, lefts, rights, values, missing_left, roots = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in trees:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            roots.append(offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+            # Trees fitted with missing values record which side NaN goes to.
+            missing = getattr(tree, "missing_go_to_left", None)
+            missing_left.append(np.zeros(tree.node_count, dtype=bool) if missing is None else missing.astype(bool))
+            offset += tree.node_count
+        self.scaler = FrozenScaler.from_scaler(scaler)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values)
+        self.missing_left = np.concatenate(missing_left)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.is_leaf = self.left == np.arange(len(self.left))
+        self.has_missing = bool(self.missing_left.any())
+
+    def apply(self, X):
+        """
+        Returns the leaf index reached in every tree, shape (n_rows, n_trees).
+        """
+        # sklearn trees compare float32 inputs against float64 thresholds.
+        X = np.ascontiguousarray(self.scaler.transform(X) if self.scaler is not None else X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        node = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.intp) * n_features, len(self.roots))
+        # Only (row, tree) pairs still above a leaf are advanced on each step.
+        active = np.flatnonzero(~self.is_leaf[node])
+        while active.size:
+            current = node[active]
+            x = flat[row_offset[active] + self.feature[current]]
+            go_left = x <= self.threshold[current]
+            if self.has_missing:
+                go_left |= np.isnan(x) & self.missing_left[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            active = active[~self.is_leaf[current]]
+        return node.reshape(n_rows, len(self.roots))
+
+    def predict(self, X):
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def state(self):
+        return {"has_missing": self.has_missing}
+
+
+def compile_model(model, scaler=None):
+    """
+    Returns a compiled predictor for a fitted estimator and its scaler.
+    """
+    if _is_instance(model, "sklearn.linear_model", LINEAR_MODELS):
+        return CompiledLinear(model, scaler)
+    if _is_instance(model, "sklearn.ensemble", TREE_MODELS[:2]) or \
+            _is_instance(model, "sklearn.tree", TREE_MODELS[2:]):
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise TypeError("Only single-output trees can be compiled.")
+        return CompiledForest(model, scaler)
+    raise TypeError(f"{type(model).__name__} cannot be compiled.")
+
+
+def predictor_arrays(predictor):
+    """
+    Returns (kind, {name: array}, state) describing a compiled predictor, where
+    state holds its scalar attributes; the inverse of predictor_from_arrays.
+    """
+    arrays = {name: getattr(predictor, name) for name in predictor.ARRAYS}
+    if getattr(predictor, "scaler", None) is not None:
+        arrays.update({f"scaler.{name}": array for name, array in predictor.scaler.arrays().items()})
+    return type(predictor).__name__, arrays, predictor.state()
+
+
+def predictor_from_arrays(kind, arrays, state):
+    """
+    Rebuilds a compiled predictor around existing arrays (e.g. memory-mapped ones)
+    without copying them.
+    """
+    cls = {"CompiledLinear": CompiledLinear, "CompiledForest": CompiledForest}[kind]
+    predictor = cls.__new__(cls)
+    predictor.__dict__.update({name: arrays[name] for name in cls.ARRAYS}, **state)
+    if cls is CompiledForest:
+        scaler = {name[len("scaler."):]: array for name, array in arrays.items() if name.startswith("scaler.")}
+        predictor.scaler = FrozenScaler(**scaler) if scaler else None
+    return predictor
+
+
+def check_equivalence(expected, actual, rtol=1e-7, atol=1e-9):
+    """
+    Raises PredictionError when compiled predictions differ from the sklearn path.
+    Returns the largest absolute difference.
+    """
+    expected, actual = np.asarray(expected, dtype=np.float64), np.asarray(actual, dtype=np.float64)
+    if expected.shape != actual.shape:
+        raise PredictionError(f"Compiled predictions have shape {actual.shape}, expected {expected.shape}.")
+    difference = np.abs(expected - actual)
+    if not np.all(difference <= atol + rtol * np.abs(expected)):
+        raise PredictionError(f"Compiled predictions differ from the sklearn path by up to {difference.max():.3g}.")
+    return float(difference.max()) if difference.size else 0.0
@@ -1,12 +1,249 @@
+import os
+import pickle
+import warnings
+
+import numpy as np
+
+
+def incremental_estimator(estimator, n_samples=None, random_state=42):
+    """
+    Returns an estimator that can learn chunk by chunk in place of estimator.
+    LinearRegression and Ridge map to SGDRegressor (Ridge's alpha is rescaled by
+    n_samples when it is known, since SGD regularizes per sample); random forests
+    are switched to warm_start so each chunk grows new trees.
+    """
+    from sklearn.base import clone
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression, Ridge, SGDRegressor
+
+    if isinstance(estimator, Ridge):
+        alpha = estimator.alpha / n_samples if n_samples else 0.0001
+        return SGDRegressor(penalty="l2", alpha=alpha, random_state=random_state)
+    if isinstance(estimator, LinearRegression):
+        return SGDRegressor(penalty=None, random_state=random_state)
+    if isinstance(estimator, RandomForestRegressor):
+        return clone(estimator).set_params(warm_start=True, n_estimators=0)
+    if hasattr(estimator, "partial_fit"):
+        return clone(estimator)
+    raise TypeError(f"{type(estimator).__name__} cannot be trained incrementally.")
+
+
 class PricingModel:
     def __init__(self, model, scaler):
         self.model = model
         self.scaler = scaler
+        self.compiled = None
+        self.cache = None
+        self.version = 0
+
+    def __getattr__(self, name):
+        # Models loaded from an artifact (src.models.artifact) unpickle their scaler and
+        # estimator on first access.
+        deferred = self.__dict__.get("_deferred")
+        if deferred and name in deferred:
+            value = deferred.pop(name)()
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __getstate__(self):
+        for name in list(self.__dict__.get("_deferred", ())):
+            getattr(self, name)
+        state = dict(self.__dict__)
+        state.pop("_deferred", None)
+        return state
 
     def train(self, X_train, y_train):
+        self._retrained()
         X_scaled = self.scaler.fit_transform(X_train)
         self.model.fit(X_scaled, y_train)
 
     def predict(self, X):
+        if getattr(self, "cache", None) is None:
+            return self._predict(X)
+        rows = self._as_array(X)
+        keys = self.cache.keys(rows)
+        values, missing = self.cache.get_many(keys, self.version)
+        if len(missing):
+            # Only misses reach the model, and repeated rows within the batch once.
+            first = {}
+            for index in missing:
+                first.setdefault(keys[index], index)
+            indices = np.fromiter(first.values(), dtype=np.intp, count=len(first))
+            scored = np.asarray(self._predict(X.iloc[indices] if hasattr(X, "iloc") else rows[indices]),
+                                dtype=np.float64)
+            self.cache.put_many(list(first), scored, self.version)
+            scored_by_key = dict(zip(first, scored))
+            values[missing] = [scored_by_key[keys[index]] for index in missing]
+        return values
+
+    def _predict(self, X):
+        if getattr(self, "compiled", None) is not None:
+            return self.compiled.predict(self._as_array(X))
         X_scaled = self.scaler.transform(X)
-        return self.model.predict(X_scaled)
\ No newline at end of file
+        return self.model.predict(X_scaled)
+
+    def _retrained(self):
+        self.compiled = None
+        # Names pinned by the artifact loader describe the loaded model, not the new fit.
+        self.__dict__.pop("feature_names_in_", None)
+        self.version = getattr(self, "version", 0) + 1
+
+    # --- Prediction cache ---
+    def enable_cache(self, max_entries=100_000, ttl=3600.0, decimals=None):
+        """
+        Caches predictions per feature row (see PredictionCache); rows are rounded to
+        decimals before hashing when given. Retraining invalidates the cache.
+        """
+        from src.models.prediction_cache import PredictionCache
+
+        self.cache = PredictionCache(max_entries, ttl, decimals)
+        return self
+
+    def disable_cache(self):
+        self.cache = None
+        return self
+
+    # --- Compiled inference ---
+    def compile(self, X_check=None, rtol=1e-7, atol=1e-9):
+        """
+        Switches predict() to a compiled fast path: linear models get the scaler folded
+        into one coefficient vector, tree ensembles are flattened into NumPy node arrays.
+        With X_check, the compiled predictions are first compared against the sklearn
+        path and PredictionError is raised if they differ.
+        """
+        from src.models.compiled import check_equivalence, compile_model
+
+        compiled = compile_model(self.model, self.scaler)
+        self.compiled = None
+        if X_check is not None:
+            check_equivalence(self._predict(X_check), compiled.predict(self._as_array(X_check)), rtol, atol)
+        self.compiled = compiled
+        return self
+
+    def decompile(self):
+        self.compiled = None
+        return self
+
+    def _as_array(self, X):
+        # Models loaded from an artifact carry the names, so the scaler stays unloaded.
+        names = getattr(self, "feature_names_in_", None)
+        if names is None:
+            names = getattr(self.scaler, "feature_names_in_", None)
+        if names is not None and hasattr(X, "columns"):
+            X = X[list(names)]
+        return np.asarray(X, dtype=np.float64)
+
+    # --- Out-of-core training ---
+    def partial_train(self, chunks, trees_per_chunk=10, epochs=1, checkpoint_path=None, resume=True):
+        """
+        Trains on (X_chunk, y_chunk) pairs without holding the full dataset in memory.
+
+        chunks is either an iterable (single pass: the scaler and the model are updated
+        together chunk by chunk) or a callable returning a fresh iterator, in which case
+        the scaler is fitted on a first pass and the model on `epochs` further passes,
+        so every chunk is scaled consistently. Estimators with partial_fit are updated in
+        place; warm_start forests grow trees_per_chunk new trees on each chunk.
+
+        With checkpoint_path, the model, scaler and position are saved after every
+        chunk; with resume, training continues from an existing checkpoint by skipping
+        the chunks it already consumed (the chunk order must be deterministic).
+        """
+        self._retrained()
+        progress = {"phase": "scaler" if callable(chunks) else "joint", "epoch": 0, "chunk": 0}
+        if checkpoint_path and resume and os.path.exists(checkpoint_path):
+            progress = self._load_checkpoint(checkpoint_path)
+
+        if callable(chunks):
+            if progress["phase"] == "scaler":
+                self._consume(chunks(), progress, checkpoint_path, self._scaler_step)
+                progress.update(phase="model", epoch=0, chunk=0)
+            while progress["epoch"] < epochs:
+                self._consume(chunks(), progress, checkpoint_path, self._model_step, trees_per_chunk)
+                progress.update(epoch=progress["epoch"] + 1, chunk=0)
+        else:
+            self._consume(chunks, progress, checkpoint_path, self._joint_step, trees_per_chunk)
+        if checkpoint_path:
+            progress["done"] = True
+            self._save_checkpoint(checkpoint_path, progress)
+        self._retrained()
+        return self
+
+    def _consume(self, iterator, progress, checkpoint_path, step, *args):
+        for index, (X_chunk, y_chunk) in enumerate(iterator):
+            if index < progress["chunk"]:
+                continue
+            step(X_chunk, y_chunk, *args)
+            progress["chunk"] = index + 1
+            if checkpoint_path:
+                self._save_checkpoint(checkpoint_path, progress)
+
+    def _scaler_step(self, X_chunk, y_chunk):
+        self.scaler.partial_fit(X_chunk)
+
+    def _model_step(self, X_chunk, y_chunk, trees_per_chunk):
+        X_scaled = self.scaler.transform(X_chunk)
+        if getattr(self.model, "warm_start", False) and hasattr(self.model, "n_estimators"):
+            grown = len(getattr(self.model, "estimators_", []))
+            self.model.set_params(n_estimators=grown + trees_per_chunk)
+            self.model.fit(X_scaled, y_chunk)
+        elif hasattr(self.model, "partial_fit"):
+            self.model.partial_fit(X_scaled, y_chunk)
+        else:
+            raise TypeError(
+                f"{type(self.model).__name__} supports neither partial_fit nor warm_start; "
+                "use incremental_estimator() to get a chunk-trainable stand-in."
+            )
+
+    def _joint_step(self, X_chunk, y_chunk, trees_per_chunk):
+        self._scaler_step(X_chunk, y_chunk)
+        self._model_step(X_chunk, y_chunk, trees_per_chunk)
+
+    # --- Checkpoints ---
+    def _save_checkpoint(self, path, progress):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"model": self.model, "scaler": self.scaler, "progress": dict(progress)}, f)
+        os.replace(tmp_path, path)
+
+    def _load_checkpoint(self, path):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        self.model, self.scaler = state["model"], state["scaler"]
+        self._retrained()
+        return state["progress"]
+
+
+def array_predictor(model, cached=True):
+    """
+    Returns a predict function for plain 2-D arrays in training column order. It skips
+    sklearn's feature-name check, which warns on arrays when the model was fitted on a
+    DataFrame, and uses the prediction cache (unless cached is False) or compiled path
+    when enabled.
+    """
+    if cached and getattr(model, "cache", None) is not None:
+        return model.predict
+    if getattr(model, "compiled", None) is not None:
+        return model.compiled.predict
+    scaler, estimator = getattr(model, "scaler", None), getattr(model, "model", None)
+    if scaler is None or estimator is None:
+        return model.predict
+    if getattr(scaler, "feature_names_in_", None) is None:
+        return lambda rows: estimator.predict(scaler.transform(rows))
+
+    def predict(rows):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return estimator.predict(scaler.transform(rows))
+
+    return predict
+
+
+if __name__ == "__main__":
+    # `mlflow run . -e serve` invokes this file directly, so make `src` importable.
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.models.serve import main
+
+    main()
@@ -0,0 +1,244 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.preprocessing import StandardScaler
+
+from src.models.model import PricingModel
+from src.utils.error_handler import ModelTrainingError
+from src.utils.worker_pool import WORKER, SharedArrays, load_shared, worker_pool
+
+GLOBAL = "__global__"
+
+
+# --- Worker side ---
+# Rows are sorted by partition before they are shared, so a partition is a
+# contiguous, zero-copy slice of the memory-mapped arrays.
+def _init_worker(paths, columns):
+    WORKER.update(load_shared(paths), columns=columns)
+
+
+def _metrics(y_true, preds):
+    return {
+        "mse": float(mean_squared_error(y_true, preds)),
+        "mae": float(mean_absolute_error(y_true, preds)),
+        "r2": float(r2_score(y_true, preds)) if len(y_true) > 1 else float("nan"),
+    }
+
+
+def _fit_partition(task):
+    """
+    Trains a PricingModel on the training rows of rows [start, stop) and scores it on
+    the holdout rows. The global task returns its holdout predictions as well, so
+    the parent can score it on every partition's holdout.
+    """
+    start, stop = task["start"], task["stop"]
+    X, y = WORKER["X"][start:stop], WORKER["y"][start:stop]
+    holdout = np.asarray(WORKER["holdout"][start:stop])
+    columns = WORKER["columns"]
+    result = {
+        "partition": task["partition"], "rows": stop - start, "train_rows": int((~holdout).sum()),
+        "fit_time": None, "metrics": None, "model": None, "predictions": None,
+        "status": "ok", "error": None,
+    }
+    try:
+        fit_start = time.perf_counter()
+        model = PricingModel(clone(task["estimator"]), clone(task["scaler"]))
+        model.train(pd.DataFrame(X[~holdout], columns=columns), y[~holdout])
+        result["fit_time"] = time.perf_counter() - fit_start
+        if holdout.any():
+            preds = np.asarray(model.predict(pd.DataFrame(X[holdout], columns=columns)), dtype=np.float64)
+            result["metrics"] = _metrics(y[holdout], preds)
+            if task["partition"] == GLOBAL:
+                result["predictions"] = preds
+        result["model"] = model
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    return result
+
+
+# --- Bundle ---
+class PartitionedModel:
+    """
+    One PricingModel per partition (e.g. per FC_ID, or per FC_ID and Brand) plus a
+    global model, routed by the partition key columns of the rows to score.
+
+    Rows whose partition has no model of its own (too small, unseen, or beaten by
+    the global model on its holdout) are scored by the global model. report holds one
+    row per partition with its size, holdout metrics and the model that serves it.
+    """
+
+    def __init__(self, keys, models, global_model, feature_names, report=None):
+        self.keys = list(keys)
+        self.models = models
+        self.global_model = global_model
+        self.feature_names = list(feature_names)
+        self.report = report
+
+    @staticmethod
+    def _key(value):
+        return value if isinstance(value, tuple) else (value,)
+
+    def model_for(self, partition):
+        return self.models.get(self._key(partition), self.global_model)
+
+    def routes(self, partitions):
+        """
+        Returns {model: row positions} for a frame of partition key columns.
+        """
+        groups = {}
+        indices = partitions.groupby(self.keys, sort=False, observed=True, dropna=False).indices
+        for partition, positions in indices.items():
+            model = self.model_for(partition)
+            groups.setdefault(id(model), (model, []))[1].append(positions)
+        return {model: np.concatenate(positions) for model, positions in groups.values()}
+
+    def predict(self, X, partitions=None):
+        """
+        Predicts every row with the model of its partition. The key columns are taken
+        from partitions when given, otherwise from X itself.
+        """
+        partitions = X[self.keys] if partitions is None else pd.DataFrame(partitions)
+        features = X[self.feature_names]
+        preds = np.empty(len(X), dtype=np.float64)
+        for model, positions in self.routes(partitions.reset_index(drop=True)).items():
+            preds[positions] = model.predict(features.iloc[positions])
+        return preds
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+# --- Trainer ---
+class PartitionedTrainer:
+    """
+    Trains a PricingModel per partition of the data across a process pool.
+
+    The data is split by the key columns; each partition with at least min_rows rows
+    is trained on its own rows minus a test_size holdout, and the global model is
+    trained on all training rows alongside them. With keep_if_better, a partition
+    keeps its own model only when it beats the global model on the partition's
+    holdout; otherwise (and for small partitions) the bundle routes it to the global
+    model.
+
+    The global fit is scheduled first and the partitions largest first, so on a
+    multi-core machine the partitions (together as many rows as the global fit)
+    finish in about the time of the global fit alone.
+    """
+
+    def __init__(self, estimator, scaler=None, keys=("FC_ID",), min_rows=500, test_size=0.2,
+                 keep_if_better=True, n_jobs=None, random_state=42):
+        if isinstance(keys, str):
+            keys = [keys]
+        self.estimator = estimator
+        self.scaler = scaler if scaler is not None else StandardScaler()
+        self.keys = list(keys)
+        self.min_rows = min_rows
+        self.test_size = test_size
+        self.keep_if_better = keep_if_better
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _layout(self, df):
+        """
+        Returns (row order grouping partitions together, [(partition, start, stop)]).
+        """
+        missing = [key for key in self.keys if key not in df.columns]
+        if missing:
+            raise ValueError(f"Partition keys {missing} are not columns of the training data.")
+        codes = df.groupby(self.keys, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        starts = np.concatenate([[0], bounds]) if len(order) else np.array([], dtype=np.intp)
+        stops = np.concatenate([bounds, [len(order)]]) if len(order) else np.array([], dtype=np.intp)
+        first_rows = df[self.keys].iloc[order[starts]]
+        partitions = [PartitionedModel._key(key) for key in first_rows.itertuples(index=False, name=None)]
+        return order, list(zip(partitions, starts.tolist(), stops.tolist()))
+
+    def _holdout(self, layout, n_rows):
+        rng = np.random.default_rng(self.random_state)
+        holdout = np.zeros(n_rows, dtype=bool)
+        for _, start, stop in layout:
+            n_test = int(round((stop - start) * self.test_size))
+            if 0 < n_test < stop - start:
+                holdout[start + rng.choice(stop - start, n_test, replace=False)] = True
+        return holdout
+
+    def fit(self, df, feature_cols, target="SellingPrice"):
+        """
+        Trains on the rows of df and returns the PartitionedModel bundle.
+        """
+        feature_cols = list(feature_cols)
+        order, layout = self._layout(df)
+        holdout = self._holdout(layout, len(order))
+        shared = SharedArrays("partitioned_", X=df[feature_cols].to_numpy(dtype=np.float64)[order],
+                              y=df[target].to_numpy(dtype=np.float64)[order], holdout=holdout)
+
+        task = {"estimator": self.estimator, "scaler": self.scaler}
+        tasks = [dict(task, partition=GLOBAL, start=0, stop=len(order))]
+        tasks += [dict(task, partition=partition, start=start, stop=stop)
+                  for partition, start, stop in sorted(layout, key=lambda p: p[2] - p[1], reverse=True)
+                  if stop - start >= self.min_rows]
+        start_time = time.monotonic()
+        executor = worker_pool(self.n_jobs, _init_worker, (shared.paths, feature_cols))
+        try:
+            results = [future.result() for future in [executor.submit(_fit_partition, t) for t in tasks]]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            shared.close()
+        self.elapsed_ = time.monotonic() - start_time
+        self.results_ = results
+
+        fitted = {result["partition"]: result for result in results}
+        global_result = fitted[GLOBAL]
+        if global_result["status"] != "ok":
+            raise ModelTrainingError(f"The global model failed to train: {global_result['error']}")
+        return self._bundle(layout, holdout, df[target].to_numpy(dtype=np.float64)[order], fitted, feature_cols)
+
+    def _bundle(self, layout, holdout, y, fitted, feature_cols):
+        global_result = fitted[GLOBAL]
+        global_preds = np.full(len(y), np.nan)
+        if global_result["predictions"] is not None:
+            global_preds[holdout] = global_result["predictions"]
+        models, rows = {}, []
+        for partition, start, stop in layout:
+            test = np.flatnonzero(holdout[start:stop]) + start
+            row = dict(zip(self.keys, partition), rows=stop - start, holdout_rows=len(test),
+                       global_mse=float(mean_squared_error(y[test], global_preds[test])) if len(test) else None)
+            result = fitted.get(partition)
+            if result is None:
+                row.update(served_by="global", reason="too_small")
+            elif result["status"] != "ok":
+                row.update(served_by="global", reason="failed", error=result["error"])
+            else:
+                row.update(result["metrics"] or {}, fit_time=result["fit_time"])
+                if self.keep_if_better and "mse" in row and row["global_mse"] is not None \
+                        and row["mse"] >= row["global_mse"]:
+                    row.update(served_by="global", reason="global_better")
+                else:
+                    models[partition] = result["model"]
+                    row.update(served_by="partition", reason=None)
+            rows.append(row)
+        report = pd.DataFrame(rows)
+        report.attrs["global"] = dict(global_result["metrics"] or {}, fit_time=global_result["fit_time"])
+        # Holdout MSE of the bundle: each partition scored by the model that serves it.
+        scored = report[report["holdout_rows"] > 0]
+        served_mse = scored["global_mse"].where(scored["served_by"] == "global", scored.get("mse"))
+        if len(scored):
+            report.attrs["bundle"] = {
+                "mse": float((served_mse * scored["holdout_rows"]).sum() / scored["holdout_rows"].sum()),
+                "partition_models": len(models),
+            }
+        return PartitionedModel(self.keys, models, global_result["model"], feature_cols, report)
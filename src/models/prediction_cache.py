@@ -0,0 +1,113 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    In-process LRU cache of predictions keyed by a hash of each feature row.
+
+    Rows are optionally rounded to `decimals` first so near-identical snapshots share
+    an entry. Entries expire `ttl` seconds after they were stored and the least
+    recently used entry is evicted once max_entries is reached. Every entry records
+    the model version it was computed with; entries of another version are misses,
+    so retraining the model invalidates the cache.
+    """
+
+    def __init__(self, max_entries=100_000, ttl=3600.0, decimals=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.decimals = decimals
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # --- Keys ---
+    def keys(self, rows):
+        """
+        Returns one hash key per row of a 2-D float array.
+        """
+        rows = np.asarray(rows, dtype=np.float64)
+        if self.decimals is not None:
+            rows = np.round(rows, self.decimals)
+        # Adding 0.0 turns -0.0 into 0.0 so both hash alike.
+        rows = np.ascontiguousarray(rows + 0.0)
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in rows]
+
+    # --- Lookup ---
+    def get_many(self, keys, version):
+        """
+        Returns (values, missing): cached predictions (NaN where missing) and the
+        indices of keys that must be computed.
+        """
+        values = np.full(len(keys), np.nan)
+        missing = []
+        now = self.clock()
+        with self.lock:
+            self._check_version(version)
+            for index, key in enumerate(keys):
+                entry = self.entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self.entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    missing.append(index)
+                    continue
+                self.entries.move_to_end(key)
+                values[index] = entry[0]
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        return values, np.asarray(missing, dtype=np.intp)
+
+    def put_many(self, keys, values, version):
+        expires = self.clock() + self.ttl
+        with self.lock:
+            self._check_version(version)
+            for key, value in zip(keys, values):
+                self.entries[key] = (float(value), expires)
+                self.entries.move_to_end(key)
+            overflow = len(self.entries) - self.max_entries
+            for _ in range(max(overflow, 0)):
+                self.entries.popitem(last=False)
+            self.evictions += max(overflow, 0)
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    # --- Maintenance ---
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    # The lock cannot be pickled and cached values are not worth persisting.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(entries=OrderedDict(), lock=None, version=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from src.models.model import array_predictor
+
+# Identifying columns copied to the optimizer output when present.
+KEY_COLUMNS = ("TransactionDate", "Date", "FC_ID", "Brand", "SKU")
+
+
+class PriceOptimizer:
+    """
+    Picks the price that maximizes revenue or margin for every row, subject to
+    MRP, competitor price and inventory constraints.
+
+    model is a demand model: a fitted PricingModel (or any estimator) that predicts
+    units sold from feature_columns, one of which is price_col. For each row a grid of
+    n_candidates prices between MRP * (1 - max_discount) and MRP * (1 - min_discount)
+    is laid out as one (rows x candidates) batch and scored with a single predict call
+    per chunk. Constraints are applied as boolean masks over the grid:
+
+    - price <= MRP
+    - price <= competitor FinalPrice * (1 + max_competitor_premium), when set
+    - rows whose InventoryHealth is below min_inventory_health are not marked down
+      below their current price, so short stock is not discounted into a stockout
+
+    With stock_col, expected units are capped at the stock on hand.
+
+    Features computed from the price are recomputed for every candidate
+    (CompetitorPriceGap); those that also depend on past prices or demand
+    (PriceElasticity, rolling means of the price) cannot be, and are rejected.
+    Candidate grids bypass the model's prediction cache, which is kept for serving.
+    """
+
+    # Features that are not functions of the candidate price alone.
+    PRICE_DEPENDENT = ("PriceElasticity",)
+
+    def __init__(self, model, feature_columns, price_col="SellingPrice", objective="revenue",
+                 n_candidates=21, min_discount=0.0, max_discount=0.3, unit_cost=None,
+                 mrp_col="MRP", competitor_col="FinalPrice", max_competitor_premium=None,
+                 inventory_col="InventoryHealth", min_inventory_health=None, stock_col=None,
+                 max_batch_rows=1_000_000):
+        if objective not in ("revenue", "margin"):
+            raise ValueError(f"Unknown objective: {objective}")
+        if objective == "margin" and unit_cost is None:
+            raise ValueError("The margin objective needs unit_cost (a column name or a fraction of MRP).")
+        if price_col not in feature_columns:
+            raise ValueError(f"{price_col} must be one of the model's feature columns.")
+        dependent = [c for c in feature_columns
+                     if c in self.PRICE_DEPENDENT or c.startswith(f"{price_col}_rolling_")]
+        if dependent:
+            raise ValueError(f"{dependent} depend on past prices and cannot be recomputed for a candidate "
+                             "price; leave them out of the demand model's features.")
+        self.model = model
+        self.feature_columns = list(feature_columns)
+        self.price_col = price_col
+        self.objective = objective
+        self.n_candidates = n_candidates
+        self.min_discount = min_discount
+        self.max_discount = max_discount
+        self.unit_cost = unit_cost
+        self.mrp_col = mrp_col
+        self.competitor_col = competitor_col
+        self.max_competitor_premium = max_competitor_premium
+        self.inventory_col = inventory_col
+        self.min_inventory_health = min_inventory_health
+        self.stock_col = stock_col
+        self.max_batch_rows = max_batch_rows
+
+    # --- Grid ---
+    def candidates(self, df):
+        """
+        Returns the (rows x n_candidates) candidate price grid.
+        """
+        mrp = df[self.mrp_col].to_numpy(dtype=np.float64)
+        discounts = np.linspace(self.max_discount, self.min_discount, self.n_candidates)
+        return mrp[:, None] * (1 - discounts)[None, :]
+
+    def feasible(self, df, prices):
+        """
+        Returns the boolean mask of candidate prices that satisfy every constraint.
+        """
+        mask = prices <= df[self.mrp_col].to_numpy(dtype=np.float64)[:, None]
+        if self.max_competitor_premium is not None and self.competitor_col in df.columns:
+            ceiling = df[self.competitor_col].to_numpy(dtype=np.float64) * (1 + self.max_competitor_premium)
+            # Rows without a competitor price are unconstrained by it.
+            mask &= np.isnan(ceiling)[:, None] | (prices <= ceiling[:, None])
+        if self.min_inventory_health is not None and self.inventory_col in df.columns:
+            health = df[self.inventory_col].to_numpy(dtype=np.float64)
+            current = df[self.price_col].to_numpy(dtype=np.float64)
+            short = health < self.min_inventory_health
+            mask &= ~short[:, None] | (prices >= current[:, None])
+        return mask
+
+    def _unit_cost(self, df):
+        if isinstance(self.unit_cost, str):
+            return df[self.unit_cost].to_numpy(dtype=np.float64)
+        return df[self.mrp_col].to_numpy(dtype=np.float64) * self.unit_cost
+
+    def _price_features(self, df, prices):
+        """
+        Returns {feature column: (rows x candidates) values} for every feature that
+        changes with the price.
+        """
+        features = {self.price_col: prices}
+        if "CompetitorPriceGap" in self.feature_columns:
+            features["CompetitorPriceGap"] = prices - df[self.competitor_col].to_numpy(dtype=np.float64)[:, None]
+        return features
+
+    # --- Optimization ---
+    def score(self, df, prices):
+        """
+        Returns expected units and the objective for every candidate price.
+        """
+        n_rows, n_candidates = prices.shape
+        features = df[self.feature_columns].to_numpy(dtype=np.float64)
+        grid = np.repeat(features, n_candidates, axis=0)
+        for column, values in self._price_features(df, prices).items():
+            grid[:, self.feature_columns.index(column)] = values.ravel()
+        # Resolved per call so a model compiled later is picked up. Candidate rows would
+        # only evict the cached predictions of real requests, so they skip the cache.
+        units = np.asarray(array_predictor(self.model, cached=False)(grid), dtype=np.float64) \
+            .reshape(n_rows, n_candidates)
+        units = np.maximum(units, 0)
+        if self.stock_col is not None and self.stock_col in df.columns:
+            units = np.minimum(units, df[self.stock_col].to_numpy(dtype=np.float64)[:, None])
+        if self.objective == "revenue":
+            return units, prices * units
+        return units, (prices - self._unit_cost(df)[:, None]) * units
+
+    def optimize(self, df):
+        """
+        Returns one row per input row with OptimalPrice, ExpectedUnits, ExpectedValue
+        (revenue or margin) and Feasible. Rows with no feasible candidate get NaN.
+        """
+        rows_per_chunk = max(self.max_batch_rows // self.n_candidates, 1)
+        parts = [self._optimize_chunk(df.iloc[start:start + rows_per_chunk])
+                 for start in range(0, len(df), rows_per_chunk)]
+        if not parts:
+            return self._optimize_chunk(df)
+        return pd.concat(parts)
+
+    def _optimize_chunk(self, df):
+        prices = self.candidates(df)
+        mask = self.feasible(df, prices)
+        units, value = self.score(df, prices)
+        value = np.where(mask & ~np.isnan(value), value, -np.inf)
+        best = np.argmax(value, axis=1)
+        rows = np.arange(len(df))
+        feasible = np.isfinite(value[rows, best])
+        result = df[[c for c in KEY_COLUMNS if c in df.columns]].copy()
+        result["OptimalPrice"] = np.where(feasible, prices[rows, best], np.nan)
+        result["ExpectedUnits"] = np.where(feasible, units[rows, best], np.nan)
+        result["ExpectedValue"] = np.where(feasible, value[rows, best], np.nan)
+        result["Feasible"] = feasible
+        return result
@@ -0,0 +1,232 @@
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import KFold, ParameterGrid
+
+from src.utils.error_handler import ModelTrainingError
+from src.utils.worker_pool import WORKER, SharedArrays, load_shared, worker_pool
+
+
+# --- Worker side ---
+def _init_worker(paths, columns, cv):
+    WORKER.update(load_shared(paths))
+    WORKER.update(columns=columns, folds=list(KFold(n_splits=cv).split(WORKER["X"])) if cv > 1 else [])
+
+
+def _run_task(task):
+    """
+    Fits one candidate on one fold (or refits it on all rows when fold is None).
+    """
+    X, y = WORKER["X"], WORKER["y"]
+    estimator = clone(task["estimator"]).set_params(**task["params"])
+    result = {
+        "model": task["model"], "params": task["params"], "fold": task["fold"],
+        "n_samples": None, "score": None, "fit_time": None, "score_time": None,
+        "status": "ok", "error": None, "estimator": None,
+    }
+    try:
+        if task["fold"] is None:
+            X_fit = pd.DataFrame(X, columns=WORKER["columns"]) if WORKER["columns"] else X
+            start = time.perf_counter()
+            estimator.fit(X_fit, y)
+            result.update(fit_time=time.perf_counter() - start, n_samples=len(y), estimator=estimator)
+            return result
+        train_idx, test_idx = WORKER["folds"][task["fold"]]
+        if task["n_samples"] is not None and task["n_samples"] < len(train_idx):
+            rng = np.random.default_rng(task["seed"])
+            train_idx = np.sort(rng.choice(train_idx, task["n_samples"], replace=False))
+        start = time.perf_counter()
+        estimator.fit(X[train_idx], y[train_idx])
+        fit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        score = get_scorer(task["scoring"])(estimator, X[test_idx], y[test_idx])
+        result.update(
+            n_samples=len(train_idx), score=float(score), fit_time=fit_time,
+            score_time=time.perf_counter() - start,
+        )
+    except MemoryError as e:
+        result.update(status="memory_limit", error=str(e))
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    return result
+
+
+# --- Scheduler ---
+class ModelSearch:
+    """
+    Hyperparameter search that runs every (model, params, fold) candidate across a
+    process pool.
+
+    strategy="grid" evaluates every candidate on all training rows of each fold.
+    strategy="halving" runs successive halving: all candidates start on a small
+    subsample and only the best 1/halving_factor advance to halving_factor times more
+    rows, which stops weak candidates early. time_budget (seconds) stops scheduling new
+    work once exceeded; the best candidates among those completed are still refit, and
+    ModelTrainingError is raised if no candidate completed. memory_limit_mb caps the
+    memory of each pool worker (see worker_pool).
+
+    After fit(), results_ holds one dict per (candidate, fold) with score and timings,
+    and best_estimators_ holds each model refit on all rows with its best params.
+    """
+
+    def __init__(self, estimators, param_grids=None, cv=3, scoring="neg_mean_squared_error",
+                 n_jobs=None, memory_limit_mb=None, strategy="grid", time_budget=None,
+                 halving_factor=3, min_resources=None, random_state=42):
+        if strategy not in ("grid", "halving"):
+            raise ValueError(f"Unknown search strategy: {strategy}")
+        self.estimators = estimators
+        self.param_grids = param_grids or {}
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.memory_limit_mb = memory_limit_mb
+        self.strategy = strategy
+        self.time_budget = time_budget
+        self.halving_factor = halving_factor
+        self.min_resources = min_resources
+        self.random_state = random_state
+
+    def _candidates(self):
+        for name, estimator in self.estimators.items():
+            for params in ParameterGrid(self.param_grids.get(name, {})):
+                yield name, estimator, params
+
+    def fit(self, X, y):
+        columns = list(X.columns) if isinstance(X, pd.DataFrame) else None
+        n_train = len(X) - len(X) // self.cv
+
+        self.results_ = []
+        self.best_params_, self.best_scores_, self.best_estimators_ = {}, {}, {}
+        self._deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        start = time.monotonic()
+        shared = SharedArrays("model_search_", X=np.asarray(X, dtype=np.float64), y=np.asarray(y, dtype=np.float64))
+        executor = worker_pool(self.n_jobs, _init_worker, (shared.paths, columns, self.cv),
+                               memory_limit_mb=self.memory_limit_mb)
+        try:
+            candidates = list(self._candidates())
+            if self.strategy == "grid":
+                scores = self._evaluate(executor, candidates, None)
+            else:
+                scores = self._halving(executor, candidates, n_train)
+            for name, _, params, score in scores:
+                if name not in self.best_scores_ or score > self.best_scores_[name]:
+                    self.best_scores_[name], self.best_params_[name] = score, params
+            self._raise_if_all_failed()
+            if not self.best_params_:
+                raise ModelTrainingError(
+                    f"No candidate completed all {self.cv} folds within the time budget of {self.time_budget}s."
+                )
+            refits = [
+                executor.submit(_run_task, self._task(name, self.estimators[name], params, None, None))
+                for name, params in self.best_params_.items()
+            ]
+            for future in refits:
+                result = future.result()
+                if result["status"] == "ok":
+                    self.best_estimators_[result["model"]] = result.pop("estimator")
+                else:
+                    result.pop("estimator")
+                self.results_.append(result)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            shared.close()
+        self.elapsed_ = time.monotonic() - start
+        return self
+
+    # --- Strategies ---
+    def _task(self, name, estimator, params, fold, n_samples):
+        return {
+            "model": name, "estimator": estimator, "params": params, "fold": fold,
+            "n_samples": n_samples, "scoring": self.scoring, "seed": self.random_state,
+        }
+
+    def _raise_if_all_failed(self):
+        # Like GridSearchCV, a model whose every fit failed is an error rather than a
+        # silently missing result; models cut off by the time budget are not.
+        for name in self.estimators:
+            if name in self.best_params_:
+                continue
+            failures = [r for r in self.results_ if r["model"] == name and r["status"] != "ok"]
+            if failures and not any(r["model"] == name and r["status"] == "ok" for r in self.results_):
+                raise ModelTrainingError(f"All {len(failures)} fits of {name} failed: {failures[0]['error']}")
+
+    def _expired(self):
+        return self._deadline is not None and time.monotonic() > self._deadline
+
+    def _evaluate(self, executor, candidates, n_samples):
+        """
+        Runs all folds of each candidate and returns (name, estimator, params, mean score)
+        for candidates whose folds all completed.
+        """
+        pending, scores = {}, {}
+        for index, (name, estimator, params) in enumerate(candidates):
+            for fold in range(self.cv):
+                if self._expired():
+                    break
+                future = executor.submit(_run_task, self._task(name, estimator, params, fold, n_samples))
+                pending[future] = index
+        while pending:
+            timeout = max(self._deadline - time.monotonic(), 0) if self._deadline else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                for future in pending:
+                    future.cancel()
+                break
+            for future in done:
+                index = pending.pop(future)
+                result = future.result()
+                result.pop("estimator")
+                self.results_.append(result)
+                if result["status"] == "ok":
+                    scores.setdefault(index, []).append(result["score"])
+        return [
+            candidates[index] + (float(np.mean(fold_scores)),)
+            for index, fold_scores in sorted(scores.items()) if len(fold_scores) == self.cv
+        ]
+
+    def _halving(self, executor, candidates, n_train):
+        """
+        Successive halving per model: evaluate on n rows, keep the top 1/factor, grow n.
+        """
+        factor = self.halving_factor
+        survivors = {}
+        for candidate in candidates:
+            survivors.setdefault(candidate[0], []).append(candidate)
+        rounds = max(math.ceil(math.log(max(len(c) for c in survivors.values()), factor)), 0)
+        n_samples = self.min_resources or max(n_train // factor ** rounds, 2 * self.cv)
+        final, best_seen = {}, {}
+        while survivors and not self._expired():
+            current = [c for group in survivors.values() for c in group]
+            full = n_samples >= n_train
+            scored = self._evaluate(executor, current, None if full else n_samples)
+            by_model = {}
+            for entry in scored:
+                by_model.setdefault(entry[0], []).append(entry)
+            survivors = {}
+            for name, entries in by_model.items():
+                entries.sort(key=lambda e: e[3], reverse=True)
+                best_seen[name] = entries[0]
+                if len(entries) == 1 or full:
+                    final[name] = entries[0]
+                else:
+                    survivors[name] = [e[:3] for e in entries[:math.ceil(len(entries) / factor)]]
+            n_samples *= factor
+        # Models cut off by the time budget keep the leader of their last completed round.
+        return [final.get(name, entry) for name, entry in best_seen.items()]
+
+
+def summarize(results):
+    """
+    Aggregates per-fold results into one row per candidate (mean score and total fit time).
+    """
+    frame = pd.DataFrame([dict(r, params=str(r["params"])) for r in results if r["fold"] is not None])
+    if frame.empty:
+        return frame
+    return frame.groupby(["model", "params", "n_samples"], sort=False).agg(
+        mean_score=("score", "mean"), folds=("fold", "count"), fit_time=("fit_time", "sum")
+    ).reset_index()
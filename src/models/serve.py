@@ -0,0 +1,402 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.models import artifact
+from src.models.model import array_predictor
+from src.utils.error_handler import install_exception_handler
+
+
+# --- Metrics ---
+class ServingMetrics:
+    """
+    Request, batch and latency counters for one server process.
+    Latency percentiles are computed over the most recent `window` requests.
+    """
+
+    def __init__(self, window=10000):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.predict_seconds = 0.0
+        self.latencies = deque(maxlen=window)
+
+    def record_request(self, latency, rows, error=False):
+        with self.lock:
+            self.requests += 1
+            self.rows += rows
+            self.errors += int(error)
+            self.latencies.append(latency)
+
+    def record_batch(self, rows, seconds):
+        with self.lock:
+            self.batches += 1
+            self.batch_rows += rows
+            self.predict_seconds += seconds
+
+    def snapshot(self):
+        with self.lock:
+            latencies = np.fromiter(self.latencies, dtype=np.float64) * 1000
+            uptime = time.monotonic() - self.started
+            snapshot = {
+                "pid": os.getpid(),
+                "uptime_seconds": uptime,
+                "requests": self.requests,
+                "errors": self.errors,
+                "rows": self.rows,
+                "requests_per_second": self.requests / uptime if uptime else 0.0,
+                "batches": self.batches,
+                "mean_batch_rows": self.batch_rows / self.batches if self.batches else 0.0,
+                "mean_predict_ms": 1000 * self.predict_seconds / self.batches if self.batches else 0.0,
+            }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            snapshot.update(latency_ms={"p50": p50, "p95": p95, "p99": p99, "max": float(latencies.max())})
+        else:
+            snapshot.update(latency_ms={"p50": None, "p95": None, "p99": None, "max": None})
+        return snapshot
+
+
+# --- Micro-batching ---
+class _Pending:
+    __slots__ = ("rows", "done", "result", "error")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent predict() calls into a single model call.
+
+    A background thread takes the first queued request, then keeps collecting until
+    max_batch_rows rows are queued or max_wait_ms has passed, and scores them all with
+    one predict_fn call. This pays the scaler/model overhead once per batch instead of
+    once per request; max_wait_ms bounds the latency added when traffic is light.
+    """
+
+    def __init__(self, predict_fn, max_batch_rows=256, max_wait_ms=2.0, metrics=None):
+        self.predict_fn = predict_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics or ServingMetrics()
+        self.queue = queue.Queue()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+
+    def predict(self, rows, timeout=None):
+        """
+        Queues a 2-D array of rows and blocks until its predictions are ready.
+        """
+        pending = _Pending(np.asarray(rows, dtype=np.float64))
+        self.queue.put(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError("Prediction did not complete in time.")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self, first):
+        batch, n_rows = [first], len(first.rows)
+        deadline = time.monotonic() + self.max_wait
+        while n_rows < self.max_batch_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                pending = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(pending)
+            n_rows += len(pending.rows)
+        return batch
+
+    def _loop(self):
+        while self._running:
+            try:
+                first = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._score(self._collect(first))
+
+    def _score(self, batch):
+        start = time.perf_counter()
+        try:
+            predictions = np.asarray(self.predict_fn(np.concatenate([p.rows for p in batch])))
+        except Exception:
+            # One malformed request must not fail the requests it was batched with.
+            for pending in batch:
+                self._score_one(pending)
+        else:
+            offset = 0
+            for pending in batch:
+                pending.result = predictions[offset:offset + len(pending.rows)]
+                offset += len(pending.rows)
+                pending.done.set()
+        self.metrics.record_batch(sum(len(p.rows) for p in batch), time.perf_counter() - start)
+
+    def _score_one(self, pending):
+        try:
+            pending.result = np.asarray(self.predict_fn(pending.rows))
+        except Exception as e:
+            pending.error = e
+        pending.done.set()
+
+
+# --- HTTP ---
+class ScoringHandler(BaseHTTPRequestHandler):
+    """
+    POST /predict  {"instances": [[...], ...]} or [{"feature": value, ...}, ...]
+    GET  /metrics  this process's ServingMetrics snapshot
+    GET  /health
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(200, self.server.batcher.metrics.snapshot())
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        start = time.perf_counter()
+        n_rows, status = 0, 200
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            rows = to_matrix(json.loads(body)["instances"], self.server.feature_names)
+            n_rows = len(rows)
+            predictions = self.server.batcher.predict(rows, timeout=self.server.request_timeout)
+            payload = {"predictions": predictions.tolist()}
+        except (KeyError, TypeError, ValueError) as e:
+            status, payload = 400, {"error": f"Invalid request: {e}"}
+        except Exception as e:
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        self._send(status, payload)
+        self.server.batcher.metrics.record_request(time.perf_counter() - start, n_rows, error=status != 200)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the latency budget.
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server; with reuse_port, several processes can bind the same port
+    and the kernel spreads connections across them.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, batcher, feature_names=None, request_timeout=5.0, reuse_port=False):
+        self.batcher = batcher
+        self.feature_names = feature_names
+        self.request_timeout = request_timeout
+        self.reuse_port = reuse_port
+        super().__init__(address, ScoringHandler)
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+class UnixScoringServer(socketserver.ThreadingUnixStreamServer):
+    """
+    The same scoring API over a Unix domain socket, for same-host callers.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, path, batcher, feature_names=None, request_timeout=5.0):
+        self.batcher = batcher
+        self.feature_names = feature_names
+        self.request_timeout = request_timeout
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, ScoringHandler)
+
+
+# --- Model loading ---
+def load_model(model_path, verify=True):
+    """
+    Loads a PricingModel from a model artifact (see src.models.artifact), memory-mapped
+    so that workers share its arrays, or a pickled PricingModel (or any object with
+    predict) from model_path. verify checks the artifact's checksum.
+    """
+    if artifact.is_artifact(model_path):
+        return artifact.load_model(model_path, verify=verify)
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
+def feature_names_of(model):
+    """
+    Returns the training column order of model, or None when it was fitted on arrays.
+    """
+    # Artifacts record the names themselves, so reading them does not unpickle the scaler.
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        return [str(name) for name in names]
+    for candidate in (getattr(model, "scaler", None), getattr(model, "model", None)):
+        names = getattr(candidate, "feature_names_in_", None)
+        if names is not None:
+            return [str(name) for name in names]
+    return None
+
+
+def to_matrix(instances, feature_names=None):
+    """
+    Converts request instances (lists of values or {feature: value} dicts) to a 2-D array.
+    """
+    if not isinstance(instances, list) or not instances:
+        raise ValueError("instances must be a non-empty list")
+    if isinstance(instances[0], dict):
+        if feature_names is None:
+            raise ValueError("named features require a model fitted on named columns")
+        instances = [[row[name] for name in feature_names] for row in instances]
+    rows = np.asarray(instances, dtype=np.float64)
+    if rows.ndim != 2:
+        raise ValueError("instances must be a list of rows")
+    if feature_names is not None and rows.shape[1] != len(feature_names):
+        raise ValueError(f"expected {len(feature_names)} features, got {rows.shape[1]}")
+    return rows
+
+
+# --- Entry points ---
+def run_worker(model_path, host="127.0.0.1", port=8080, unix_socket=None, max_batch_rows=256,
+               max_wait_ms=2.0, compile=False, reuse_port=False, ready=None, verify=True):
+    """
+    Loads the model once and serves it until interrupted.
+    With compile, a PricingModel is scored through its compiled fast path; artifacts
+    saved with a compiled predictor already are.
+    """
+    model = load_model(model_path, verify=verify)
+    if compile and getattr(model, "compiled", None) is None:
+        model.compile()
+    batcher = MicroBatcher(array_predictor(model), max_batch_rows, max_wait_ms).start()
+    names = feature_names_of(model)
+    if unix_socket:
+        server = UnixScoringServer(unix_socket, batcher, names)
+    else:
+        server = ScoringServer((host, port), batcher, names, reuse_port=reuse_port)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    if ready is not None:
+        ready.set()
+    logging.info(f"Scoring worker {os.getpid()} serving {model_path}.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+
+
+def serve(model_path, host="127.0.0.1", port=8080, workers=1, unix_socket=None,
+          max_batch_rows=256, max_wait_ms=2.0, compile=False):
+    """
+    Serves model_path with `workers` processes sharing one TCP port via SO_REUSEPORT.
+    Each worker loads the model and batches its own connections; /metrics reports the
+    worker that answers it. A model artifact is memory-mapped by every worker, so they
+    share one copy of its arrays; it is verified once here rather than in each worker.
+    """
+    options = dict(host=host, port=port, unix_socket=unix_socket,
+                   max_batch_rows=max_batch_rows, max_wait_ms=max_wait_ms, compile=compile)
+    if workers <= 1:
+        run_worker(model_path, **options)
+        return
+    if unix_socket:
+        raise ValueError("Multiple workers require a TCP port; Unix sockets support one worker.")
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise ValueError("SO_REUSEPORT is not available on this platform; use workers=1.")
+    if artifact.is_artifact(model_path):
+        artifact.verify_artifact(model_path)
+        options["verify"] = False
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(model_path,), kwargs=dict(options, reuse_port=True))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop(*_):
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        stop()
+        for process in processes:
+            process.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batched scoring server for the pricing model.")
+    parser.add_argument("--model_path", default="models/tide_pricing_model.pma")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--unix_socket", default=None)
+    parser.add_argument("--max_batch_rows", type=int, default=256)
+    parser.add_argument("--max_wait_ms", type=float, default=2.0)
+    parser.add_argument("--compile", action="store_true", help="Score through PricingModel.compile().")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    install_exception_handler()
+    serve(args.model_path, args.host, args.port, args.workers, args.unix_socket,
+          args.max_batch_rows, args.max_wait_ms, args.compile)
+
+
+if __name__ == "__main__":
+    main()
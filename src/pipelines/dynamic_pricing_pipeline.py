@@ -1,66 +1,197 @@
 import os
+import logging
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.linear_model import LinearRegression, Ridge
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-import mlflow
-import mlflow.sklearn
-
-from src.utils.utility import validate_positive_number
+
 from src.data.data_loader import DataLoader
+from src.data.join import GranularityJoiner, aggregated_keys
+from src.data.validation import Validator, default_rules, referential_rules
+from src.features.feature_engineering import FeatureEngineer
+from src.features.feature_store import FeatureStore
+from src.mlflow_integration.experiment_logger import ExperimentLogger
+from src.utils.error_handler import install_exception_handler
+from src.utils.logger import Logger
+from src.utils.profiling import get_profiler, profiled
 
 # --- Data Preprocessing and Validation ---
-def load_and_validate_data():
-    # Load raw data
-    sales = DataLoader.load_csv("sales_data_dictionary.csv")
-    inventory = DataLoader.load_csv("inventory_data_dictionary.csv")
-    customer = DataLoader.load_csv("customer_behavior_data_dictionary.csv")
-    competitor = DataLoader.load_csv("competitor_data_dictionary.csv")
+# Bump when load/merge/validation logic changes so materialized features are rebuilt.
+DATA_VERSION = 1
+# Rolling-origin backtest: BACKTEST_FOLDS windows of BACKTEST_HORIZON_DAYS dates each.
+BACKTEST_FOLDS = 12
+BACKTEST_HORIZON_DAYS = 7
+# Model artifact served by `mlflow run . -e serve`.
+MODEL_PATH = os.path.join("models", "tide_pricing_model.pma")
+SALES_FILE = "sales_data_dictionary.csv"
+DIMENSION_FILES = {
+    "competitor": "competitor_data_dictionary.csv",
+    "customer_behavior": "customer_behavior_data_dictionary.csv",
+    "inventory": "inventory_data_dictionary.csv",
+}
+
+
+def load_dimension_tables():
+    """
+    Loads the competitor, customer behavior and inventory sources keyed by source name.
+    """
+    return {
+        name: DataLoader.load_csv(filename, schema=DataLoader.get_schema(name))
+        for name, filename in DIMENSION_FILES.items()
+    }
+
 
+@profiled(rows=len)
+def merge_sources(sales, dimensions, joiner=None):
+    """
+    Joins sales against the dimension tables on 'Date', with each dimension reduced
+    to the grain sales can match so the join never multiplies sales rows.
+    Pass a fitted GranularityJoiner to reuse the reduced tables across calls.
+    """
     # Standardize date columns for merging
     sales = sales.rename(columns={'TransactionDate': 'Date'})
     # inventory, customer, competitor already have 'Date' column
 
-    # Merge datasets on 'Date'
-    df = sales \
-        .merge(competitor, on='Date', how='left') \
-        .merge(customer, on='Date', how='left') \
-        .merge(inventory, on='Date', how='left')
+    if joiner is None:
+        joiner = GranularityJoiner().fit(dimensions, sales.columns)
+    df, stages = joiner.join(sales)
+    for stage in stages:
+        logging.info(
+            f"Joined {stage.source} on {stage.keys}: {stage.rows_before} -> {stage.rows_after} rows "
+            f"(x{stage.multiplication_factor:.2f}, plain date merge x{stage.naive_multiplication_factor:.2f}), "
+            f"{stage.unmatched_rows} unmatched"
+        )
+    return df
 
-    # Data quality checks
-    assert not df.isnull().all(axis=1).any(), "Rows with all values missing detected."
-    if df.isnull().sum().sum() > 0:
-        df = df.dropna()  # Simple strategy; can be improved
 
-    # Validate positive numeric columns
-    for col in ['MRP', 'NoPromoPrice', 'SellingPrice', 'UnitsSold']:
-        if col in df.columns:
-            assert df[col].apply(validate_positive_number).all(), f"Non-positive values in {col}"
+def log_validation_warnings(report):
+    for result in report.warnings:
+        logging.warning(
+            f"Validation rule {result.name} flagged {result.violations} rows, e.g. {result.sample_indices}"
+        )
+
+
+def validate_sources(sales, dimensions, validator=None):
+    """
+    Checks that every sales date is present in each dimension source.
+    Pass a Validator built from referential_rules(dimensions) to reuse it across calls.
+    """
+    report = (validator or Validator(referential_rules(dimensions))).validate(sales)
+    log_validation_warnings(report)
+    return report
+
 
+@profiled(rows=len)
+def validate_merged(df, validator=None):
+    """
+    Runs the data quality rules and missing-value handling on a merged frame.
+    Error-level violations raise DataValidationError; warnings are logged.
+    """
+    report = (validator or Validator(default_rules())).validate(df)
+    log_validation_warnings(report)
+    report.raise_for_errors()
+    if df.isnull().values.any():
+        df = df.dropna()  # Simple strategy; can be improved
     return df
 
+
+@profiled(rows=len)
+def load_and_validate_data():
+    # Load raw data with the compact dtypes declared in the data dictionaries
+    sales = DataLoader.load_csv(SALES_FILE, schema=DataLoader.get_schema("sales"))
+    dimensions = load_dimension_tables()
+    validate_sources(sales, dimensions)
+    df = merge_sources(sales, dimensions)
+    return validate_merged(df)
+
+
+def stream_load_and_validate_data(chunksize=1_000_000, partition="rows"):
+    """
+    Streaming variant of load_and_validate_data for sales histories larger than memory.
+    Sales are read chunksize rows at a time and each chunk is merged and validated on
+    its own; the dimension tables are loaded and reduced to their join grain once. Peak memory is bounded by one chunk
+    (plus one day of carry-over for partition="date").
+
+    partition="rows" yields each validated chunk as read. partition="date" yields one
+    frame per day; it assumes sales are ordered by TransactionDate, otherwise a day
+    that reappears later is yielded again as a separate partition.
+    """
+    if partition not in ("rows", "date"):
+        raise ValueError(f"Unknown partition mode: {partition}")
+    dimensions = load_dimension_tables()
+    sales_chunks = DataLoader.iter_csv(SALES_FILE, chunksize, schema=DataLoader.get_schema("sales"))
+    validator = Validator(default_rules())
+    # Built once: the referential rules collect the dates of every dimension table.
+    source_validator = Validator(referential_rules(dimensions))
+    joiner = GranularityJoiner()
+
+    def process(chunk):
+        validate_sources(chunk, dimensions, source_validator)
+        if not joiner.prepared:
+            joiner.fit(dimensions, chunk.rename(columns={'TransactionDate': 'Date'}).columns)
+        return validate_merged(merge_sources(chunk, dimensions, joiner), validator)
+
+    validated = (process(chunk) for chunk in sales_chunks)
+    if partition == "rows":
+        yield from validated
+        return
+
+    carry = None
+    for chunk in validated:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if chunk.empty:
+            carry = None
+            continue
+        # The last day in a chunk may continue in the next one, so hold it back.
+        last_day = chunk['Date'].iloc[-1]
+        complete = chunk[chunk['Date'] != last_day]
+        carry = chunk[chunk['Date'] == last_day]
+        for _, day in complete.groupby('Date', sort=False):
+            yield day
+    if carry is not None and not carry.empty:
+        yield carry
+
 # --- Feature Engineering ---
-def feature_engineering(df):
-    # Price elasticity: % change in units sold / % change in price
-    df['PriceElasticity'] = df['UnitsSold'].pct_change() / df['SellingPrice'].pct_change()
-    # Customer engagement: combine CTR, ReturningVisitorRatio, AvgSessionDuration_sec
-    df['EngagementScore'] = (
-        df.get('CTR', 0).fillna(0) * 0.4 +
-        df.get('ReturningVisitorRatio', 0).fillna(0) * 0.3 +
-        df.get('AvgSessionDuration_sec', 0).fillna(0) * 0.3
+@profiled(rows=len)
+def feature_engineering(df, engineer=None):
+    """
+    Adds PriceElasticity, EngagementScore, InventoryHealth and CompetitorPriceGap.
+    Pass a fitted FeatureEngineer to extend the features for newly appended rows only.
+    """
+    if engineer is None:
+        return FeatureEngineer().fit_transform(df)
+    return engineer.transform(df)
+
+@profiled(rows=len)
+def load_features(store=None, engineer=None, gc=True):
+    """
+    Returns the engineered feature frame, reusing the copy materialized in the feature
+    store when neither the raw inputs nor the feature definitions changed. Only feature
+    columns whose version changed are recomputed.
+    """
+    store = store or FeatureStore(os.path.join(DataLoader.PROCESSED_DATA_DIR, "feature_store"))
+    engineer = engineer or FeatureEngineer()
+    fingerprint = DataLoader.fingerprint([SALES_FILE, *DIMENSION_FILES.values()], extra=DATA_VERSION)
+    versions = engineer.feature_versions()
+    df = store.materialize(
+        fingerprint, versions, load_and_validate_data,
+        lambda base, names: engineer.fit_transform(base, features=names),
     )
-    # Inventory health: (StockEnd - SafetyStock) / Demand
-    if 'StockEnd' in df.columns and 'SafetyStock' in df.columns and 'Demand' in df.columns:
-        df['InventoryHealth'] = (df['StockEnd'] - df['SafetyStock']) / (df['Demand'] + 1e-5)
-    # Competitor price gap
-    if 'FinalPrice' in df.columns:
-        df['CompetitorPriceGap'] = df['SellingPrice'] - df['FinalPrice']
+    if gc:
+        store.gc(keep=[fingerprint], versions=versions)
     return df
 
 # --- Model Training with Hyperparameter Optimization ---
-def train_models(X_train, y_train):
+def train_models(X_train, y_train, n_jobs=None, strategy="grid", time_budget=None, memory_limit_mb=None):
+    """
+    Searches hyperparameters for each candidate model across a process pool and
+    returns the best estimator per model, refit on all training rows.
+    See ModelSearch for the strategy, time_budget and memory_limit_mb options.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+
+    from src.models.search import ModelSearch, summarize
+
     models = {
         "LinearRegression": LinearRegression(),
         "Ridge": Ridge(),
@@ -70,19 +201,125 @@ def train_models(X_train, y_train):
         "Ridge": {"alpha": [0.1, 1.0, 10.0]},
         "RandomForest": {"n_estimators": [50, 100], "max_depth": [5, 10]}
     }
-    best_models = {}
-    for name, model in models.items():
-        if name in params:
-            grid = GridSearchCV(model, params[name], cv=3, scoring='neg_mean_squared_error')
-            grid.fit(X_train, y_train)
-            best_models[name] = grid.best_estimator_
-        else:
-            model.fit(X_train, y_train)
-            best_models[name] = model
-    return best_models
+    profiler = get_profiler()
+    with profiler.stage("train_models", rows=len(X_train)):
+        search = ModelSearch(
+            models, params, cv=3, scoring='neg_mean_squared_error', n_jobs=n_jobs,
+            strategy=strategy, time_budget=time_budget, memory_limit_mb=memory_limit_mb,
+        ).fit(X_train, y_train)
+        record_search_profile(profiler, search.results_)
+    for row in summarize(search.results_).itertuples(index=False):
+        logging.info(
+            f"{row.model} {row.params} on {row.n_samples} rows: "
+            f"score {row.mean_score:.4f} over {row.folds} folds, fit {row.fit_time:.2f}s"
+        )
+    return search.best_estimators_
+
+def record_search_profile(profiler, results):
+    """
+    Adds fit and score times per model and per grid point, as measured in the search
+    workers, under the profiler's current stage. Refits count towards the model only.
+    """
+    if not profiler.enabled:
+        return
+    totals = {}
+    for result in results:
+        if result["status"] != "ok":
+            continue
+        names = [result["model"]]
+        if result["fold"] is not None:
+            point = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items())) or "default"
+            names.append(f"{result['model']}/{point}")
+        for name in names:
+            entry = totals.setdefault(name, {"fits": 0, "fit_seconds": 0.0, "score_seconds": 0.0, "rows": 0})
+            entry["fits"] += 1
+            entry["fit_seconds"] += result["fit_time"]
+            entry["score_seconds"] += result["score_time"] or 0.0
+            entry["rows"] += result["n_samples"]
+    for name, entry in totals.items():
+        profiler.add(name, wall_seconds=entry["fit_seconds"] + entry["score_seconds"], **entry)
+
+# --- Partitioned Training ---
+def check_partition_keys(keys, columns):
+    """
+    Raises ValueError for partition keys the join aggregated away: a grain key sales
+    rows do not carry, or a dimension column reduced across one (e.g. inventory's
+    IsMetro when sales has no FC_ID). columns are those of the merged frame, which
+    holds a grain key only when sales carries it.
+    """
+    sales_columns = DataLoader.get_schema("sales").columns
+    for key in keys:
+        for name in DIMENSION_FILES:
+            source_columns = DataLoader.get_schema(name).columns
+            if key not in source_columns or key in sales_columns or key == "Date":
+                continue
+            lost = aggregated_keys(source_columns, columns)
+            if key in lost:
+                raise ValueError(f"Cannot partition by {key}: sales rows do not carry it, so {name} "
+                                 "is joined aggregated across it.")
+            if lost:
+                raise ValueError(f"Cannot partition by {key}: sales rows carry no {lost}, so {name} "
+                                 f"is joined aggregated across them and {key} no longer varies by them.")
+
+def train_partitioned_models(df, feature_cols, keys, estimator, min_rows=500, n_jobs=None,
+                             target="SellingPrice"):
+    """
+    Trains one PricingModel per partition of df (e.g. per FC_ID or IsMetro) next to a
+    global model across a process pool and returns the routable PartitionedModel.
+    Partitions under min_rows rows, or whose own model does not beat the global one on
+    their holdout, are served by the global model.
+    """
+    from src.models.partitioned import GLOBAL, PartitionedTrainer
+
+    check_partition_keys(keys, df.columns)
+    profiler = get_profiler()
+    with profiler.stage("train_partitioned", rows=len(df)):
+        trainer = PartitionedTrainer(estimator, keys=keys, min_rows=min_rows, n_jobs=n_jobs)
+        bundle = trainer.fit(df, feature_cols, target)
+        if profiler.enabled:
+            for result in trainer.results_:
+                if result["status"] == "ok":
+                    partition = result["partition"]
+                    name = "global" if partition == GLOBAL else ",".join(map(str, partition))
+                    profiler.add(name, wall_seconds=result["fit_time"], rows=result["train_rows"])
+    report = bundle.report
+    served = report["served_by"].value_counts().to_dict()
+    logging.info(
+        f"Partitioned by {bundle.keys}: {len(report)} partitions, {served.get('partition', 0)} with their own "
+        f"model, {served.get('global', 0)} served by the global model, in {trainer.elapsed_:.2f}s"
+    )
+    return bundle
+
+def log_partitioned_model(bundle, experiment_logger):
+    """
+    Logs the bundle's holdout metrics, per-partition report and pickled bundle as one run.
+    """
+    import shutil
+    import tempfile
+
+    name = f"partitioned-{'-'.join(bundle.keys)}"
+    metrics = {f"global_{k}": v for k, v in bundle.report.attrs.get("global", {}).items() if v is not None}
+    metrics.update({f"bundle_{k}": v for k, v in bundle.report.attrs.get("bundle", {}).items()})
+    with experiment_logger.start_run(run_name=name, tags={"partition_keys": ",".join(bundle.keys)}) as run_id:
+        experiment_logger.log_params(run_id, {"partition_keys": ",".join(bundle.keys),
+                                              "partitions": len(bundle.report)})
+        experiment_logger.log_metrics(run_id, metrics)
+        directory = tempfile.mkdtemp(prefix="partitioned_model_")
+        try:
+            bundle.report.to_csv(os.path.join(directory, f"{name}-report.csv"), index=False)
+            bundle.save(os.path.join(directory, f"{name}.pkl"))
+            for filename in sorted(os.listdir(directory)):
+                experiment_logger.log_artifact(run_id, os.path.join(directory, filename))
+            # Uploads run in the background and read the files until they complete.
+            experiment_logger.flush()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
 
 # --- Model Evaluation ---
+@profiled(rows_arg="X_test")
 def evaluate_model(model, X_test, y_test):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
     preds = model.predict(X_test)
     mse = mean_squared_error(y_test, preds)
     mae = mean_absolute_error(y_test, preds)
@@ -94,51 +331,160 @@ def evaluate_model(model, X_test, y_test):
         revenue = None
     return {"mse": mse, "mae": mae, "r2": r2, "revenue": revenue}
 
+# --- Backtesting ---
+def backtest_models(estimators, X, y, folds, units=None, n_jobs=None, n_bootstrap=1000):
+    """
+    Fits every estimator on every rolling-origin fold across a process pool and
+    returns the fitted Backtest; its metrics_ hold the pooled MSE, MAE, R² and
+    revenue of each model with bootstrap confidence intervals.
+    """
+    from src.models.backtest import Backtest
+
+    profiler = get_profiler()
+    with profiler.stage("backtest", rows=len(X) * len(estimators)):
+        backtest = Backtest(estimators, folds, n_jobs=n_jobs, n_bootstrap=n_bootstrap).fit(X, y, units)
+        if profiler.enabled:
+            for result in backtest.results_:
+                if result["status"] == "ok":
+                    profiler.add(f"{result['model']}/fold={result['fold']}",
+                                 wall_seconds=result["fit_time"] + result["predict_time"])
+    for row in backtest.summary().itertuples(index=False):
+        logging.info(
+            f"Backtest {row.model} over {row.folds} folds: MSE {row.mse:.4f} "
+            f"[{row.mse_low:.4f}, {row.mse_high:.4f}], R2 {row.r2:.4f}"
+        )
+    return backtest
+
 # --- Automated Model Selection ---
 def select_best_model(results):
-    # Select model with lowest MSE
+    """
+    Returns (name, metrics) of the model with the lowest MSE. Pass backtest metrics
+    (Backtest.metrics_), which are pooled over every rolling-origin window.
+    """
     best_model = min(results, key=lambda k: results[k]['mse'])
     return best_model, results[best_model]
 
+# --- Model Publishing ---
+@profiled(rows_arg="X")
+def publish_model(estimator, X, path=MODEL_PATH):
+    """
+    Writes a fitted estimator as the model artifact the scoring server loads (see
+    src/models/artifact.py) and returns its header. The estimator was fitted on
+    unscaled features, so it is wrapped with an identity scaler that carries the
+    feature names; compilable models are checked against sklearn on the first rows.
+    """
+    import warnings
+
+    from sklearn.preprocessing import StandardScaler
+
+    from src.models.artifact import save_model
+    from src.models.model import PricingModel
+
+    scaler = StandardScaler(with_mean=False, with_std=False).fit(X)
+    with warnings.catch_warnings():
+        # The identity scaler hands the estimator arrays where it was fitted on a frame.
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        return save_model(PricingModel(estimator, scaler), path, X_check=X.head(1000))
+
 # --- MLflow Integration ---
-def log_experiment(model_name, model, metrics, params, X_train, y_train):
-    with mlflow.start_run(run_name=model_name):
-        mlflow.log_params(params)
-        mlflow.log_metrics(metrics)
-        mlflow.sklearn.log_model(model, model_name)
-        # Optionally log sample data
-        mlflow.log_artifact("data/raw/sales_data_dictionary.csv")
-        mlflow.log_artifact("data/raw/inventory_data_dictionary.csv")
-        mlflow.log_artifact("data/raw/customer_behavior_data_dictionary.csv")
-        mlflow.log_artifact("data/raw/competitor_data_dictionary.csv")
+@profiled()
+def log_experiment(model_name, model, metrics, params, X_train, y_train, experiment_logger=None,
+                   artifact_path=None):
+    """
+    Logs one model run. Params and metrics go out as a single batch, and the raw
+    inputs are stored once by content hash and referenced from every later run.
+    Pass a shared ExperimentLogger to keep uploads in the background across runs,
+    and artifact_path to attach a published model artifact to the run.
+    """
+    owned = experiment_logger is None
+    experiment_logger = experiment_logger or ExperimentLogger()
+    try:
+        with experiment_logger.start_run(run_name=model_name) as run_id:
+            experiment_logger.log_params(run_id, params)
+            experiment_logger.log_metrics(run_id, metrics)
+            experiment_logger.log_model(run_id, model, model_name)
+            if artifact_path is not None:
+                experiment_logger.log_artifact(run_id, artifact_path)
+            # Optionally log sample data
+            for filename in (SALES_FILE, *DIMENSION_FILES.values()):
+                file_path = DataLoader.raw_path(filename)
+                if file_path is not None:
+                    experiment_logger.log_artifact(run_id, file_path)
+    finally:
+        if owned:
+            experiment_logger.close()
 
 # --- Main Pipeline ---
-def main():
-    # Load and preprocess data
-    df = load_and_validate_data()
-    df = feature_engineering(df)
+def main(partition_by=None):
+    """
+    Runs the pipeline. partition_by (or PRICING_PARTITION_BY, comma separated, e.g.
+    "FC_ID" or "FC_ID,Brand") additionally trains the best model per partition.
+    """
+    from sklearn.base import clone
+
+    from src.models.backtest import rolling_origin_folds
+
+    install_exception_handler()
+    logger = Logger()
+    profiler = get_profiler()
+
+    # Load and preprocess data, in time order
+    df = load_features().sort_values('Date', kind='stable').reset_index(drop=True)
 
     # Define features and target
-    feature_cols = [col for col in df.columns if col not in ['SellingPrice', 'Date']]
+    feature_cols = [col for col in df.columns
+                    if col not in ['SellingPrice', 'Date'] and pd.api.types.is_numeric_dtype(df[col])]
+    # Rows whose engineered features are undefined (e.g. zero denominators) cannot be fitted
+    df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=feature_cols).reset_index(drop=True)
     X = df[feature_cols]
     y = df['SellingPrice']
+    partition_by = partition_by or os.environ.get("PRICING_PARTITION_BY")
+    if partition_by:
+        keys = partition_by.split(",") if isinstance(partition_by, str) else list(partition_by)
+        # Fail before the search and backtest rather than after them.
+        check_partition_keys(keys, df.columns)
 
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # Rolling-origin windows over the most recent dates; hyperparameters are tuned on
+    # the history before the first window so no backtest window is seen by the search
+    folds = rolling_origin_folds(df['Date'], n_folds=BACKTEST_FOLDS, horizon=BACKTEST_HORIZON_DAYS)
+    history = folds[0].test_start
+    X_train, y_train = X.iloc[:history], y.iloc[:history]
 
     # Train models
     best_models = train_models(X_train, y_train)
 
-    # Evaluate and compare models
-    results = {}
-    for name, model in best_models.items():
-        metrics = evaluate_model(model, X_test, y_test)
-        results[name] = metrics
-        log_experiment(name, model, metrics, model.get_params() if hasattr(model, "get_params") else {}, X_train, y_train)
+    # Backtest and compare models
+    backtest = backtest_models(best_models, X, y, folds,
+                               units=df['UnitsSold'] if 'UnitsSold' in df.columns else None)
+    results = backtest.metrics_
 
-    # Select best model
+    # The backtest only scores the tuned estimators; the logged models are refit on
+    # every row, including the backtest windows
+    with profiler.stage("refit", rows=len(X)):
+        final_models = {name: clone(model).fit(X, y) for name, model in best_models.items()}
+    # Select best model and publish it for serving
     best_model_name, best_metrics = select_best_model(results)
     print(f"Best model: {best_model_name} with metrics: {best_metrics}")
+    publish_model(final_models[best_model_name], X, MODEL_PATH)
+
+    with ExperimentLogger() as experiment_logger:
+        for name, metrics in results.items():
+            model = final_models[name]
+            log_experiment(name, model, metrics, model.get_params() if hasattr(model, "get_params") else {},
+                           X, y, experiment_logger, MODEL_PATH if name == best_model_name else None)
+
+        # Ship this run's stage timings (PRICING_PROFILE=1) with the experiment
+        if profiler.enabled:
+            profiler.emit(logger)
+            with experiment_logger.start_run(run_name="pipeline-profile", tags={"profile": "true"}) as run_id:
+                profiler.log_to_mlflow(experiment_logger, run_id)
+
+    # Per-partition models of the best estimator, packaged as one routable bundle
+    if partition_by:
+        bundle = train_partitioned_models(df, feature_cols, keys, clone(final_models[best_model_name]))
+        with ExperimentLogger() as experiment_logger:
+            log_partitioned_model(bundle, experiment_logger)
+        print(f"Partitioned model: {bundle.report.attrs.get('bundle')}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
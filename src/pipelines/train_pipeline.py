@@ -4,9 +4,11 @@ def run_pipeline():
     from src.features.feature_engineering import FeatureEngineer
     from src.models.model import PricingModel
     from src.utils.logger import Logger
-    from src.utils.error_handler import CustomError
+    from src.utils.error_handler import CustomError, install_exception_handler
     from src.mlflow_integration.mlflow_utils import log_experiment
 
+    install_exception_handler()
+
     # Setup logging
     logger = Logger()
     logger.setup_logging()
@@ -1,20 +1,240 @@
-from azure.identity import DefaultAzureCredential
-from azure.keyvault.secrets import SecretClient
+import abc
+import json
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# --- Secret backends ---
+class SecretBackend(abc.ABC):
+    """
+    Interface of a secret store: get_secret(name) returns the secret's value.
+    """
+
+    @abc.abstractmethod
+    def get_secret(self, secret_name):
+        """
+        Returns the value of secret_name.
+        """
+
+
+class KeyVaultBackend(SecretBackend):
+    def __init__(self, key_vault_name, credential=None):
+        from azure.identity import DefaultAzureCredential
+        from azure.keyvault.secrets import SecretClient
 
-class CredentialsManager:
-    def __init__(self, key_vault_name):
         self.key_vault_url = f"https://{key_vault_name}.vault.azure.net/"
-        self.credential = DefaultAzureCredential()
+        self.credential = credential or DefaultAzureCredential()
         self.client = SecretClient(vault_url=self.key_vault_url, credential=self.credential)
 
     def get_secret(self, secret_name):
+        return self.client.get_secret(secret_name).value
+
+
+class LocalSecretBackend(SecretBackend):
+    """
+    In-process stand-in for Key Vault (tests, local development). latency simulates a
+    round trip; calls counts fetches per secret.
+    """
+
+    def __init__(self, secrets=None, latency=0.0):
+        self.secrets = dict(secrets or {})
+        self.latency = latency
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def get_secret(self, secret_name):
+        with self.lock:
+            self.calls[secret_name] = self.calls.get(secret_name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        if secret_name not in self.secrets:
+            raise KeyError(f"Secret {secret_name} not found")
+        return self.secrets[secret_name]
+
+
+# --- Credentials manager ---
+class CredentialsManager:
+    """
+    Secret access with a TTL cache in front of the backend (Key Vault by default).
+
+    A cached secret is served until ttl seconds after it was fetched. Once it is within
+    refresh_ahead * ttl of expiring it is refetched in the background, so callers
+    keep getting the cached value instead of waiting on a round trip; with
+    auto_refresh a background thread does this even for secrets nobody reads.
+    Secrets missing from the cache are fetched concurrently on max_workers threads.
+
+    With cache_file, the cache is persisted encrypted (Fernet, key from cache_key or
+    the CREDENTIALS_CACHE_KEY environment variable), so a restarted worker reuses the
+    secrets fetched by its predecessor until they expire.
+    """
+
+    CACHE_KEY_ENV = "CREDENTIALS_CACHE_KEY"
+
+    def __init__(self, key_vault_name=None, backend=None, ttl=3600.0, refresh_ahead=0.2, max_workers=8,
+                 cache_file=None, cache_key=None, auto_refresh=False, clock=time.time):
+        if backend is None:
+            backend = KeyVaultBackend(key_vault_name)
+        self.backend = backend
+        self.key_vault_url = getattr(backend, "key_vault_url", None)
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_workers = max_workers
+        self.clock = clock
+        self.cache = {}
+        self.lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="secrets")
+        self._fernet = None
+        self.cache_file = cache_file
+        if cache_file:
+            self._fernet = self._make_fernet(cache_key or os.environ.get(self.CACHE_KEY_ENV))
+            self._load_cache()
+        self._stopped = threading.Event()
+        self._refresher = None
+        if auto_refresh:
+            self._refresher = threading.Thread(target=self._refresh_loop, name="secrets-refresh", daemon=True)
+            self._refresher.start()
+
+    # --- Secrets ---
+    def get_secret(self, secret_name):
+        value = self._cached(secret_name)
+        if value is not None:
+            return value
+        return self._fetch(secret_name)
+
+    def get_secrets(self, secret_names):
+        """
+        Returns {name: value}, fetching the names not cached concurrently.
+        """
+        values = {name: self._cached(name) for name in secret_names}
+        missing = [name for name, value in values.items() if value is None]
+        if len(missing) > 1:
+            values.update(zip(missing, self._executor.map(self._fetch, missing)))
+        elif missing:
+            values[missing[0]] = self._fetch(missing[0])
+        return values
+
+    def _cached(self, secret_name):
+        with self.lock:
+            entry = self.cache.get(secret_name)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        age = self.clock() - fetched_at
+        if age >= self.ttl:
+            return None
+        if age >= self.ttl * (1 - self.refresh_ahead):
+            self._refresh_in_background(secret_name)
+        return value
+
+    def _fetch(self, secret_name):
         try:
-            secret = self.client.get_secret(secret_name)
-            return secret.value
+            value = self.backend.get_secret(secret_name)
         except Exception as e:
             raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+        with self.lock:
+            self.cache[secret_name] = (value, self.clock())
+        self._save_cache()
+        return value
+
+    def _refresh_in_background(self, secret_name):
+        with self.lock:
+            if secret_name in self._refreshing:
+                return
+            self._refreshing.add(secret_name)
+        self._executor.submit(self._refresh, secret_name)
+
+    def _refresh(self, secret_name):
+        try:
+            self._fetch(secret_name)
+        except Exception as e:
+            # The cached value stays valid until it expires; the next read retries.
+            logging.warning(f"Background refresh failed: {e}")
+        finally:
+            with self.lock:
+                self._refreshing.discard(secret_name)
+
+    def _refresh_loop(self):
+        # Failed refreshes are retried about ten times over the refresh window.
+        min_wait = self.ttl * self.refresh_ahead / 10
+        while True:
+            now = self.clock()
+            with self.lock:
+                for name, (_, fetched_at) in list(self.cache.items()):
+                    if now - fetched_at >= self.ttl:
+                        del self.cache[name]
+                fetched = [fetched_at for _, fetched_at in self.cache.values()]
+            # Waking a refresh window apart also catches entries added while waiting.
+            wait = self.ttl * (1 - self.refresh_ahead) - (now - min(fetched, default=now))
+            if self._stopped.wait(max(wait, min_wait)):
+                return
+            with self.lock:
+                names = list(self.cache)
+            for name in names:
+                self._cached(name)
+
+    def invalidate(self, secret_name=None):
+        with self.lock:
+            if secret_name is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(secret_name, None)
+        self._save_cache()
+
+    def close(self):
+        self._stopped.set()
+        if self._refresher is not None:
+            self._refresher.join()
+        self._executor.shutdown(wait=True)
+
+    # --- Encrypted persistence ---
+    @staticmethod
+    def generate_cache_key():
+        from cryptography.fernet import Fernet
+
+        return Fernet.generate_key().decode()
+
+    @staticmethod
+    def _make_fernet(key):
+        if not key:
+            raise ValueError("An encrypted secret cache needs cache_key or CREDENTIALS_CACHE_KEY.")
+        from cryptography.fernet import Fernet
+
+        return Fernet(key.encode() if isinstance(key, str) else key)
+
+    def _load_cache(self):
+        from cryptography.fernet import InvalidToken
+
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "rb") as f:
+                entries = json.loads(self._fernet.decrypt(f.read()))
+        except (InvalidToken, ValueError, OSError) as e:
+            logging.warning(f"Ignoring unreadable secret cache {self.cache_file}: {type(e).__name__}")
+            return
+        now = self.clock()
+        with self.lock:
+            for name, (value, fetched_at) in entries.items():
+                if now - fetched_at < self.ttl:
+                    self.cache[name] = (value, fetched_at)
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        with self.lock:
+            payload = self._fernet.encrypt(json.dumps(self.cache).encode())
+            tmp_path = f"{self.cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.cache_file)
 
+    # --- Environment ---
     def load_env_variables(self, env_file_path):
         if os.path.exists(env_file_path):
             with open(env_file_path) as f:
@@ -28,14 +248,13 @@ class CredentialsManager:
     def load_secrets_to_env(self, secret_names):
         """
         Loads secrets from Azure Key Vault and sets them as environment variables.
+        Secrets are fetched concurrently and served from the cache when fresh.
         :param secret_names: List of secret names to fetch from Key Vault.
         """
-        for secret_name in secret_names:
-            secret_value = self.get_secret(secret_name)
-            os.environ[secret_name] = secret_value
+        os.environ.update(self.get_secrets(secret_names))
 
     def get_config(self, key, default=None):
         """
         Retrieves configuration from environment variables, falling back to default if not set.
         """
-        return os.environ.get(key, default)
\ No newline at end of file
+        return os.environ.get(key, default)
@@ -1,5 +1,9 @@
+import asyncio
+import bisect
 import logging
+import random
 import sys
+import threading
 import time
 from functools import wraps
 
@@ -14,6 +18,12 @@ class DataLoadingError(CustomError):
         self.message = message
         super().__init__(self.message)
 
+class DataValidationError(DataLoadingError):
+    """Raised when loaded data violates validation rules"""
+    def __init__(self, message, report=None):
+        self.report = report
+        super().__init__(message)
+
 class ModelTrainingError(CustomError):
     """Raised when there is an error during model training"""
     def __init__(self, message):
@@ -26,62 +36,296 @@ class PredictionError(CustomError):
         self.message = message
         super().__init__(self.message)
 
+class ModelArtifactError(CustomError):
+    """Raised when a saved model artifact is unreadable, corrupted or of an unknown version"""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+class ExperimentLoggingError(CustomError):
+    """Raised when experiment tracking calls fail"""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
 class CircuitBreakerOpenError(CustomError):
     """Raised when the circuit breaker is open"""
     pass
 
+# --- Call Metrics ---
+class CallMetrics:
+    """
+    Thread-safe counters and a latency histogram with per-bucket counts in ms.
+    """
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histogram = [0] * (len(self.BUCKETS_MS) + 1)
+        self.latency_sum = 0.0
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, seconds):
+        with self.lock:
+            self.histogram[bisect.bisect_left(self.BUCKETS_MS, seconds * 1000)] += 1
+            self.latency_sum += seconds
+
+    def snapshot(self):
+        with self.lock:
+            labels = [f"le_{bound}" for bound in self.BUCKETS_MS] + ["inf"]
+            count = sum(self.histogram)
+            return {
+                "counters": dict(self.counters),
+                "latency_ms": {
+                    "buckets": dict(zip(labels, self.histogram)),
+                    "count": count,
+                    "mean": 1000 * self.latency_sum / count if count else 0.0,
+                },
+            }
+
+
 # --- Retry Decorator ---
-def retry_on_exception(retries=3, delay=2, exceptions=(Exception,)):
-    """Retries a function call if an exception occurs"""
+class RetryBudget:
+    """
+    Caps retries at `ratio` of first attempts, plus a reserve of min_retries, so a
+    failing dependency is not hit with several times its normal load. At most
+    max_tokens retries can be saved up. Thread-safe.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10, max_tokens=100):
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, min_retries)
+        self.tokens = float(min_retries)
+        self.lock = threading.Lock()
+
+    def deposit(self):
+        with self.lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def backoff_delays(retries, delay, backoff=2.0, max_delay=30.0, jitter=True):
+    """
+    Yields the sleep before each retry: delay * backoff**n capped at max_delay, drawn
+    uniformly from [0, that] with jitter ("full jitter") so clients do not retry in sync.
+    """
+    for attempt in range(retries - 1):
+        ceiling = min(max_delay, delay * backoff ** attempt)
+        yield random.uniform(0, ceiling) if jitter else ceiling
+
+
+def retry_on_exception(retries=3, delay=2, exceptions=(Exception,), backoff=2.0, max_delay=30.0,
+                       jitter=True, budget=None, give_up=None, metrics=None):
+    """Retries a function call if an exception occurs
+
+    Attempts are spaced by exponential backoff with full jitter (see backoff_delays).
+    Retries stop early when the budget is exhausted, when give_up(exc) returns True
+    (e.g. for permanent failures), and always for CircuitBreakerOpenError, which
+    should fail fast. Coroutine functions are retried with asyncio.sleep.
+    """
+    def should_retry(exc):
+        if isinstance(exc, CircuitBreakerOpenError) or (give_up is not None and give_up(exc)):
+            return False
+        if budget is not None and not budget.withdraw():
+            if metrics is not None:
+                metrics.increment("budget_exhausted")
+            return False
+        return True
+
+    def record(outcome, start):
+        if metrics is not None:
+            metrics.increment(outcome)
+            metrics.observe(time.perf_counter() - start)
+
     def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                if budget is not None:
+                    budget.deposit()
+                delays = backoff_delays(retries, delay, backoff, max_delay, jitter)
+                while True:
+                    try:
+                        result = await func(*args, **kwargs)
+                        record("successes", start)
+                        return result
+                    except exceptions as e:
+                        wait = next(delays, None)
+                        if wait is None or not should_retry(e):
+                            record("failures", start)
+                            raise
+                        if metrics is not None:
+                            metrics.increment("retries")
+                        await asyncio.sleep(wait)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            for attempt in range(retries):
+            start = time.perf_counter()
+            if budget is not None:
+                budget.deposit()
+            delays = backoff_delays(retries, delay, backoff, max_delay, jitter)
+            while True:
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                    record("successes", start)
+                    return result
                 except exceptions as e:
-                    if attempt < retries - 1:
-                        time.sleep(delay)
-                        continue
-                    else:
+                    wait = next(delays, None)
+                    if wait is None or not should_retry(e):
+                        record("failures", start)
                         raise
+                    if metrics is not None:
+                        metrics.increment("retries")
+                    time.sleep(wait)
         return wrapper
     return decorator
 
 # --- Circuit Breaker Pattern ---
 class CircuitBreaker:
-    def __init__(self, max_failures=3, reset_timeout=10):
+    """
+    CLOSED -> OPEN after max_failures consecutive failures; calls are then rejected with
+    CircuitBreakerOpenError until reset_timeout has passed. The breaker then turns
+    HALF_OPEN and lets up to half_open_max_calls probe calls through: success_threshold
+    successful probes close it, any failed probe reopens it. Safe to share across
+    threads; call_async() does the same for coroutines.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+    def __init__(self, max_failures=3, reset_timeout=10, half_open_max_calls=1, success_threshold=1,
+                 exceptions=(Exception,), clock=time.monotonic, metrics=None):
         self.max_failures = max_failures
         self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.exceptions = exceptions
+        self.clock = clock
+        self.metrics = metrics or CallMetrics()
+        self.lock = threading.Lock()
         self.failure_count = 0
         self.last_failure_time = None
-        self.state = "CLOSED"  # CLOSED, OPEN
+        self.state = self.CLOSED
+        self._probes = 0
+        self._probe_successes = 0
 
-    def call(self, func, *args, **kwargs):
-        if self.state == "OPEN":
-            if (time.time() - self.last_failure_time) > self.reset_timeout:
-                self.state = "CLOSED"
-                self.failure_count = 0
-            else:
+    def _transition(self, state):
+        if state != self.state:
+            logging.warning(f"Circuit breaker {self.state} -> {state}.")
+            self.metrics.increment(f"to_{state.lower()}")
+            self.state = state
+
+    def _before_call(self):
+        with self.lock:
+            if self.state == self.OPEN and self.clock() - self.last_failure_time >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+                self._probes = self._probe_successes = 0
+            if self.state == self.OPEN or (self.state == self.HALF_OPEN and self._probes >= self.half_open_max_calls):
+                self.metrics.increment("rejected")
                 raise CircuitBreakerOpenError("Circuit breaker is open. Try again later.")
-        try:
-            result = func(*args, **kwargs)
+            if self.state == self.HALF_OPEN:
+                self._probes += 1
+
+    def _on_success(self, start):
+        self.metrics.observe(self.clock() - start)
+        self.metrics.increment("successes")
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self._probes -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.success_threshold:
+                    self._transition(self.CLOSED)
             self.failure_count = 0
-            return result
-        except Exception as e:
+
+    def _on_failure(self, start, error):
+        """
+        Records a failure; returns True when it opened the breaker.
+        """
+        self.metrics.observe(self.clock() - start)
+        self.metrics.increment("failures")
+        with self.lock:
             self.failure_count += 1
-            self.last_failure_time = time.time()
-            if self.failure_count >= self.max_failures:
-                self.state = "OPEN"
+            self.last_failure_time = self.clock()
+            if self.state == self.HALF_OPEN:
+                self._probes -= 1
+                self._transition(self.OPEN)
+                return True
+            if self.state == self.CLOSED and self.failure_count >= self.max_failures:
+                self._transition(self.OPEN)
                 logging.error(f"Circuit breaker opened after {self.max_failures} failures.")
+                return True
+        return False
+
+    def _on_ignored(self):
+        # Exceptions outside self.exceptions do not count, but free the probe slot.
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self._probes -= 1
+
+    def call(self, func, *args, **kwargs):
+        self._before_call()
+        start = self.clock()
+        try:
+            result = func(*args, **kwargs)
+        except self.exceptions as e:
+            if self._on_failure(start, e):
+                raise CircuitBreakerOpenError("Circuit breaker is open due to repeated failures.") from e
+            raise
+        except BaseException:
+            self._on_ignored()
+            raise
+        self._on_success(start)
+        return result
+
+    async def call_async(self, func, *args, **kwargs):
+        self._before_call()
+        start = self.clock()
+        try:
+            result = await func(*args, **kwargs)
+        except self.exceptions as e:
+            if self._on_failure(start, e):
                 raise CircuitBreakerOpenError("Circuit breaker is open due to repeated failures.") from e
             raise
+        except BaseException:
+            self._on_ignored()
+            raise
+        self._on_success(start)
+        return result
+
+    def __call__(self, func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.call_async(func, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
 
-# --- Global Exception Handler Example ---
+# --- Global Exception Handler ---
 def global_exception_handler(exc_type, exc_value, exc_traceback):
     if issubclass(exc_type, KeyboardInterrupt):
         # Allow keyboard interrupts to exit gracefully
         return
     logging.critical("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
 
-sys.excepthook = global_exception_handler
\ No newline at end of file
+def install_exception_handler():
+    """
+    Routes uncaught exceptions to the log. Entry points call this at startup;
+    importing this module leaves sys.excepthook alone.
+    """
+    sys.excepthook = global_exception_handler
@@ -1,42 +1,246 @@
+import atexit
 import logging
 import logging.config
-from pythonjsonlogger import jsonlogger
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class MemorySink:
+    """
+    Local stand-in for the Application Insights exporter; keeps every exported batch.
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+
+    @property
+    def entries(self):
+        return [entry for batch in self.batches for entry in batch]
 
 
 class AppInsightsHandler(logging.Handler):
+    """
+    Batching exporter: formatted records are buffered and handed to sink in batches of
+    batch_size, or every flush_interval seconds, whichever comes first.
+    sink(list_of_entries) is the transport; without one, batches are discarded.
+    """
+
+    def __init__(self, sink=None, batch_size=100, flush_interval=5.0, level=logging.NOTSET):
+        super().__init__(level)
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.exported = 0
+        self.failed = 0
+        self._stopped = threading.Event()
+        self._timer = None
+        if sink is not None and flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, name="appinsights-flush", daemon=True)
+            self._timer.start()
+
     def emit(self, record):
-        log_entry = self.format(record)
-        # Integrate with Azure Application Insights SDK or exporter here
-        # For production, use Azure Monitor OpenCensus/Opentelemetry exporters
-        pass
+        if self.sink is None:
+            # Integrate with Azure Application Insights SDK or exporter here
+            # For production, use Azure Monitor OpenCensus/Opentelemetry exporters
+            return
+        try:
+            entry = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.lock:
+            self.buffer.append(entry)
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+        if not batch or self.sink is None:
+            return
+        try:
+            self.sink(batch)
+            self.exported += len(batch)
+        except Exception:
+            self.failed += len(batch)
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stopped.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+        super().close()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without formatting them on the calling thread.
+
+    When the queue is full, policy "drop" discards the record, "drop_oldest" discards
+    the oldest queued record instead, and "block" waits up to block_timeout seconds
+    for space before dropping. Dropped records are counted in self.dropped.
+    """
+
+    POLICIES = ("drop", "drop_oldest", "block")
+
+    def __init__(self, maxsize=10000, policy="drop", block_timeout=0.1):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        super().__init__(queue.Queue(maxsize))
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The listener runs in-process, so the record can be passed as is and
+        # formatted (message, arguments and traceback) by the target handlers.
+        return record
+
+    def handle(self, record):
+        # Queue.put is thread-safe, so the handler lock is skipped on the hot path.
+        if self.filter(record):
+            self.enqueue(record)
+            return True
+        return False
+
+    def enqueue(self, record):
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class _DrainingListener(QueueListener):
+    """
+    QueueListener whose stop sentinel waits for room instead of failing on a full queue.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+_active = None
+_active_lock = threading.Lock()
 
 
 class Logger:
-    def __init__(self, config_file='config/logging.yaml'):
+    """
+    Structured logging configured from config_file.
+
+    The handlers the config attaches to the root logger (console, file, ...) and the
+    Application Insights exporter run on a QueueListener thread; log calls only put the
+    record on a bounded queue (see BoundedQueueHandler for the overflow policies).
+    Call stop() to drain the queue and restore the synchronous handlers.
+
+    Logging is configured once per process: while a Logger is running, Logger()
+    returns that instance and ignores its arguments. After stop(), the next Logger()
+    configures logging again.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        global _active
+        with _active_lock:
+            if _active is None or not _active._running:
+                _active = super().__new__(cls)
+                _active._running = False
+            return _active
+
+    def __init__(self, config_file='config/logging.yaml', queue_size=10000, overflow="drop",
+                 app_insights_sink=None, app_insights_batch_size=100, app_insights_interval=5.0):
+        if self._running:
+            return
         import yaml
+        from pythonjsonlogger import jsonlogger
 
         with open(config_file, 'r') as file:
             config = yaml.safe_load(file.read())
+            self._prepare_log_dirs(config)
             logging.config.dictConfig(config)
 
         self.logger = logging.getLogger(__name__)
+        root = logging.getLogger()
+        self.handlers = list(root.handlers)
 
         # Add JSON formatter for structured logging
-        for handler in self.logger.handlers:
-            handler.setFormatter(jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+        for handler in self.handlers:
+            if handler.formatter is None:
+                handler.setFormatter(jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
 
-        # Add Azure Application Insights handler (stub)
-        self.logger.addHandler(AppInsightsHandler())
+        # Add Azure Application Insights exporter
+        self.app_insights = AppInsightsHandler(app_insights_sink, app_insights_batch_size, app_insights_interval)
+        self.app_insights.setFormatter(jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
 
-    def log_message(self, message, level='info', extra=None):
-        log_levels = {
+        self.queue_handler = BoundedQueueHandler(queue_size, overflow)
+        for handler in self.handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        self.listener = _DrainingListener(
+            self.queue_handler.queue, *self.handlers, self.app_insights, respect_handler_level=True,
+        )
+        self.listener.start()
+        self._running = True
+        atexit.register(self.stop)
+
+        self._log_levels = {
             'debug': self.logger.debug,
             'info': self.logger.info,
             'warning': self.logger.warning,
             'error': self.logger.error,
             'critical': self.logger.critical
         }
+
+    @staticmethod
+    def _prepare_log_dirs(config):
+        for handler in config.get('handlers', {}).values():
+            filename = handler.get('filename')
+            if filename and os.path.dirname(filename):
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    @property
+    def dropped(self):
+        return self.queue_handler.dropped
+
+    def stop(self):
+        """
+        Drains queued records, flushes the exporter and reattaches the handlers to the
+        root logger so logging keeps working synchronously.
+        """
+        if not self._running:
+            return
+        self._running = False
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.app_insights.close()
+        for handler in self.handlers:
+            root.addHandler(handler)
+        atexit.unregister(self.stop)
+
+    def log_message(self, message, level='info', extra=None):
+        log = self._log_levels.get(level, self.logger.info)
         if extra is not None:
-            log_levels.get(level, self.logger.info)(message, extra=extra)
+            log(message, extra=extra)
         else:
-            log_levels.get(level, self.logger.info)(message)
\ No newline at end of file
+            log(message)
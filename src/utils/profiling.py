@@ -0,0 +1,441 @@
+import inspect
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# --- Memory ---
+class Watermark:
+    """
+    Peak RSS seen by a MemorySampler between watch() and release().
+    """
+
+    def __init__(self, start):
+        self.start = start
+        self.peak = start
+
+
+class MemorySampler:
+    """
+    Samples this process's resident set size every interval seconds on a background
+    thread and raises the peak of every open Watermark. Reads /proc/self/statm, so
+    nothing is sampled on platforms without procfs (available is False).
+    """
+
+    STATM = "/proc/self/statm"
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.available = os.path.exists(self.STATM)
+        self.lock = threading.Lock()
+        self.watermarks = set()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def rss(self):
+        with open(self.STATM) as f:
+            return int(f.read().split()[1]) * self.page_size
+
+    def start(self):
+        if self.available and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        if not self.watermarks:
+            return
+        rss = self.rss()
+        with self.lock:
+            for watermark in self.watermarks:
+                watermark.peak = max(watermark.peak, rss)
+
+    def watch(self):
+        watermark = Watermark(self.rss() if self.available else 0)
+        with self.lock:
+            self.watermarks.add(watermark)
+        return watermark
+
+    def release(self, watermark):
+        if self.available:
+            self._sample()
+        with self.lock:
+            self.watermarks.discard(watermark)
+        return watermark
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# --- Sampling profiler ---
+class SamplingProfiler:
+    """
+    Statistical profiler for one thread: every interval seconds the thread's current
+    stack is captured from sys._current_frames() and counted, so the profiled code runs
+    unmodified. Results are available as the most frequent functions (top()) and as
+    collapsed stacks for flame graph tools (write_collapsed()).
+    """
+
+    def __init__(self, thread_id=None, interval=0.005, max_depth=128):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def top(self, n=10):
+        """
+        Returns [(function, self fraction, cumulative fraction)] for the n functions
+        most often on top of the stack.
+        """
+        if not self.samples:
+            return []
+        own, cumulative = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulative[function] += count
+        return [(function, count / self.samples, cumulative[function] / self.samples)
+                for function, count in own.most_common(n)]
+
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        return path
+
+
+# --- Stages ---
+def _child_cpu():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class _NullStage:
+    """
+    Returned by a disabled profiler; accepts the same calls and records nothing.
+    """
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+
+    def __init__(self, profiler, name, rows):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.path = None
+        self.tracemalloc_peak = 0
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler._stack()
+        self.path = "/".join([s.path for s in stack[-1:]] + [self.name])
+        if profiler.memory == "tracemalloc":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            # reset_peak() is process-wide: fold the peak so far into the enclosing stage.
+            if stack:
+                stack[-1].tracemalloc_peak = max(stack[-1].tracemalloc_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.watermark = profiler.sampler.watch() if profiler.sampler is not None else None
+        self.sampling = None
+        if profiler.samples(self.name):
+            self.sampling = SamplingProfiler(interval=profiler.sample_interval).start()
+        self.child_cpu = _child_cpu()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        profiler = self.profiler
+        profiler._stack().pop()
+        record = {
+            "stage": self.path,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "child_cpu_seconds": _child_cpu() - self.child_cpu,
+            "rows": self.rows,
+            "rows_per_second": self.rows / wall if self.rows is not None and wall > 0 else None,
+            "failed": exc_type is not None,
+        }
+        if self.watermark is not None and profiler.sampler.available:
+            profiler.sampler.release(self.watermark)
+            record["peak_rss_mb"] = self.watermark.peak / 2 ** 20
+            record["rss_growth_mb"] = (self.watermark.peak - self.watermark.start) / 2 ** 20
+        if profiler.memory == "tracemalloc":
+            peak = max(self.tracemalloc_peak, tracemalloc.get_traced_memory()[1])
+            record["tracemalloc_peak_mb"] = peak / 2 ** 20
+            stack = profiler._stack()
+            if stack:
+                stack[-1].tracemalloc_peak = max(stack[-1].tracemalloc_peak, peak)
+        if self.sampling is not None:
+            self.sampling.stop()
+            record["profile_samples"] = self.sampling.samples
+            record["profile_top"] = self.sampling.top()
+            if profiler.profile_dir:
+                os.makedirs(profiler.profile_dir, exist_ok=True)
+                name = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.path)
+                path = os.path.join(profiler.profile_dir, f"{name}-{len(profiler.records)}.folded")
+                record["profile_path"] = self.sampling.write_collapsed(path)
+        profiler._append(record)
+        return False
+
+
+class Profiler:
+    """
+    Records per-stage wall time, CPU time (own and reaped child processes), memory and
+    row counts.
+
+    Stages are opened with stage(name, rows) or the profiled decorator and nest: a stage
+    opened inside another is recorded as "outer/inner". memory="rss" samples the
+    resident set size on a background thread (peak and growth per stage);
+    "tracemalloc" also reports the traced Python/NumPy peak, at a noticeable cost;
+    None records no memory. Stages named in sample_stages ("*" for all) additionally
+    run a sampling profiler; with profile_dir, their collapsed stacks are written there.
+
+    A disabled profiler hands out a shared no-op stage, so instrumented code costs one
+    attribute check per call.
+    """
+
+    MEMORY_MODES = ("rss", "tracemalloc", None)
+
+    def __init__(self, enabled=True, memory="rss", sample_stages=(), sample_interval=0.005, profile_dir=None):
+        if memory not in self.MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode: {memory}")
+        self.enabled = enabled
+        self.memory = memory
+        self.sample_stages = set(sample_stages or ())
+        self.sample_interval = sample_interval
+        self.profile_dir = profile_dir
+        self.records = []
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self.sampler = MemorySampler().start() if enabled and memory is not None else None
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        Builds a profiler from PRICING_PROFILE (1/true enables it), PRICING_PROFILE_MEMORY
+        (rss, tracemalloc or none), PRICING_PROFILE_SAMPLE (comma-separated stage names)
+        and PRICING_PROFILE_DIR.
+        """
+        environ = os.environ if environ is None else environ
+        enabled = environ.get("PRICING_PROFILE", "").lower() in ("1", "true", "yes")
+        memory = environ.get("PRICING_PROFILE_MEMORY", "rss").lower()
+        sample = [s.strip() for s in environ.get("PRICING_PROFILE_SAMPLE", "").split(",") if s.strip()]
+        return cls(enabled=enabled, memory=None if memory == "none" else memory, sample_stages=sample,
+                   profile_dir=environ.get("PRICING_PROFILE_DIR"))
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _append(self, record):
+        with self.lock:
+            self.records.append(record)
+
+    def samples(self, name):
+        return "*" in self.sample_stages or name in self.sample_stages
+
+    # --- Recording ---
+    def stage(self, name, rows=None):
+        """
+        Context manager recording one stage; set .rows on it when the count is only
+        known inside the block.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+
+    def add(self, name, **fields):
+        """
+        Records a stage measured elsewhere (e.g. in a worker process) under the
+        currently open stage.
+        """
+        if not self.enabled:
+            return
+        stack = self._stack()
+        path = "/".join([s.path for s in stack[-1:]] + [name])
+        self._append({"stage": path, **fields})
+
+    def clear(self):
+        with self.lock:
+            self.records = []
+
+    def close(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    # --- Output ---
+    def summary(self):
+        """
+        Returns {stage: totals} with the call count and summed numeric fields (peaks
+        are maxima) over every record of the stage.
+        """
+        totals = {}
+        for record in list(self.records):
+            entry = totals.setdefault(record["stage"], {"calls": 0})
+            entry["calls"] += 1
+            for key, value in record.items():
+                if key in ("stage", "rows_per_second") or isinstance(value, bool) \
+                        or not isinstance(value, (int, float)):
+                    continue
+                if "peak" in key:
+                    entry[key] = max(entry.get(key, value), value)
+                else:
+                    entry[key] = entry.get(key, 0) + value
+        for entry in totals.values():
+            if entry.get("rows") and entry.get("wall_seconds"):
+                entry["rows_per_second"] = entry["rows"] / entry["wall_seconds"]
+        return totals
+
+    def metrics(self, prefix="perf"):
+        """
+        Returns the summary flattened to MLflow metric names: <prefix>.<stage>.<field>.
+        """
+        metrics = {}
+        for stage, entry in self.summary().items():
+            name = re.sub(r"[^A-Za-z0-9_./ -]+", "_", stage)
+            for key, value in entry.items():
+                metrics[f"{prefix}.{name}.{key}"] = value
+        return metrics
+
+    def emit(self, logger=None):
+        """
+        Logs one structured entry per recorded stage. logger is a src.utils.logger.Logger
+        or a logging.Logger; the record's fields are passed as extra.
+        """
+        for record in list(self.records):
+            extra = {key: value for key, value in record.items() if key != "profile_top"}
+            if "profile_top" in record:
+                extra["profile_top"] = [f"{fn} {own:.0%}/{cum:.0%}" for fn, own, cum in record["profile_top"]]
+            message = f"Stage {record['stage']} took {record.get('wall_seconds', 0):.3f}s"
+            if hasattr(logger, "log_message"):
+                logger.log_message(message, extra=extra)
+            else:
+                (logger or logging.getLogger(__name__)).info(message, extra=extra)
+
+    def log_to_mlflow(self, experiment_logger, run_id):
+        """
+        Logs the summary as metrics on run_id, plus any collapsed-stack files as artifacts.
+        """
+        experiment_logger.log_metrics(run_id, self.metrics())
+        for record in list(self.records):
+            if record.get("profile_path"):
+                experiment_logger.log_artifact(run_id, record["profile_path"])
+
+
+# --- Process-wide profiler ---
+_profiler = None
+
+
+def get_profiler():
+    """
+    Returns the process-wide profiler, configured from the environment on first use.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler.from_env()
+    return _profiler
+
+
+def set_profiler(profiler):
+    """
+    Replaces the process-wide profiler and returns the previous one.
+    """
+    global _profiler
+    previous, _profiler = _profiler, profiler
+    return previous
+
+
+def profiled(name=None, rows=None, rows_arg=None):
+    """
+    Records each call of the decorated function as a stage of the process-wide profiler.
+    rows(result) or len(<argument rows_arg>) gives the stage's row count.
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+        signature = inspect.signature(func) if rows_arg else None
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            count = None
+            if rows_arg:
+                value = signature.bind(*args, **kwargs).arguments.get(rows_arg)
+                count = len(value) if value is not None else None
+            with profiler.stage(stage_name, count) as stage:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    stage.rows = rows(result)
+                return result
+        return wrapper
+    return decorator
@@ -1,32 +1,178 @@
+import asyncio
 import time
+import os
 import re
 import hashlib
+import numbers
+import struct
+import threading
 from functools import wraps
 
 # --- Rate Limiter ---
-def rate_limiter(max_calls, period=1.0):
+class TokenBucket:
     """
-    Decorator to limit the number of function calls within a time period.
+    Token bucket: refills `rate` tokens per second up to `capacity`.
+
+    acquire() reserves tokens immediately, letting the balance go negative, and then
+    waits until the reservation is covered. Callers are therefore served in arrival
+    order, and no more than capacity + rate * t calls happen in any window of t seconds.
     """
-    last_reset = [time.time()]
-    calls = [0]
 
-    def decorator(func):
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _reserve(self, tokens, max_wait):
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(tokens - self.tokens, 0.0) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= tokens
+            return wait
+
+    def reserve(self, tokens=1, max_wait=None):
+        """
+        Takes tokens and returns the seconds to wait before using them, or None
+        (taking nothing) when that would exceed max_wait.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity:g}")
+        return self._reserve(tokens, max_wait)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Blocks until tokens are available; returns False if that exceeds timeout.
+        """
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens=1, timeout=None):
+        """
+        Like acquire(), but awaits instead of blocking the event loop.
+        """
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose balance lives in a file, so every process that opens the same
+    path shares one budget. Updates hold an exclusive flock on the file (POSIX only)
+    and use wall-clock time, which all processes agree on.
+    """
+
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, path, rate, capacity=None, clock=time.time):
+        super().__init__(rate, capacity, clock)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _reserve(self, tokens, max_wait):
+        import fcntl
+
+        with self.lock, open(self.path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                data = f.read(self._STATE.size)
+                now = self.clock()
+                if len(data) == self._STATE.size:
+                    balance, updated = self._STATE.unpack(data)
+                    balance = min(self.capacity, balance + max(now - updated, 0.0) * self.rate)
+                else:
+                    balance = self.capacity
+                wait = max(tokens - balance, 0.0) / self.rate
+                if max_wait is not None and wait > max_wait:
+                    return None
+                f.seek(0)
+                f.truncate()
+                f.write(self._STATE.pack(balance - tokens, now))
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """
+    Keeps one token bucket per key (e.g. per API host or credential), created on first
+    use by bucket_factory(). Usable directly or as a decorator for sync and async
+    functions; key_func(*args, **kwargs) picks the bucket for each call.
+    """
+
+    def __init__(self, rate, capacity=None, bucket_factory=None, key_func=None):
+        self.bucket_factory = bucket_factory or (lambda key: TokenBucket(rate, capacity))
+        self.key_func = key_func
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, key=None):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.setdefault(key, self.bucket_factory(key))
+        return bucket
+
+    def acquire(self, key=None, tokens=1, timeout=None):
+        return self.bucket(key).acquire(tokens, timeout)
+
+    async def acquire_async(self, key=None, tokens=1, timeout=None):
+        return await self.bucket(key).acquire_async(tokens, timeout)
+
+    def __call__(self, func):
+        key_func = self.key_func or (lambda *args, **kwargs: None)
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await self.acquire_async(key_func(*args, **kwargs))
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            now = time.time()
-            if now - last_reset[0] > period:
-                last_reset[0] = now
-                calls[0] = 0
-            if calls[0] >= max_calls:
-                sleep_time = period - (now - last_reset[0])
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                last_reset[0] = time.time()
-                calls[0] = 0
-            calls[0] += 1
+            self.acquire(key_func(*args, **kwargs))
             return func(*args, **kwargs)
         return wrapper
+
+
+def rate_limiter(max_calls, period=1.0, key_func=None, shared_path=None):
+    """
+    Decorator to limit the number of function calls within a time period.
+    Each decorated function gets its own token bucket (per key_func key), refilled
+    smoothly at max_calls / period with bursts of at most max_calls. With shared_path,
+    the bucket is file-backed: its file is shared_path suffixed with a hash of the
+    function's qualified name (and key), so every process running the same function
+    shares it while other functions decorated alike keep their own.
+    """
+    rate = max_calls / period
+
+    def decorator(func):
+        factory = None
+        if shared_path is not None:
+            name = f"{func.__module__}.{func.__qualname__}"
+
+            def factory(key):
+                scope = name if key is None else f"{name}:{key}"
+                return FileTokenBucket(f"{shared_path}.{hash_string(scope)[:16]}", rate, max_calls)
+        return RateLimiter(rate, max_calls, factory, key_func)(func)
     return decorator
 
 # --- Validation Functions ---
@@ -39,9 +185,9 @@ def validate_email(email: str) -> bool:
 
 def validate_positive_number(value) -> bool:
     """
-    Checks if the value is a positive number.
+    Checks if the value is a positive number (including NumPy scalars).
     """
-    return isinstance(value, (int, float)) and value > 0
+    return isinstance(value, numbers.Real) and value > 0
 
 def validate_password_strength(password: str) -> bool:
     """
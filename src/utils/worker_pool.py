@@ -0,0 +1,87 @@
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+
+# State of the current worker process, filled by the pool's initializer. Arrays are
+# written once to .npy files and memory-mapped by every worker, so tasks share one
+# physical copy of the data instead of pickling it per task.
+WORKER = {}
+
+
+class SharedArrays:
+    """
+    Writes arrays to .npy files in a temporary directory for workers to memory-map;
+    paths maps each name to its file. close() removes the files.
+    """
+
+    def __init__(self, prefix, **arrays):
+        self.data_dir = tempfile.mkdtemp(prefix=prefix)
+        self.paths = {}
+        for name, array in arrays.items():
+            self.paths[name] = os.path.join(self.data_dir, f"{name}.npy")
+            np.save(self.paths[name], np.ascontiguousarray(array))
+
+    def close(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+def load_shared(paths):
+    """
+    Memory-maps the .npy files of {name: path} read-only.
+    """
+    return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+
+
+class InlineExecutor:
+    """
+    Runs tasks in the calling process; used when n_jobs == 1.
+    """
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        WORKER.clear()
+
+
+def _init_limited(memory_limit_mb, initializer, *initargs):
+    try:
+        import resource
+
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        logging.warning("Could not apply the per-worker memory limit on this platform.")
+    initializer(*initargs)
+
+
+def worker_pool(n_jobs, initializer, initargs, memory_limit_mb=None):
+    """
+    Returns an executor with n_jobs workers (default: one per CPU), each set up by
+    initializer(*initargs).
+
+    memory_limit_mb caps each worker's address space (RLIMIT_AS), so a runaway task
+    fails with MemoryError instead of taking the host down. It is not applied with
+    n_jobs == 1: the limit cannot be raised again and would bind the caller for good.
+
+    Workers are spawned, as in serve.py, rather than forked. The parent runs the
+    Logger's queue listener and the profiler's sampling thread. A forked worker would
+    inherit locks those threads may hold, and a log queue that nothing drains.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        return InlineExecutor(initializer, initargs)
+    if memory_limit_mb:
+        initializer, initargs = _init_limited, (memory_limit_mb, initializer, *initargs)
+    return ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=initializer, initargs=initargs)
@@ -0,0 +1,74 @@
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.schema import SchemaRegistry
+
+
+def make_raw_sources(days=5, sales_per_day=4, fcs=("FC1", "FC2"), brands=("Tide", "Ariel"), seed=0):
+    """
+    Builds small, clean raw frames shaped like the four data dictionaries.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=days, freq="D")
+    n = days * sales_per_day
+    mrp = rng.uniform(200, 400, n).round(2)
+    no_promo = (mrp * rng.uniform(0.85, 0.95, n)).round(2)
+    sales = pd.DataFrame({
+        "TransactionDate": np.repeat(dates, sales_per_day).strftime("%Y-%m-%d"),
+        "MRP": mrp,
+        "NoPromoPrice": no_promo,
+        "SellingPrice": (no_promo * rng.uniform(0.9, 1.0, n)).round(2),
+        "UnitsSold": rng.integers(1, 50, n),
+    })
+    competitor = pd.DataFrame([
+        {"Date": d.strftime("%Y-%m-%d"), "Brand": b, "MRP": 300.0, "DiscountRate": 10.0,
+         "BasePrice": 270.0, "FinalPrice": float(rng.uniform(240, 290))}
+        for d in dates for b in brands
+    ])
+    customer = pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "CTR": rng.uniform(0.01, 0.1, days),
+        "AbandonedCartRate": rng.uniform(0.2, 0.6, days),
+        "BounceRate": rng.uniform(0.2, 0.6, days),
+        "FunnelDrop_ViewToCart": rng.uniform(0.1, 0.5, days),
+        "FunnelDrop_CartToCheckout": rng.uniform(0.1, 0.5, days),
+        "ReturningVisitorRatio": rng.uniform(0.2, 0.8, days),
+        "AvgSessionDuration_sec": rng.uniform(30, 300, days),
+    })
+    inventory_rows = []
+    for d in dates:
+        for i, fc in enumerate(fcs):
+            start = int(rng.integers(500, 1000))
+            demand = int(rng.integers(50, 200))
+            fulfilled = min(demand, start)
+            inventory_rows.append({
+                "Date": d.strftime("%Y-%m-%d"), "FC_ID": fc, "IsMetro": i % 2 == 0,
+                "StockStart": start, "Demand": demand, "DemandFulfilled": fulfilled,
+                "Backorders": demand - fulfilled, "StockEnd": start - fulfilled,
+                "ReorderPoint": 300, "OrderPlaced": 0, "OrderQty": 0,
+                "LeadTimeFloat": float(rng.uniform(1, 4)), "SafetyStock": 100,
+            })
+    inventory = pd.DataFrame(inventory_rows)
+    return {"sales": sales, "competitor": competitor, "customer_behavior": customer, "inventory": inventory}
+
+
+@contextmanager
+def raw_data_dir(directory, sources):
+    """
+    Writes sources as the pipeline's raw files into directory and points DataLoader at it.
+    Schemas still come from the data dictionaries shipped in data/raw.
+    """
+    registry = SchemaRegistry.from_directory(DataLoader.RAW_DATA_DIR)
+    for name, df in sources.items():
+        df.to_csv(os.path.join(directory, f"{name}_data_dictionary.csv"), index=False)
+    original = DataLoader.RAW_DATA_DIR, DataLoader.CACHE_DIR, DataLoader._schema_registry
+    DataLoader.RAW_DATA_DIR, DataLoader._schema_registry = directory, registry
+    DataLoader.CACHE_DIR = os.path.join(directory, ".cache")
+    try:
+        yield directory
+    finally:
+        DataLoader.RAW_DATA_DIR, DataLoader.CACHE_DIR, DataLoader._schema_registry = original
@@ -0,0 +1,131 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVR
+
+from src.models import artifact, serve
+from src.models.compiled import CompiledForest
+from src.models.model import PricingModel
+from src.utils.error_handler import ModelArtifactError
+
+
+class TestModelArtifact(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.pma")
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(loc=[100, 5, 0.3], scale=[20, 2, 0.1], size=(400, 3)),
+                              columns=["MRP", "UnitsSold", "CTR"])
+        self.y = self.X["MRP"] * 0.9 - self.X["UnitsSold"] + rng.normal(size=400)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _trained(self, estimator):
+        model = PricingModel(estimator, StandardScaler())
+        model.train(self.X, self.y)
+        return model
+
+    def test_forest_round_trip_is_exact_and_memory_mapped(self):
+        model = self._trained(RandomForestRegressor(n_estimators=10, random_state=0))
+        expected = model.predict(self.X)
+        model.compile(X_check=self.X)
+        artifact.save_model(model, self.path)
+
+        loaded = artifact.load_model(self.path)
+        self.assertIsInstance(loaded.compiled, CompiledForest)
+        np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+        np.testing.assert_allclose(loaded.predict(self.X), expected, rtol=1e-12)
+        for array in (loaded.compiled.feature, loaded.compiled.threshold, loaded.compiled.value):
+            self.assertFalse(array.flags.writeable)
+            while isinstance(array, np.ndarray):
+                array = array.base
+            self.assertIsInstance(array.obj, mmap.mmap)
+        # Scoring arrays needs neither the scaler nor the estimator.
+        self.assertEqual(set(loaded._deferred), {"scaler", "model"})
+
+    def test_linear_round_trip(self):
+        for estimator in (Ridge(alpha=2.0), LinearRegression()):
+            model = self._trained(estimator)
+            artifact.save_model(model, self.path)
+            loaded = artifact.load_model(self.path)
+            np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X), rtol=1e-9)
+            self.assertEqual(serve.feature_names_of(loaded), ["MRP", "UnitsSold", "CTR"])
+
+    def test_retraining_a_loaded_model_drops_its_feature_names(self):
+        artifact.save_model(self._trained(Ridge()), self.path)
+        loaded = artifact.load_model(self.path)
+        X = self.X.rename(columns={"CTR": "BounceRate"})[["BounceRate", "MRP"]]
+        loaded.train(X, self.y)
+        loaded.compile()
+        self.assertEqual(serve.feature_names_of(loaded), ["BounceRate", "MRP"])
+        np.testing.assert_allclose(loaded.predict(X), loaded.model.predict(loaded.scaler.transform(X)),
+                                   rtol=1e-9)
+
+    def test_uncompilable_model_loads_estimator_lazily(self):
+        model = self._trained(SVR())
+        artifact.save_model(model, self.path)
+        loaded = artifact.load_model(self.path)
+        self.assertIsNone(loaded.compiled)
+        self.assertNotIn("model", loaded.__dict__)
+        np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X))
+        self.assertIsInstance(loaded.model, SVR)
+
+        # Pickling materializes the deferred parts, so the copy stands on its own.
+        copy = pickle.loads(pickle.dumps(artifact.load_model(self.path)))
+        self.assertNotIn("_deferred", copy.__dict__)
+        np.testing.assert_allclose(copy.predict(self.X), model.predict(self.X))
+
+    def test_corruption_and_version_are_detected(self):
+        artifact.save_model(self._trained(Ridge()), self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+        with self.assertRaises(ModelArtifactError):
+            artifact.load_model(self.path)
+        artifact.load_model(self.path, verify=False)
+
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+        length = struct.unpack_from("<Q", data, 8)[0]
+        header = json.loads(data[16:16 + length])
+        header["format_version"] = artifact.FORMAT_VERSION + 1
+        patched = json.dumps(header).encode().ljust(length)
+        data[16:16 + length] = patched[:length]
+        with open(self.path, "wb") as f:
+            f.write(data)
+        with self.assertRaises(ModelArtifactError):
+            artifact.verify_artifact(self.path)
+
+        with open(self.path, "wb") as f:
+            pickle.dump(self._trained(Ridge()), f)
+        self.assertFalse(artifact.is_artifact(self.path))
+        with self.assertRaises(ModelArtifactError):
+            artifact.load_model(self.path)
+
+    def test_serve_loads_artifacts_and_pickles(self):
+        model = self._trained(Ridge())
+        artifact.save_model(model, self.path)
+        pickle_path = os.path.join(self.tmp.name, "model.pkl")
+        with open(pickle_path, "wb") as f:
+            pickle.dump(model, f)
+        for path in (self.path, pickle_path):
+            loaded = serve.load_model(path)
+            np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X), rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
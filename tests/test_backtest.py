@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from src.models.backtest import Backtest, rolling_origin_folds
+from src.pipelines import dynamic_pricing_pipeline as pipeline
+from src.utils.error_handler import ModelTrainingError
+
+
+def make_series(days=60, rows_per_day=4, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = np.repeat(pd.date_range("2024-01-01", periods=days, freq="D"), rows_per_day)
+    X = pd.DataFrame(rng.normal(size=(len(dates), 3)), columns=["a", "b", "c"])
+    y = 100 + 5 * X["a"] - 2 * X["b"] + rng.normal(scale=0.5, size=len(dates))
+    units = rng.integers(1, 20, len(dates))
+    return dates, X, y, units
+
+
+class TestRollingOriginFolds(unittest.TestCase):
+
+    def test_folds_are_time_ordered_row_ranges(self):
+        dates, _, _, _ = make_series(days=30, rows_per_day=3)
+        folds = rolling_origin_folds(dates, n_folds=3, horizon=5, min_train=5)
+        self.assertEqual(len(folds), 3)
+        self.assertEqual([f.test_start for f in folds], [45, 60, 75])
+        self.assertEqual(folds[-1].test_stop, 90)
+        for fold in folds:
+            self.assertEqual(fold.train_start, 0)
+            self.assertEqual(fold.train_stop, fold.test_start)
+            self.assertEqual(fold.test_stop - fold.test_start, 15)
+            self.assertLess(dates[fold.train_stop - 1], dates[fold.test_start])
+
+    def test_sliding_window_gap_and_min_train(self):
+        dates, _, _, _ = make_series(days=30, rows_per_day=1)
+        folds = rolling_origin_folds(dates, n_folds=10, horizon=2, window=6, gap=1, min_train=6)
+        self.assertTrue(all(f.train_stop - f.train_start == 6 for f in folds))
+        self.assertTrue(all(f.test_start - f.train_stop == 1 for f in folds))
+        # Only windows with 6 training dates before them survive.
+        self.assertEqual(len(folds), 10)
+        self.assertEqual(len(rolling_origin_folds(dates, n_folds=20, horizon=2, min_train=6)), 12)
+
+    def test_invalid_input_raises(self):
+        dates, _, _, _ = make_series(days=10, rows_per_day=1)
+        with self.assertRaises(ValueError):
+            rolling_origin_folds(dates[::-1])
+        with self.assertRaises(ValueError):
+            rolling_origin_folds(dates, horizon=7, min_train=28)
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.dates, self.X, self.y, self.units = make_series()
+        self.folds = rolling_origin_folds(self.dates, n_folds=6, horizon=5, min_train=10)
+
+    def test_pooled_metrics_match_direct_computation(self):
+        backtest = Backtest({"LinearRegression": LinearRegression()}, self.folds, n_jobs=1).fit(
+            self.X, self.y, self.units)
+        preds, actual, units = [], [], []
+        for fold in self.folds:
+            model = LinearRegression().fit(self.X.iloc[fold.train_start:fold.train_stop].to_numpy(),
+                                           self.y.iloc[fold.train_start:fold.train_stop])
+            preds.append(model.predict(self.X.iloc[fold.test_start:fold.test_stop].to_numpy()))
+            actual.append(self.y.iloc[fold.test_start:fold.test_stop].to_numpy())
+            units.append(self.units[fold.test_start:fold.test_stop])
+        preds, actual, units = map(np.concatenate, (preds, actual, units))
+        metrics = backtest.metrics_["LinearRegression"]
+        self.assertAlmostEqual(metrics["mse"], mean_squared_error(actual, preds))
+        self.assertAlmostEqual(metrics["mae"], mean_absolute_error(actual, preds))
+        self.assertAlmostEqual(metrics["r2"], r2_score(actual, preds))
+        self.assertAlmostEqual(metrics["revenue"], float(np.dot(preds, units)), places=4)
+        self.assertEqual(metrics["folds"], 6)
+        self.assertEqual(len(backtest.fold_metrics_), 6)
+        for name in ("mse", "mae", "r2", "revenue_error"):
+            self.assertLessEqual(metrics[f"{name}_low"], metrics[f"{name}_high"])
+        self.assertLessEqual(metrics["mse_low"], metrics["mse"])
+        self.assertGreaterEqual(metrics["mse_high"], metrics["mse"])
+
+    def test_process_pool_matches_inline(self):
+        estimators = {"Ridge": Ridge(alpha=1.0), "Dummy": DummyRegressor()}
+        inline = Backtest(estimators, self.folds, n_jobs=1).fit(self.X, self.y)
+        pooled = Backtest(estimators, self.folds, n_jobs=2).fit(self.X, self.y)
+        pd.testing.assert_frame_equal(inline.summary(), pooled.summary())
+        self.assertIsNone(inline.metrics_["Ridge"]["revenue"])
+
+    def test_failed_model_is_excluded(self):
+        X = self.X.copy()
+        X.iloc[0, 0] = np.nan
+        backtest = Backtest({"Ridge": Ridge(), "Dummy": DummyRegressor()}, self.folds, n_jobs=1).fit(X, self.y)
+        self.assertEqual(set(backtest.metrics_), {"Dummy"})
+        self.assertIn("error", set(backtest.fold_metrics_["status"]))
+        with self.assertRaises(ModelTrainingError):
+            Backtest({"Ridge": Ridge()}, self.folds, n_jobs=1).fit(X, self.y)
+        with self.assertRaises(ModelTrainingError):
+            Backtest({}, self.folds, n_jobs=1).fit(self.X, self.y)
+
+    def test_pipeline_selects_on_backtest(self):
+        backtest = pipeline.backtest_models({"Ridge": Ridge(), "Dummy": DummyRegressor()}, self.X, self.y,
+                                            self.folds, units=self.units, n_jobs=1, n_bootstrap=200)
+        name, metrics = pipeline.select_best_model(backtest.metrics_)
+        self.assertEqual(name, "Ridge")
+        self.assertLess(metrics["mse_high"], backtest.metrics_["Dummy"]["mse_low"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from benchmarks.pipeline import MemorySampler, StageTimer, compare, parse_count
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+
+    def test_parse_count(self):
+        self.assertEqual(parse_count("10K"), 10_000)
+        self.assertEqual(parse_count("2.5m"), 2_500_000)
+        self.assertEqual(parse_count("100M"), 100_000_000)
+        self.assertEqual(parse_count("12345"), 12345)
+
+    def test_stage_timer_records_time_memory_and_throughput(self):
+        sampler = MemorySampler().start()
+        self.addCleanup(sampler.stop)
+        timer = StageTimer(1000, sampler)
+        with timer.stage("allocate", 1000):
+            blob = bytearray(32 * 2 ** 20)
+            blob[::4096] = b"x" * len(blob[::4096])
+        (result,) = timer.results
+        self.assertEqual((result["scale"], result["stage"], result["rows"]), (1000, "allocate", 1000))
+        self.assertGreater(result["rows_per_second"], 0)
+        if sampler.available:
+            self.assertGreater(result["peak_rss_growth_mb"], 16)
+
+    def test_compare_matches_scale_and_stage(self):
+        before = {"results": [{"scale": 10, "stage": "merge", "seconds": 2.0},
+                              {"scale": 10, "stage": "load", "seconds": 1.0}]}
+        after = {"results": [{"scale": 10, "stage": "merge", "seconds": 1.0},
+                             {"scale": 20, "stage": "merge", "seconds": 5.0}]}
+        (row,) = compare(before, after)
+        self.assertEqual((row["stage"], row["ratio"]), ("merge", 0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.svm import SVR
+
+from src.models.compiled import CompiledForest, CompiledLinear, check_equivalence
+from src.models.model import PricingModel
+from src.utils.error_handler import PredictionError
+
+
+class TestCompiledPredictors(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(loc=[100, 5, 0.3], scale=[20, 2, 0.1], size=(500, 3)),
+                              columns=["MRP", "UnitsSold", "CTR"])
+        self.y = self.X["MRP"] * 0.9 - self.X["UnitsSold"] + rng.normal(size=500)
+
+    def test_linear_folds_scaler(self):
+        for scaler in (StandardScaler(), MinMaxScaler()):
+            model = PricingModel(Ridge(alpha=2.0), scaler)
+            model.train(self.X, self.y)
+            expected = model.predict(self.X)
+            model.compile(X_check=self.X)
+            self.assertIsInstance(model.compiled, CompiledLinear)
+            np.testing.assert_allclose(model.predict(self.X), expected, rtol=1e-9)
+
+    def test_forest_matches_sklearn_exactly(self):
+        model = PricingModel(RandomForestRegressor(n_estimators=20, random_state=0), StandardScaler())
+        model.train(self.X, self.y)
+        expected = model.predict(self.X)
+        model.compile(X_check=self.X)
+        self.assertIsInstance(model.compiled, CompiledForest)
+        np.testing.assert_allclose(model.predict(self.X), expected, rtol=1e-12)
+        np.testing.assert_allclose(model.predict(self.X.iloc[:1, ::-1]), expected[:1], rtol=1e-12)
+
+    def test_retraining_drops_compiled_path(self):
+        model = PricingModel(Ridge(), StandardScaler())
+        model.train(self.X, self.y)
+        model.compile()
+        model.train(self.X, self.y * 2)
+        self.assertIsNone(model.compiled)
+
+    def test_unsupported_model_and_mismatch(self):
+        model = PricingModel(SVR(), StandardScaler())
+        model.train(self.X, self.y)
+        with self.assertRaises(TypeError):
+            model.compile()
+        with self.assertRaises(PredictionError):
+            check_equivalence(np.array([1.0, 2.0]), np.array([1.0, 2.1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.utils.credentials_manager import CredentialsManager, LocalSecretBackend
+
+
+class FakeClock:
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCredentialsManager(unittest.TestCase):
+
+    def setUp(self):
+        self.secrets = {f"SECRET_{i}": f"value-{i}" for i in range(12)}
+        self.clock = FakeClock()
+
+    def _manager(self, backend, **kwargs):
+        manager = CredentialsManager(backend=backend, clock=self.clock, **kwargs)
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_fetches_missing_secrets_concurrently(self):
+        backend = LocalSecretBackend(self.secrets, latency=0.05)
+        manager = self._manager(backend, max_workers=12)
+        start = time.perf_counter()
+        values = manager.get_secrets(list(self.secrets))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(values, self.secrets)
+        self.assertLess(elapsed, 0.05 * len(self.secrets) / 2)
+
+    def test_serves_cached_secret_until_ttl_expires(self):
+        backend = LocalSecretBackend(self.secrets)
+        manager = self._manager(backend, ttl=60, refresh_ahead=0)
+        manager.get_secret("SECRET_0")
+        self.clock.now += 59
+        self.assertEqual(manager.get_secret("SECRET_0"), "value-0")
+        self.assertEqual(backend.calls["SECRET_0"], 1)
+        self.clock.now += 1
+        manager.get_secret("SECRET_0")
+        self.assertEqual(backend.calls["SECRET_0"], 2)
+
+    def test_refreshes_in_background_before_expiry(self):
+        backend = LocalSecretBackend(self.secrets)
+        manager = self._manager(backend, ttl=100, refresh_ahead=0.2)
+        manager.get_secret("SECRET_0")
+        backend.secrets["SECRET_0"] = "rotated"
+        self.clock.now += 85
+        # The cached value is returned while the refresh runs.
+        self.assertEqual(manager.get_secret("SECRET_0"), "value-0")
+        manager._executor.shutdown(wait=True)
+        self.assertEqual(backend.calls["SECRET_0"], 2)
+        self.clock.now += 50
+        self.assertEqual(manager.get_secret("SECRET_0"), "rotated")
+
+    def test_auto_refresh_renews_unread_secrets(self):
+        backend = LocalSecretBackend(self.secrets)
+        manager = CredentialsManager(backend=backend, ttl=0.5, refresh_ahead=0.5, auto_refresh=True)
+        self.addCleanup(manager.close)
+        manager.get_secret("SECRET_0")
+        time.sleep(0.6)
+        self.assertGreaterEqual(backend.calls["SECRET_0"], 2)
+        self.assertIn("SECRET_0", manager.cache)
+
+    def test_missing_secret_raises(self):
+        manager = self._manager(LocalSecretBackend(self.secrets))
+        with self.assertRaisesRegex(Exception, "Error retrieving secret MISSING"):
+            manager.get_secret("MISSING")
+
+    def test_load_secrets_to_env(self):
+        manager = self._manager(LocalSecretBackend(self.secrets))
+        names = ["SECRET_1", "SECRET_2"]
+        self.addCleanup(lambda: [os.environ.pop(name, None) for name in names])
+        manager.load_secrets_to_env(names)
+        self.assertEqual(os.environ["SECRET_2"], "value-2")
+
+
+class TestEncryptedSecretCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "secrets.cache")
+        self.key = CredentialsManager.generate_cache_key()
+        self.clock = FakeClock()
+
+    def _manager(self, backend, key=None, **kwargs):
+        manager = CredentialsManager(backend=backend, cache_file=self.path, cache_key=key or self.key,
+                                     clock=self.clock, **kwargs)
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_restarted_manager_reuses_persisted_secrets(self):
+        self._manager(LocalSecretBackend({"DB_PASSWORD": "hunter2"})).get_secret("DB_PASSWORD")
+        with open(self.path, "rb") as f:
+            self.assertNotIn(b"hunter2", f.read())
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+        backend = LocalSecretBackend({"DB_PASSWORD": "hunter2"})
+        self.assertEqual(self._manager(backend).get_secret("DB_PASSWORD"), "hunter2")
+        self.assertEqual(backend.calls, {})
+
+    def test_expired_or_unreadable_cache_is_ignored(self):
+        self._manager(LocalSecretBackend({"DB_PASSWORD": "hunter2"}), ttl=60).get_secret("DB_PASSWORD")
+        backend = LocalSecretBackend({"DB_PASSWORD": "hunter2"})
+        self._manager(backend, key=CredentialsManager.generate_cache_key()).get_secret("DB_PASSWORD")
+        self.assertEqual(backend.calls, {"DB_PASSWORD": 1})
+
+        self.clock.now += 61
+        backend = LocalSecretBackend({"DB_PASSWORD": "hunter2"})
+        self._manager(backend, ttl=60).get_secret("DB_PASSWORD")
+        self.assertEqual(backend.calls, {"DB_PASSWORD": 1})
+
+    def test_requires_encryption_key(self):
+        with self.assertRaises(ValueError):
+            CredentialsManager(backend=LocalSecretBackend(), cache_file=self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from src.data.data_loader import ColumnarCache, DataLoader
+
+
+def _put_copies(cache_dir, csv_path, names):
+    cache = ColumnarCache(cache_dir)
+    df = pd.read_csv(csv_path)
+    for name in names:
+        cache.put(csv_path, df, extra=name)
+
+
+class TestColumnarCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw_dir = os.path.join(self.tmp.name, "raw")
+        os.makedirs(self.raw_dir)
+        self.csv_path = os.path.join(self.raw_dir, "sales.csv")
+        pd.DataFrame({
+            "TransactionDate": ["2024-01-01", "2024-01-02"],
+            "SellingPrice": [10.5, 11.0],
+            "UnitsSold": [3, 4],
+        }).to_csv(self.csv_path, index=False)
+        self.cache = ColumnarCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_hit_reads_requested_columns(self):
+        calls = []
+
+        def reader():
+            calls.append(1)
+            return pd.read_csv(self.csv_path)
+
+        first = self.cache.load(self.csv_path, reader, columns=["UnitsSold"])
+        second = self.cache.load(self.csv_path, reader, columns=["UnitsSold"])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(list(second.columns), ["UnitsSold"])
+        pd.testing.assert_frame_equal(first.reset_index(drop=True), second)
+
+    def test_changed_source_invalidates_entry(self):
+        self.cache.load(self.csv_path, lambda: pd.read_csv(self.csv_path))
+        pd.DataFrame({"TransactionDate": ["2024-01-03"], "SellingPrice": [9.0], "UnitsSold": [1]}) \
+            .to_csv(self.csv_path, index=False)
+        os.utime(self.csv_path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertIsNone(self.cache.get(self.csv_path))
+        self.assertEqual(self.cache.size_bytes(), 0)
+
+    def test_eviction_keeps_cache_under_budget(self):
+        self.cache.max_bytes = 1
+        df = pd.read_csv(self.csv_path)
+        self.cache.put(self.csv_path, df, extra="a")
+        self.cache.put(self.csv_path, df, extra="b")
+        self.assertIsNone(self.cache.get(self.csv_path, extra="a"))
+        self.assertIsNotNone(self.cache.get(self.csv_path, extra="b"))
+
+    def test_hits_do_not_rewrite_manifest(self):
+        df = pd.read_csv(self.csv_path)
+        self.cache.put(self.csv_path, df)
+        manifest = self.cache._manifest_path()
+        before = os.stat(manifest).st_mtime_ns
+        time.sleep(0.01)
+        self.assertIsNotNone(self.cache.get(self.csv_path))
+        self.assertEqual(os.stat(manifest).st_mtime_ns, before)
+
+    def test_concurrent_processes_keep_each_others_entries(self):
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=_put_copies, args=(self.cache.cache_dir, self.csv_path,
+                                                      [f"{worker}-{i}" for i in range(5)]))
+            for worker in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        for worker in range(3):
+            for i in range(5):
+                self.assertIsNotNone(self.cache.get(self.csv_path, extra=f"{worker}-{i}"))
+
+    def test_data_loader_uses_cache(self):
+        original_raw, original_cache = DataLoader.RAW_DATA_DIR, DataLoader.CACHE_DIR
+        DataLoader.RAW_DATA_DIR = self.raw_dir
+        DataLoader.CACHE_DIR = os.path.join(self.tmp.name, "loader_cache")
+        try:
+            df = DataLoader.load_csv("sales.csv", columns=["SellingPrice"], use_cache=True)
+            cached = DataLoader.get_cache().get(self.csv_path, columns=["SellingPrice"])
+            pd.testing.assert_frame_equal(df, cached)
+        finally:
+            DataLoader.RAW_DATA_DIR, DataLoader.CACHE_DIR = original_raw, original_cache
+
+
+if __name__ == '__main__':
+    unittest.main()
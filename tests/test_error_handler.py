@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from src.utils.error_handler import (
+    CallMetrics,
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    RetryBudget,
+    backoff_delays,
+    retry_on_exception,
+)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Flaky:
+
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("tracking server unavailable")
+        return "ok"
+
+
+@mock.patch("time.sleep")
+class TestRetry(unittest.TestCase):
+
+    def test_backoff_is_exponential_with_full_jitter(self, sleep):
+        self.assertEqual(list(backoff_delays(5, 1, jitter=False, max_delay=5)), [1, 2, 4, 5])
+        for attempt, wait in enumerate(backoff_delays(5, 1)):
+            self.assertTrue(0 <= wait <= 2 ** attempt)
+
+    def test_retries_until_success_and_records_metrics(self, sleep):
+        metrics = CallMetrics()
+        flaky = Flaky(2)
+        self.assertEqual(retry_on_exception(retries=3, delay=0.01, metrics=metrics)(flaky)(), "ok")
+        self.assertEqual(flaky.calls, 3)
+        self.assertEqual(sleep.call_count, 2)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"], {"retries": 2, "successes": 1})
+        self.assertEqual(snapshot["latency_ms"]["count"], 1)
+
+    def test_permanent_failures_and_budget_stop_retries(self, sleep):
+        flaky = Flaky(5, error=FileNotFoundError)
+        with self.assertRaises(FileNotFoundError):
+            retry_on_exception(give_up=lambda e: isinstance(e, FileNotFoundError))(flaky)()
+        self.assertEqual(flaky.calls, 1)
+
+        budget = RetryBudget(ratio=0.0, min_retries=1)
+        flaky = Flaky(5)
+        with self.assertRaises(ConnectionError):
+            retry_on_exception(retries=5, budget=budget)(flaky)()
+        self.assertEqual(flaky.calls, 2)
+
+    def test_async_retry(self, sleep):
+        calls = []
+
+        @retry_on_exception(retries=3, delay=0.001)
+        async def load():
+            calls.append(1)
+            if len(calls) < 2:
+                raise ConnectionError("blob storage unavailable")
+            return "data"
+
+        self.assertEqual(asyncio.run(load()), "data")
+        self.assertEqual(len(calls), 2)
+        sleep.assert_not_called()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(max_failures=2, reset_timeout=10, clock=self.clock)
+
+    def trip(self):
+        with self.assertRaises(ConnectionError):
+            self.breaker.call(Flaky(1))
+        with self.assertRaises(CircuitBreakerOpenError):
+            self.breaker.call(Flaky(1))
+
+    def test_half_open_probe_closes_breaker(self):
+        self.trip()
+        self.assertEqual(self.breaker.state, "OPEN")
+        with self.assertRaises(CircuitBreakerOpenError):
+            self.breaker.call(lambda: "ok")
+        self.clock.now = 10
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, "CLOSED")
+        counters = self.breaker.metrics.snapshot()["counters"]
+        self.assertEqual((counters["rejected"], counters["to_half_open"], counters["to_closed"]), (1, 1, 1))
+
+    def test_failed_probe_reopens(self):
+        self.trip()
+        self.clock.now = 10
+        with self.assertRaises(CircuitBreakerOpenError):
+            self.breaker.call(Flaky(1))
+        self.assertEqual(self.breaker.state, "OPEN")
+        self.clock.now = 15
+        with self.assertRaises(CircuitBreakerOpenError):
+            self.breaker.call(lambda: "ok")
+
+    def test_half_open_admits_one_probe_at_a_time(self):
+        self.trip()
+        self.clock.now = 10
+
+        def probe():
+            with self.assertRaises(CircuitBreakerOpenError):
+                self.breaker.call(lambda: "second probe")
+            return "ok"
+
+        self.assertEqual(self.breaker.call(probe), "ok")
+        self.assertEqual(self.breaker.state, "CLOSED")
+
+    def test_async_breaker_and_retry_fail_fast(self):
+        @retry_on_exception(retries=5, delay=0)
+        @self.breaker
+        async def fetch():
+            raise ConnectionError("down")
+
+        with self.assertRaises(CircuitBreakerOpenError):
+            asyncio.run(fetch())
+        # Retries stop as soon as the breaker opens.
+        self.assertEqual(self.breaker.metrics.snapshot()["counters"]["failures"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
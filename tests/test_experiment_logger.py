@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mlflow.tracking import MlflowClient
+from sklearn.linear_model import LinearRegression
+
+from src.mlflow_integration.experiment_logger import ExperimentLogger
+from src.utils.error_handler import ExperimentLoggingError
+
+
+class CountingClient(MlflowClient):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = {}
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if name in ("log_batch", "log_artifact", "log_param", "log_metric"):
+            calls = super().__getattribute__("calls")
+            calls[name] = calls.get(name, 0) + 1
+        return attribute
+
+
+class TestExperimentLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.uri = "file://" + os.path.join(self.tmp.name, "mlruns")
+        self.artifact = os.path.join(self.tmp.name, "sales.csv")
+        with open(self.artifact, "w") as f:
+            f.write("Column Name,Description\nMRP,Maximum retail price\n")
+        self.client = CountingClient(self.uri)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches_and_dedupes_artifacts(self):
+        with ExperimentLogger(experiment_name="pricing", client=self.client) as logger:
+            run_ids = []
+            for name in ("ridge", "forest"):
+                with logger.start_run(run_name=name) as run_id:
+                    logger.log_params(run_id, {f"p{i}": i for i in range(150)})
+                    logger.log_metrics(run_id, {"mse": 1.5, "r2": 0.9, "revenue": None})
+                    logger.log_artifact(run_id, self.artifact)
+                    run_ids.append(run_id)
+        self.assertEqual(self.client.calls["log_artifact"], 1)
+        # 150 params need two batches per run; metrics ride along in the first.
+        self.assertEqual(self.client.calls["log_batch"], 4)
+        self.assertNotIn("log_param", self.client.calls)
+        runs = [self.client.get_run(run_id) for run_id in run_ids]
+        self.assertEqual({run.info.status for run in runs}, {"FINISHED"})
+        self.assertEqual(len(runs[1].data.params), 150)
+        self.assertEqual(runs[1].data.metrics, {"mse": 1.5, "r2": 0.9})
+        uris = {run.data.tags["artifact.sales.csv"] for run in runs}
+        self.assertEqual(len(uris), 1)
+
+        # A new process finds the stored content and does not upload it again.
+        client = CountingClient(self.uri)
+        with ExperimentLogger(experiment_name="pricing", client=client) as logger:
+            with logger.start_run() as run_id:
+                logger.log_artifact(run_id, self.artifact)
+        self.assertNotIn("log_artifact", client.calls)
+        self.assertEqual(client.get_run(run_id).data.tags["artifact.sales.csv"], uris.pop())
+
+    def test_model_upload_and_flush_errors(self):
+        logger = ExperimentLogger(experiment_name="pricing", client=self.client)
+        with logger.start_run() as run_id:
+            logger.log_model(run_id, LinearRegression().fit([[0.0], [1.0]], [0.0, 1.0]), "model")
+            logger.log_artifact(run_id, os.path.join(self.tmp.name, "missing.csv"))
+        with self.assertRaises(ExperimentLoggingError):
+            logger.flush()
+        logger.close()
+        artifacts = [f.path for f in self.client.list_artifacts(run_id, "model")]
+        self.assertIn("model/MLmodel", artifacts)
+
+    @mock.patch("time.sleep")
+    def test_unreachable_server_fails_fast(self, sleep):
+        logger = ExperimentLogger(experiment_name="pricing", client=self.client)
+        with mock.patch.object(self.client, "log_batch", side_effect=ConnectionError("unreachable")) as log_batch:
+            for name in range(10):
+                with logger.start_run(run_name=str(name)) as run_id:
+                    logger.log_metrics(run_id, {"mse": 1.0})
+            with self.assertRaises(ExperimentLoggingError):
+                logger.flush()
+        logger.close()
+        self.assertEqual(logger.breaker.state, "OPEN")
+        self.assertLessEqual(log_batch.call_count, 3)
+
+    def test_uses_experiment_set_through_mlflow(self):
+        import mlflow
+
+        from src.mlflow_integration.mlflow_utils import setup_mlflow_tracking
+
+        previous = mlflow.get_tracking_uri()
+        try:
+            with mock.patch.dict(os.environ):
+                setup_mlflow_tracking(self.uri, "configured")
+                logger = ExperimentLogger(client=self.client)
+                logger.close()
+            self.assertEqual(logger.experiment_id, self.client.get_experiment_by_name("configured").experiment_id)
+            self.assertNotIn("MLFLOW_EXPERIMENT_NAME", os.environ)
+
+            with mock.patch.dict(os.environ, {"MLFLOW_EXPERIMENT_ID": logger.experiment_id}):
+                by_id = ExperimentLogger(client=self.client)
+                by_id.close()
+            self.assertEqual(by_id.experiment_id, logger.experiment_id)
+        finally:
+            mlflow.set_tracking_uri(previous)
+
+
+if __name__ == '__main__':
+    unittest.main()
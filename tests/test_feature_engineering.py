@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.feature_engineering import FeatureEngineer
+
+
+def make_frame(n=40, seed=1):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=n, freq="D").repeat(2),
+        "FC_ID": ["FC1", "FC2"] * n,
+        "SellingPrice": rng.uniform(80, 120, 2 * n),
+        "UnitsSold": rng.integers(1, 30, 2 * n).astype(float),
+        "CTR": rng.uniform(0, 0.1, 2 * n),
+        "StockEnd": rng.integers(100, 200, 2 * n),
+        "SafetyStock": 50,
+        "Demand": rng.integers(10, 40, 2 * n),
+        "FinalPrice": rng.uniform(80, 120, 2 * n),
+    })
+    df.loc[[5, 17], "UnitsSold"] = np.nan
+    return df
+
+
+class TestFeatureEngineer(unittest.TestCase):
+
+    def test_full_recompute_matches_legacy_formula(self):
+        df = make_frame()
+        features = FeatureEngineer().fit_transform(df)
+        expected = df['UnitsSold'].pct_change() / df['SellingPrice'].pct_change()
+        np.testing.assert_allclose(features['PriceElasticity'], expected, equal_nan=True)
+        np.testing.assert_allclose(features['EngagementScore'], df['CTR'] * 0.4)
+        self.assertIn('InventoryHealth', features)
+        self.assertIn('CompetitorPriceGap', features)
+
+    def test_incremental_matches_full_recompute(self):
+        df = make_frame()
+        for kwargs in ({}, {"partition_cols": ["FC_ID"], "rolling_windows": {"UnitsSold": 7}}):
+            full = FeatureEngineer(**kwargs).fit_transform(df)
+            engineer = FeatureEngineer(**kwargs).fit(df.iloc[:30])
+            parts = [engineer.transform(df.iloc[30:51]), engineer.transform(df.iloc[51:])]
+            incremental = pd.concat(parts)
+            pd.testing.assert_frame_equal(full.iloc[30:], incremental)
+
+    def test_state_round_trip(self):
+        df = make_frame()
+        kwargs = {"partition_cols": ["FC_ID"], "rolling_windows": {"UnitsSold": 3}}
+        engineer = FeatureEngineer(**kwargs).fit(df.iloc[:50])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "state.json")
+            engineer.save_state(path)
+            restored = FeatureEngineer.load_state(path)
+        pd.testing.assert_frame_equal(engineer.transform(df.iloc[50:]), restored.transform(df.iloc[50:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.features.feature_engineering import FeatureEngineer
+from src.features.feature_store import FeatureStore
+from src.pipelines import dynamic_pricing_pipeline as pipeline
+from tests.helpers import make_raw_sources, raw_data_dir
+
+
+def _load_and_collect(root, fingerprint, rounds):
+    store = FeatureStore(root)
+    for _ in range(rounds):
+        store.load(fingerprint, {"double": "v1"})
+        store.gc(keep=["shared"], keep_latest=0)
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = FeatureStore(os.path.join(self.tmp.name, "store"))
+        self.raw_dir = os.path.join(self.tmp.name, "raw")
+        os.makedirs(self.raw_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_materialize_reuses_unchanged_features(self):
+        base = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+        computed = []
+
+        def compute(df, names):
+            computed.append(sorted(names))
+            return df.assign(double=df["a"] * 2, triple=df["a"] * 3)
+
+        first = self.store.materialize("fp", {"double": "v1", "triple": "v1"}, lambda: base, compute)
+        self.store.materialize("fp", {"double": "v1", "triple": "v1"}, lambda: base, compute)
+        self.store.materialize("fp", {"double": "v1", "triple": "v2"}, lambda: base, compute)
+        self.assertEqual(computed, [["double", "triple"], ["triple"]])
+        self.assertEqual(first["triple"].tolist(), [3.0, 6.0, 9.0])
+
+    def test_gc_removes_stale_fingerprints_and_versions(self):
+        base = pd.DataFrame({"a": [1.0]})
+        compute = lambda df, names: df.assign(f=df["a"])
+        self.store.materialize("old", {"f": "v1"}, lambda: base, compute)
+        self.store.materialize("new", {"f": "v1"}, lambda: base, compute)
+        self.store.materialize("new", {"f": "v2"}, lambda: base, compute)
+        self.store.gc(keep=["new"], keep_latest=0, versions={"f": "v2"})
+        self.assertEqual(self.store.fingerprints(), ["new"])
+        self.assertEqual(self.store.missing_features("new", {"f": "v1", "f2": "v2"}), ["f", "f2"])
+        self.assertEqual(self.store.missing_features("new", {"f": "v2"}), [])
+
+    def test_concurrent_runs_neither_corrupt_meta_nor_delete_in_use_entries(self):
+        base = pd.DataFrame({"a": [1.0, 2.0]})
+
+        def compute(df, names):
+            return df.assign(double=df["a"] * 2)
+
+        for fingerprint in ("shared", "own"):
+            self.store.materialize(fingerprint, {"double": "v1"}, lambda: base, compute)
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_load_and_collect, args=(self.store.root, "shared", 200))
+                     for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes], [0, 0, 0])
+        self.assertEqual(self.store.fingerprints(), ["shared"])
+        self.assertEqual(self.store.load("shared", {"double": "v1"})["double"].tolist(), [2.0, 4.0])
+
+    def test_pipeline_load_features_skips_rebuild(self):
+        with raw_data_dir(self.raw_dir, make_raw_sources()):
+            first = pipeline.load_features(store=self.store)
+            with mock.patch.object(pipeline, "load_and_validate_data") as load:
+                second = pipeline.load_features(store=self.store)
+            load.assert_not_called()
+        expected = FeatureEngineer().fit_transform(first.drop(columns=list(FeatureEngineer.FEATURE_VERSIONS)))
+        pd.testing.assert_frame_equal(second, first)
+        pd.testing.assert_frame_equal(first, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.join import GranularityJoiner
+
+
+class TestGranularityJoiner(unittest.TestCase):
+
+    def setUp(self):
+        self.sales = pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-02", "2024-01-01", "2024-01-03", None]),
+            "MRP": [100.0, 100.0, 100.0, 100.0],
+            "UnitsSold": [5, 3, 7, 1],
+        })
+        self.inventory = pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"]),
+            "FC_ID": ["FC1", "FC2", "FC1", "FC2"],
+            "IsMetro": [True, False, True, False],
+            "StockEnd": [10, 20, 30, 40],
+            "LeadTimeFloat": [1.0, 3.0, 2.0, 4.0],
+        })
+        self.competitor = pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"]),
+            "Brand": ["A", "B", "A"],
+            "MRP": [90.0, 110.0, 95.0],
+            "FinalPrice": [80.0, 100.0, 85.0],
+        })
+
+    def test_join_keeps_sales_rows_and_order(self):
+        joiner = GranularityJoiner().fit(
+            {"inventory": self.inventory, "competitor": self.competitor}, self.sales.columns
+        )
+        df, stages = joiner.join(self.sales)
+        self.assertEqual(len(df), len(self.sales))
+        np.testing.assert_array_equal(df["UnitsSold"], self.sales["UnitsSold"])
+        by_source = {s.source: s for s in stages}
+        self.assertEqual(by_source["inventory"].multiplication_factor, 1.0)
+        self.assertGreater(by_source["inventory"].naive_multiplication_factor, 1.0)
+        self.assertEqual(by_source["inventory"].grain_rows, 2)
+        # Inventory is aggregated to one row per day: counts and rates averaged, flags kept as flags.
+        first_day = df[df["Date"] == "2024-01-01"].iloc[0]
+        self.assertEqual(first_day["StockEnd"], 15)
+        self.assertEqual(first_day["LeadTimeFloat"], 2.0)
+        self.assertIs(bool(first_day["IsMetro"]), True)
+        self.assertEqual(df["IsMetro"].dtype, object)  # the undated row has no flag
+        # Colliding competitor columns are suffixed instead of replacing sales columns.
+        self.assertEqual(first_day["MRP"], 100.0)
+        self.assertEqual(first_day["MRP_competitor"], 100.0)
+
+    def test_asof_fills_missing_days_from_previous_day(self):
+        joiner = GranularityJoiner().fit({"inventory": self.inventory}, self.sales.columns)
+        df, stages = joiner.join(self.sales)
+        self.assertEqual(df.loc[2, "StockEnd"], 35)
+        self.assertEqual(stages[0].unmatched_rows, 1)  # the row without a date
+
+        exact = GranularityJoiner(asof=False).fit({"inventory": self.inventory}, self.sales.columns)
+        df, stages = exact.join(self.sales)
+        self.assertTrue(np.isnan(df.loc[2, "StockEnd"]))
+        self.assertEqual(stages[0].unmatched_rows, 2)
+
+    def test_warns_when_grain_key_is_aggregated_away(self):
+        with self.assertLogs(level="WARNING") as logs:
+            GranularityJoiner().fit({"inventory": self.inventory}, self.sales.columns)
+        self.assertIn("['FC_ID']", logs.output[0])
+        sales = self.sales.assign(FC_ID="FC1")
+        with self.assertNoLogs(level="WARNING"):
+            GranularityJoiner().fit({"inventory": self.inventory}, sales.columns)
+
+    def test_shared_grain_key_joins_per_key(self):
+        sales = self.sales.dropna().assign(FC_ID=["FC2", "FC1", "FC1"])
+        df, stages = GranularityJoiner().fit({"inventory": self.inventory}, sales.columns).join(sales)
+        self.assertEqual(stages[0].keys, ["Date", "FC_ID"])
+        self.assertEqual(df["StockEnd"].tolist(), [40, 10, 30])
+
+    def test_categorical_dimension_key_joins_object_sales_key(self):
+        sales = self.sales.dropna().assign(Brand=["B", "A", "A"])
+        competitor = self.competitor.astype({"Brand": "category"})
+        df, _ = GranularityJoiner().fit({"competitor": competitor}, sales.columns).join(sales)
+        self.assertEqual(df["FinalPrice"].tolist(), [100.0, 80.0, 85.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+from src.utils.logger import AppInsightsHandler, BoundedQueueHandler, Logger, MemorySink
+
+CONFIG = """
+version: 1
+disable_existing_loggers: false
+formatters:
+  json:
+    (): pythonjsonlogger.jsonlogger.JsonFormatter
+    format: '%(asctime)s %(levelname)s %(name)s %(message)s'
+handlers:
+  file:
+    class: logging.FileHandler
+    filename: {path}
+    formatter: json
+root:
+  level: INFO
+  handlers: [file]
+"""
+
+
+def make_record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root_handlers = list(logging.getLogger().handlers)
+        self.log_path = os.path.join(self.tmp.name, "logs", "application.log")
+        self.config_path = os.path.join(self.tmp.name, "logging.yaml")
+        with open(self.config_path, "w") as f:
+            f.write(CONFIG.format(path=self.log_path))
+
+    def tearDown(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        for handler in self.root_handlers:
+            root.addHandler(handler)
+        self.tmp.cleanup()
+
+    def test_records_reach_handlers_and_exporter_through_queue(self):
+        sink = MemorySink()
+        logger = Logger(self.config_path, app_insights_sink=sink, app_insights_batch_size=2)
+        self.assertEqual(logging.getLogger().handlers, [logger.queue_handler])
+        for i in range(3):
+            logger.log_message(f"price {i}", extra={"correlation_id": "abc"})
+        logger.stop()
+        with open(self.log_path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["message"] for line in lines], ["price 0", "price 1", "price 2"])
+        self.assertEqual(lines[0]["correlation_id"], "abc")
+        self.assertEqual([len(batch) for batch in sink.batches], [2, 1])
+        self.assertIn(logger.handlers[0], logging.getLogger().handlers)
+
+    def test_configured_once_while_running(self):
+        logger = Logger(self.config_path)
+        try:
+            self.assertIs(Logger(self.config_path), logger)
+            self.assertEqual(logging.getLogger().handlers, [logger.queue_handler])
+        finally:
+            logger.stop()
+        restarted = Logger(self.config_path)
+        self.assertIsNot(restarted, logger)
+        restarted.stop()
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+
+    def test_overflow_policies(self):
+        drop = BoundedQueueHandler(maxsize=2, policy="drop")
+        oldest = BoundedQueueHandler(maxsize=2, policy="drop_oldest")
+        for i in range(5):
+            drop.handle(make_record(str(i)))
+            oldest.handle(make_record(str(i)))
+        self.assertEqual(drop.dropped, 3)
+        self.assertEqual([drop.queue.get().msg for _ in range(2)], ["0", "1"])
+        self.assertEqual([oldest.queue.get().msg for _ in range(2)], ["3", "4"])
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(policy="spill")
+
+
+class TestAppInsightsHandler(unittest.TestCase):
+
+    def test_flushes_by_interval(self):
+        sink = MemorySink()
+        handler = AppInsightsHandler(sink, batch_size=100, flush_interval=0.05)
+        handler.handle(make_record("hello"))
+        deadline = time.monotonic() + 2
+        while not sink.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        handler.close()
+        self.assertEqual(sink.entries, ["hello"])
+
+    def test_failed_exports_are_counted(self):
+        def failing_sink(batch):
+            raise ConnectionError("exporter down")
+
+        handler = AppInsightsHandler(failing_sink, batch_size=1, flush_interval=None)
+        handler.handle(make_record("hello"))
+        handler.close()
+        self.assertEqual((handler.exported, handler.failed), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from src.models.partitioned import PartitionedModel, PartitionedTrainer
+from src.pipelines import dynamic_pricing_pipeline as pipeline
+
+
+def make_data(sizes=None, seed=0):
+    """
+    One frame with a different price slope per FC; FC_SMALL has too few rows of its own.
+    """
+    sizes = sizes or {"FC001": 400, "FC002": 300, "FC003": 200, "FC_SMALL": 20}
+    rng = np.random.default_rng(seed)
+    frames = []
+    for slope, (fc, n) in enumerate(sizes.items(), start=1):
+        x = rng.normal(size=(n, 2))
+        frames.append(pd.DataFrame({
+            "FC_ID": fc, "IsMetro": slope % 2 == 0, "a": x[:, 0], "b": x[:, 1],
+            "SellingPrice": 100 + 10 * slope * x[:, 0] - x[:, 1] + rng.normal(scale=0.1, size=n),
+        }))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+class TestPartitionedTrainer(unittest.TestCase):
+
+    def test_partitions_get_own_models_and_small_ones_fall_back(self):
+        df = make_data()
+        bundle = PartitionedTrainer(LinearRegression(), keys="FC_ID", min_rows=100, n_jobs=1).fit(df, ["a", "b"])
+        self.assertEqual(set(bundle.models), {("FC001",), ("FC002",), ("FC003",)})
+        report = bundle.report.set_index("FC_ID")
+        self.assertEqual(report.loc["FC_SMALL", "reason"], "too_small")
+        self.assertTrue((report.loc[["FC001", "FC002", "FC003"], "mse"] < 0.1).all())
+        # One slope cannot fit all FCs, so the bundle beats the global model.
+        self.assertLess(bundle.report.attrs["bundle"]["mse"], bundle.report.attrs["global"]["mse"])
+        self.assertIs(bundle.model_for("FC_SMALL"), bundle.global_model)
+        self.assertIs(bundle.model_for("FC404"), bundle.global_model)
+
+    def test_predict_routes_rows_to_their_partition(self):
+        df = make_data()
+        bundle = PartitionedTrainer(LinearRegression(), keys=["FC_ID"], min_rows=100, n_jobs=1).fit(df, ["a", "b"])
+        rows = df.iloc[::7]
+        preds = bundle.predict(rows)
+        for position, (_, row) in enumerate(rows.iterrows()):
+            expected = bundle.model_for(row["FC_ID"]).predict(rows[["a", "b"]].iloc[[position]])[0]
+            self.assertAlmostEqual(preds[position], expected)
+        # Keys can also be passed next to a feature-only frame.
+        np.testing.assert_allclose(bundle.predict(rows[["a", "b"]], partitions=rows[["FC_ID"]]), preds)
+
+    def test_global_model_kept_when_partition_model_is_worse(self):
+        # The same noisy relationship everywhere, with many irrelevant features: each
+        # partition model overfits its few rows, the global model sees them all.
+        rng = np.random.default_rng(1)
+        df = make_data({"FC001": 40, "FC002": 40})
+        noise = [f"noise{i}" for i in range(20)]
+        df[noise] = rng.normal(size=(len(df), len(noise)))
+        df["SellingPrice"] = 100 + 10 * df["a"] + rng.normal(scale=5, size=len(df))
+        bundle = PartitionedTrainer(LinearRegression(), keys="FC_ID", min_rows=30, n_jobs=1).fit(df, ["a"] + noise)
+        self.assertEqual(bundle.models, {})
+        self.assertEqual(set(bundle.report["reason"]), {"global_better"})
+
+    def test_composite_key_in_process_pool(self):
+        df = make_data()
+        serial = PartitionedTrainer(LinearRegression(), keys=["IsMetro", "FC_ID"], min_rows=100, n_jobs=1)
+        pooled = PartitionedTrainer(LinearRegression(), keys=["IsMetro", "FC_ID"], min_rows=100, n_jobs=2)
+        expected, bundle = serial.fit(df, ["a", "b"]), pooled.fit(df, ["a", "b"])
+        self.assertEqual(set(bundle.models), set(expected.models))
+        self.assertIn((True, "FC002"), bundle.models)
+        np.testing.assert_allclose(bundle.predict(df), expected.predict(df))
+
+    def test_missing_key_raises(self):
+        with self.assertRaises(ValueError):
+            PartitionedTrainer(LinearRegression(), keys="Brand").fit(make_data(), ["a", "b"])
+
+    def test_bundle_round_trips(self):
+        df = make_data()
+        bundle = PartitionedTrainer(LinearRegression(), min_rows=100, n_jobs=1).fit(df, ["a", "b"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bundle.pkl")
+            bundle.save(path)
+            loaded = PartitionedModel.load(path)
+        np.testing.assert_allclose(loaded.predict(df), bundle.predict(df))
+
+
+class TestPartitionedPipeline(unittest.TestCase):
+
+    def test_train_partitioned_models(self):
+        bundle = pipeline.train_partitioned_models(make_data(), ["a", "b"], ["FC_ID"], LinearRegression(),
+                                                   min_rows=100, n_jobs=1)
+        self.assertEqual(len(bundle.report), 4)
+        self.assertEqual((bundle.report["served_by"] == "partition").sum(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.synthetic import SyntheticDataGenerator
+from src.models.artifact import load_model
+from src.pipelines import dynamic_pricing_pipeline as pipeline
+from tests.helpers import make_raw_sources, raw_data_dir
+
+
+class TestStreamingLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sources = make_raw_sources(days=6, sales_per_day=5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_row_chunks_match_full_load(self):
+        with raw_data_dir(self.tmp.name, self.sources):
+            full = pipeline.load_and_validate_data()
+            chunks = list(pipeline.stream_load_and_validate_data(chunksize=7))
+        self.assertGreater(len(chunks), 1)
+        streamed = pd.concat(chunks, ignore_index=True)
+        # Streamed integer and bool columns are nullable, so every chunk shares one dtype.
+        pd.testing.assert_frame_equal(full.reset_index(drop=True).astype(streamed.dtypes.to_dict()), streamed)
+
+    def test_referential_rules_are_built_once(self):
+        with raw_data_dir(self.tmp.name, self.sources), \
+                mock.patch.object(pipeline, "referential_rules", wraps=pipeline.referential_rules) as rules:
+            chunks = list(pipeline.stream_load_and_validate_data(chunksize=7))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(rules.call_count, 1)
+
+    def test_date_partitions_hold_one_day_each(self):
+        with raw_data_dir(self.tmp.name, self.sources):
+            days = list(pipeline.stream_load_and_validate_data(chunksize=7, partition="date"))
+        self.assertEqual(len(days), 6)
+        for day in days:
+            self.assertEqual(day['Date'].nunique(), 1)
+
+    def test_write_partitioned_dataset(self):
+        with raw_data_dir(self.tmp.name, self.sources):
+            chunks = pipeline.stream_load_and_validate_data(chunksize=10)
+            out_dir = os.path.join(self.tmp.name, "dataset")
+            paths = DataLoader.write_partitioned(chunks, out_dir, partition_col="Date")
+        self.assertTrue(os.path.isdir(os.path.join(out_dir, "Date=2024-01-01")))
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+
+
+class TestPartitionedPipeline(unittest.TestCase):
+
+    def load(self, sales_keys):
+        generator = SyntheticDataGenerator(rows=1200, days=12, fcs=3, brands=2, seed=3, sales_keys=sales_keys)
+        with tempfile.TemporaryDirectory() as tmp, raw_data_dir(tmp, generator.generate()):
+            return pipeline.feature_engineering(pipeline.load_and_validate_data())
+
+    def test_partition_keys_survive_the_join_when_sales_carry_them(self):
+        from sklearn.linear_model import LinearRegression
+
+        df = self.load(sales_keys=True)
+        self.assertEqual(set(df["IsMetro"]), {True, False})
+        for keys in (["FC_ID"], ["IsMetro"]):
+            bundle = pipeline.train_partitioned_models(df, ["MRP", "NoPromoPrice"], keys, LinearRegression(),
+                                                       min_rows=50, n_jobs=1)
+            self.assertEqual(len(bundle.report), df[keys[0]].nunique())
+
+    def test_aggregated_away_keys_are_rejected(self):
+        from sklearn.linear_model import LinearRegression
+
+        df = self.load(sales_keys=False)
+        for key, message in (("FC_ID", "do not carry it"), ("IsMetro", "carry no ['FC_ID']"),
+                             ("FinalPrice", "carry no ['Brand']")):
+            with self.assertRaises(ValueError) as raised:
+                pipeline.train_partitioned_models(df, ["MRP", "NoPromoPrice"], [key], LinearRegression(), n_jobs=1)
+            self.assertIn(message, str(raised.exception))
+
+
+class TestMain(unittest.TestCase):
+
+    def test_logged_models_are_refit_on_all_rows(self):
+        from sklearn.linear_model import LinearRegression
+
+        generator = SyntheticDataGenerator(rows=2000, days=100, fcs=2, brands=2, seed=5)
+        with tempfile.TemporaryDirectory() as tmp, raw_data_dir(tmp, generator.generate()):
+            df = pipeline.feature_engineering(pipeline.load_and_validate_data())
+        tuned = {}
+
+        def train_models(X_train, y_train):
+            tuned["rows"] = len(X_train)
+            tuned["LinearRegression"] = LinearRegression().fit(X_train, y_train)
+            return {"LinearRegression": tuned["LinearRegression"]}
+
+        logged = []
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = os.path.join(tmp, "models", "model.pma")
+            with mock.patch.object(pipeline, "load_features", return_value=df), \
+                    mock.patch.object(pipeline, "train_models", side_effect=train_models), \
+                    mock.patch.object(pipeline, "log_experiment", side_effect=lambda *args: logged.append(args)), \
+                    mock.patch.object(pipeline, "MODEL_PATH", model_path), \
+                    mock.patch.object(pipeline, "ExperimentLogger"), mock.patch.object(pipeline, "Logger"), \
+                    mock.patch.object(pipeline, "install_exception_handler"):
+                pipeline.main()
+            (name, model, _, _, X, y, _, artifact_path), = logged
+            self.assertLess(tuned["rows"], len(X))
+            self.assertIsNot(model, tuned["LinearRegression"])
+            np.testing.assert_allclose(model.coef_, LinearRegression().fit(X, y).coef_)
+            # The selected model is published as the served artifact and attached to its run.
+            self.assertEqual(artifact_path, model_path)
+            published = load_model(model_path)
+            self.assertEqual(list(published.feature_names_in_), list(X.columns))
+            np.testing.assert_allclose(published.predict(X), model.predict(X), rtol=1e-9)
+
+
+class TestLogExperiment(unittest.TestCase):
+
+    def test_runs_share_stored_raw_inputs(self):
+        from mlflow.tracking import MlflowClient
+        from sklearn.linear_model import LinearRegression
+
+        from src.mlflow_integration.experiment_logger import ExperimentLogger
+
+        with tempfile.TemporaryDirectory() as tmp:
+            client = MlflowClient("file://" + os.path.join(tmp, "mlruns"))
+            model = LinearRegression().fit([[0.0], [1.0]], [0.0, 1.0])
+            with ExperimentLogger(experiment_name="pricing", client=client) as experiment_logger:
+                for name in ("a", "b"):
+                    pipeline.log_experiment(name, model, {"mse": 0.1, "revenue": None}, model.get_params(),
+                                            None, None, experiment_logger)
+            runs = client.search_runs([client.get_experiment_by_name("pricing").experiment_id])
+            runs = [run for run in runs if "artifact_store" not in run.data.tags]
+            self.assertEqual(len(runs), 2)
+            tags = [{k: v for k, v in run.data.tags.items() if k.startswith("artifact.")} for run in runs]
+            self.assertEqual(len(tags[0]), 4)
+            self.assertEqual(tags[0], tags[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import pickle
+import unittest
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.models.model import PricingModel
+from src.models.prediction_cache import PredictionCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingRegression(LinearRegression):
+
+    def predict(self, X):
+        self.rows_scored = getattr(self, "rows_scored", 0) + len(X)
+        return super().predict(X)
+
+
+class TestPredictionCache(unittest.TestCase):
+
+    def test_lru_eviction_and_ttl(self):
+        clock = FakeClock()
+        cache = PredictionCache(max_entries=2, ttl=10, clock=clock)
+        keys = cache.keys(np.array([[1.0], [2.0], [3.0]]))
+        cache.put_many(keys[:2], [1.0, 2.0], version=1)
+        cache.get_many(keys[:1], version=1)
+        cache.put_many(keys[2:], [3.0], version=1)
+        values, missing = cache.get_many(keys, version=1)
+        self.assertEqual(missing.tolist(), [1])
+        self.assertEqual(values[[0, 2]].tolist(), [1.0, 3.0])
+        clock.now = 11
+        _, missing = cache.get_many(keys, version=1)
+        self.assertEqual(len(missing), 3)
+        stats = cache.stats()
+        self.assertEqual((stats["evictions"], stats["expirations"], stats["hits"]), (1, 2, 3))
+
+    def test_quantized_keys(self):
+        cache = PredictionCache(decimals=2)
+        a, b, c = cache.keys(np.array([[1.001, -0.0], [1.0, 0.0], [1.01, 0.0]]))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+
+class TestPricingModelCache(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(100, 3))
+        self.model = PricingModel(CountingRegression(), StandardScaler()).enable_cache()
+        self.model.train(self.X, self.X @ [1.0, 2.0, 3.0])
+
+    def test_batch_sends_only_misses(self):
+        expected = self.model.predict(self.X[:10])
+        batch = np.vstack([self.X[:10], self.X[10:15], self.X[10:15]])
+        predictions = self.model.predict(batch)
+        self.assertEqual(self.model.model.rows_scored, 15)
+        np.testing.assert_allclose(predictions[:10], expected)
+        np.testing.assert_allclose(predictions[15:], predictions[10:15])
+        self.assertEqual(self.model.cache.stats()["hits"], 10)
+
+    def test_retraining_invalidates(self):
+        before = self.model.predict(self.X[:5])
+        self.model.train(self.X, self.X @ [-1.0, 0.0, 0.0])
+        np.testing.assert_allclose(self.model.predict(self.X[:5]), -self.X[:5, 0], atol=1e-9)
+        self.assertFalse(np.allclose(before, -self.X[:5, 0]))
+
+    def test_pickles_without_entries(self):
+        self.model.predict(self.X)
+        restored = pickle.loads(pickle.dumps(self.model))
+        self.assertEqual(restored.cache.stats()["entries"], 0)
+        np.testing.assert_allclose(restored.predict(self.X[:3]), self.model.predict(self.X[:3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
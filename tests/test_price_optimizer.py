@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.models.model import PricingModel
+from src.models.price_optimizer import PriceOptimizer
+
+
+class TestPriceOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        # Demand falls linearly with price, so revenue peaks at a price of 100.
+        rng = np.random.default_rng(0)
+        history = pd.DataFrame({"SellingPrice": rng.uniform(50, 150, 500), "CTR": rng.uniform(0, 0.1, 500)})
+        self.model = PricingModel(LinearRegression(), StandardScaler())
+        self.model.train(history, 100 - 0.5 * history["SellingPrice"])
+        self.rows = pd.DataFrame({
+            "FC_ID": ["FC1", "FC2", "FC3"],
+            "MRP": [120.0, 120.0, 120.0],
+            "SellingPrice": [110.0, 110.0, 110.0],
+            "CTR": [0.05, 0.05, 0.05],
+            "FinalPrice": [np.nan, 90.0, np.nan],
+            "InventoryHealth": [5.0, 5.0, 0.2],
+        })
+
+    def optimizer(self, **kwargs):
+        return PriceOptimizer(self.model, ["SellingPrice", "CTR"], max_competitor_premium=0.0,
+                              min_inventory_health=1.0, **kwargs)
+
+    def test_constraints_are_masks_over_the_grid(self):
+        result = self.optimizer().optimize(self.rows)
+        self.assertEqual(result["FC_ID"].tolist(), ["FC1", "FC2", "FC3"])
+        self.assertAlmostEqual(result["OptimalPrice"].iloc[0], 100.2)
+        self.assertAlmostEqual(result["OptimalPrice"].iloc[1], 89.4)
+        self.assertAlmostEqual(result["OptimalPrice"].iloc[2], 111.0)
+        self.assertTrue(result["Feasible"].all())
+        np.testing.assert_allclose(result["ExpectedValue"], result["OptimalPrice"] * result["ExpectedUnits"])
+
+    def test_margin_objective_and_chunking(self):
+        result = self.optimizer(objective="margin", unit_cost=0.5, max_batch_rows=25).optimize(self.rows)
+        self.assertAlmostEqual(result["OptimalPrice"].iloc[0], 120.0)
+
+    def test_infeasible_rows(self):
+        rows = self.rows.assign(FinalPrice=10.0)
+        result = self.optimizer().optimize(rows)
+        self.assertFalse(result["Feasible"].any())
+        self.assertTrue(result["OptimalPrice"].isna().all())
+
+    def test_price_derived_features_follow_the_candidate(self):
+        # Demand depends only on the gap to the competitor, which moves with the price.
+        rng = np.random.default_rng(1)
+        history = pd.DataFrame({"SellingPrice": rng.uniform(50, 150, 500), "FinalPrice": rng.uniform(50, 150, 500)})
+        history["CompetitorPriceGap"] = history["SellingPrice"] - history["FinalPrice"]
+        model = PricingModel(LinearRegression(), StandardScaler())
+        model.train(history[["SellingPrice", "CompetitorPriceGap"]], 100 - 0.5 * history["CompetitorPriceGap"])
+        model.enable_cache()
+        rows = self.rows.assign(FinalPrice=100.0, CompetitorPriceGap=10.0)
+        optimizer = PriceOptimizer(model, ["SellingPrice", "CompetitorPriceGap"])
+        result = optimizer.optimize(rows)
+        np.testing.assert_allclose(result["ExpectedUnits"], 100 - 0.5 * (result["OptimalPrice"] - 100.0))
+        self.assertEqual(len(model.cache.entries), 0)
+        with self.assertRaises(ValueError):
+            PriceOptimizer(model, ["SellingPrice", "PriceElasticity"])
+
+
+if __name__ == '__main__':
+    unittest.main()
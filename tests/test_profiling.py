@@ -0,0 +1,163 @@
+import logging
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+
+from src.models.search import ModelSearch
+from src.pipelines import dynamic_pricing_pipeline as pipeline
+from src.utils.profiling import Profiler, SamplingProfiler, get_profiler, profiled, set_profiler
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+class FakeExperimentLogger:
+
+    def __init__(self):
+        self.metrics, self.artifacts = {}, []
+
+    def log_metrics(self, run_id, metrics):
+        self.metrics.update(metrics)
+
+    def log_artifact(self, run_id, path):
+        self.artifacts.append(path)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = Profiler()
+        self.addCleanup(self.profiler.close)
+        previous = set_profiler(self.profiler)
+        self.addCleanup(set_profiler, previous)
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler(enabled=False)
+        set_profiler(profiler)
+
+        @profiled(rows=len)
+        def double(values):
+            return values * 2
+
+        with profiler.stage("outer") as stage:
+            stage.rows = 3
+            self.assertEqual(double([1]), [1, 1])
+        profiler.add("external", wall_seconds=1.0)
+        self.assertEqual(profiler.records, [])
+        self.assertIsNone(profiler.sampler)
+
+    def test_nested_stages_record_time_rows_and_memory(self):
+
+        @profiled(rows=len)
+        def allocate(n):
+            return np.ones(n)
+
+        with self.profiler.stage("outer", rows=10):
+            busy(0.05)
+            allocate(4_000_000)
+            self.profiler.add("worker", wall_seconds=2.0)
+        records = {r["stage"]: r for r in self.profiler.records}
+        self.assertEqual(set(records), {"outer", "outer/allocate", "outer/worker"})
+        outer = records["outer"]
+        self.assertGreaterEqual(outer["wall_seconds"], 0.05)
+        self.assertGreater(outer["cpu_seconds"], 0.03)
+        self.assertEqual(records["outer/allocate"]["rows"], 4_000_000)
+        if self.profiler.sampler.available:
+            self.assertGreater(records["outer/allocate"]["rss_growth_mb"], 20)
+            self.assertGreaterEqual(outer["peak_rss_mb"], records["outer/allocate"]["peak_rss_mb"])
+
+    def test_tracemalloc_peak_propagates_to_enclosing_stage(self):
+        profiler = Profiler(memory="tracemalloc")
+        self.addCleanup(profiler.close)
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                block = np.ones(2_000_000)
+                del block
+            np.ones(10)
+        records = {r["stage"]: r for r in profiler.records}
+        self.assertGreater(records["outer/inner"]["tracemalloc_peak_mb"], 15)
+        self.assertGreaterEqual(records["outer"]["tracemalloc_peak_mb"], records["outer/inner"]["tracemalloc_peak_mb"])
+
+    def test_failed_stage_is_recorded(self):
+        with self.assertRaises(ValueError):
+            with self.profiler.stage("broken"):
+                raise ValueError("boom")
+        self.assertTrue(self.profiler.records[0]["failed"])
+
+    def test_sampling_profiler_finds_the_hot_function(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = Profiler(memory=None, sample_stages=["hot"], sample_interval=0.002, profile_dir=tmp)
+            with profiler.stage("hot"):
+                busy(0.2)
+            (record,) = profiler.records
+            self.assertGreater(record["profile_samples"], 10)
+            function, own, cumulative = record["profile_top"][0]
+            self.assertEqual(function, "test_profiling.py:busy")
+            self.assertGreater(own, 0.5)
+            with open(record["profile_path"]) as f:
+                self.assertIn("test_profiling.py:busy", f.read())
+
+    def test_summary_metrics_and_outputs(self):
+        for rows in (100, 300):
+            with self.profiler.stage("score", rows=rows):
+                busy(0.01)
+        summary = self.profiler.summary()["score"]
+        self.assertEqual((summary["calls"], summary["rows"]), (2, 400))
+        metrics = self.profiler.metrics()
+        self.assertEqual(metrics["perf.score.calls"], 2)
+        self.assertIn("perf.score.wall_seconds", metrics)
+
+        experiment_logger = FakeExperimentLogger()
+        self.profiler.log_to_mlflow(experiment_logger, "run")
+        self.assertEqual(experiment_logger.metrics, metrics)
+
+        logger = logging.getLogger("test_profiling")
+        with self.assertLogs(logger, level="INFO") as logs:
+            self.profiler.emit(logger)
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(logs.records[0].stage, "score")
+        self.assertEqual(logs.records[0].rows, 100)
+
+    def test_from_env(self):
+        profiler = Profiler.from_env({"PRICING_PROFILE": "1", "PRICING_PROFILE_MEMORY": "none",
+                                      "PRICING_PROFILE_SAMPLE": "train_models, merge_sources"})
+        self.assertTrue(profiler.enabled)
+        self.assertIsNone(profiler.memory)
+        self.assertEqual(profiler.sample_stages, {"train_models", "merge_sources"})
+        self.assertFalse(Profiler.from_env({}).enabled)
+
+
+class TestPipelineProfiling(unittest.TestCase):
+
+    def test_search_records_models_and_grid_points(self):
+        profiler = Profiler(memory=None)
+        previous = set_profiler(profiler)
+        self.addCleanup(set_profiler, previous)
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(120, 3)), columns=["a", "b", "c"])
+        y = X["a"] * 2 + rng.normal(size=120)
+        with profiler.stage("train_models", rows=len(X)):
+            search = ModelSearch({"Ridge": Ridge()}, {"Ridge": {"alpha": [0.1, 1.0]}}, n_jobs=1).fit(X, y)
+            pipeline.record_search_profile(profiler, search.results_)
+        pipeline.evaluate_model(search.best_estimators_["Ridge"], X, y)
+        stages = {r["stage"]: r for r in profiler.records}
+        self.assertEqual(stages["train_models"]["rows"], 120)
+        self.assertEqual(stages["train_models/Ridge/alpha=0.1"]["fits"], 3)
+        self.assertEqual(stages["train_models/Ridge/alpha=0.1"]["rows"], 240)
+        # Six fold fits plus the refit on all rows.
+        self.assertEqual(stages["train_models/Ridge"]["fits"], 7)
+        self.assertEqual(stages["evaluate_model"]["rows"], 120)
+        self.assertIs(get_profiler(), profiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.schema import SchemaRegistry
+
+
+class TestSchemaRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SchemaRegistry.from_directory(DataLoader.RAW_DATA_DIR)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, df):
+        path = os.path.join(self.tmp.name, "data.csv")
+        df.to_csv(path, index=False)
+        return path
+
+    def test_registry_covers_all_dictionaries(self):
+        self.assertEqual(
+            sorted(self.registry.names()),
+            ["competitor", "customer_behavior", "inventory", "sales"],
+        )
+        inventory = self.registry.get("inventory")
+        self.assertEqual(inventory.columns["StockStart"].dtype, "int32")
+        self.assertEqual(inventory.columns["LeadTimeFloat"].dtype, "float32")
+        self.assertEqual(self.registry.get("sales").columns["SellingPrice"].dtype, "float64")
+        self.assertEqual(self.registry.get("competitor").columns["DiscountRate"].dtype, "float32")
+        self.assertEqual(inventory.columns["FC_ID"].dtype, "category")
+        self.assertEqual(inventory.columns["IsMetro"].dtype, "bool")
+        self.assertEqual(inventory.columns["Date"].dtype, "datetime64[ns]")
+        self.assertIs(self.registry.for_file("sales_data_dictionary.csv"), self.registry.get("sales"))
+
+    def test_clean_file_reads_with_compact_dtypes(self):
+        path = self.write_csv(pd.DataFrame({
+            "Date": ["2024-01-01", "2024-01-02"],
+            "FC_ID": ["FC1", "FC2"],
+            "IsMetro": [True, False],
+            "StockStart": [10, 20],
+            "LeadTimeFloat": [1.5, 2.0],
+        }))
+        df, violations = self.registry.get("inventory").read_csv(
+            path, columns=["Date", "FC_ID", "IsMetro", "StockStart", "LeadTimeFloat"]
+        )
+        self.assertEqual(violations, [])
+        self.assertEqual(str(df["StockStart"].dtype), "int32")
+        self.assertEqual(str(df["LeadTimeFloat"].dtype), "float32")
+        self.assertEqual(str(df["FC_ID"].dtype), "category")
+        self.assertEqual(str(df["IsMetro"].dtype), "bool")
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["Date"]))
+
+    def test_dirty_file_reports_violations(self):
+        path = self.write_csv(pd.DataFrame({
+            "TransactionDate": ["2024-01-01", "not a date"],
+            "MRP": [100.0, 90.0],
+            "UnitsSold": ["3", "many"],
+        }))
+        df, violations = self.registry.get("sales").read_csv(path)
+        kinds = {(v.column, v.kind): v for v in violations}
+        self.assertIn(("TransactionDate", "unparseable"), kinds)
+        self.assertEqual(kinds[("UnitsSold", "unparseable")].sample, ["many"])
+        self.assertIn(("NoPromoPrice", "missing_column"), kinds)
+        self.assertEqual(str(df["UnitsSold"].dtype), "Int32")
+
+    def test_chunks_share_dtypes(self):
+        path = self.write_csv(pd.DataFrame({"UnitsSold": [1, 2, None, 4], "MRP": [1.0, 2.0, 3.0, 4.0]}))
+        chunks = [df for df, _ in self.registry.get("sales").iter_csv(path, 2, columns=["UnitsSold", "MRP"])]
+        self.assertEqual([str(df["UnitsSold"].dtype) for df in chunks], ["Int32", "Int32"])
+        self.assertEqual(str(pd.concat(chunks)["UnitsSold"].dtype), "Int32")
+
+    def test_out_of_range_integers_are_not_truncated(self):
+        path = self.write_csv(pd.DataFrame({"UnitsSold": [1, 2 ** 40]}))
+        df, violations = self.registry.get("sales").read_csv(path, columns=["UnitsSold"])
+        self.assertEqual(violations[0].kind, "out_of_range")
+        self.assertEqual(df["UnitsSold"].iloc[1], 2 ** 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
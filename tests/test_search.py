@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.model_selection import GridSearchCV
+
+from src.models.search import ModelSearch, summarize
+from src.utils.error_handler import ModelTrainingError
+
+
+def make_data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+    y = X["a"] * 3 - X["b"] + rng.normal(scale=0.1, size=n)
+    return X, y
+
+
+class TestModelSearch(unittest.TestCase):
+
+    def test_grid_matches_gridsearchcv(self):
+        X, y = make_data()
+        grid = {"alpha": [0.1, 10.0, 100.0]}
+        search = ModelSearch({"Ridge": Ridge()}, {"Ridge": grid}, n_jobs=1).fit(X, y)
+        reference = GridSearchCV(Ridge(), grid, cv=3, scoring="neg_mean_squared_error").fit(X, y)
+        self.assertEqual(search.best_params_["Ridge"], reference.best_params_)
+        self.assertAlmostEqual(search.best_scores_["Ridge"], reference.best_score_)
+        self.assertEqual(list(search.best_estimators_["Ridge"].feature_names_in_), list(X.columns))
+        self.assertEqual(len([r for r in search.results_ if r["fold"] is not None]), 9)
+        self.assertTrue(all(r["fit_time"] is not None for r in search.results_))
+
+    def test_process_pool_halving(self):
+        X, y = make_data(n=600)
+        search = ModelSearch(
+            {"LinearRegression": LinearRegression(), "RandomForest": RandomForestRegressor(random_state=0)},
+            {"RandomForest": {"n_estimators": [5, 10], "max_depth": [2, 4, 6]}},
+            n_jobs=2, strategy="halving",
+        ).fit(X, y)
+        self.assertEqual(set(search.best_estimators_), {"LinearRegression", "RandomForest"})
+        summary = summarize(search.results_)
+        forest = summary[summary["model"] == "RandomForest"]
+        # Six candidates on a subsample, then only the leaders on more rows.
+        self.assertEqual(forest["n_samples"].min(), forest["n_samples"].iloc[0])
+        self.assertLess((forest["n_samples"] == forest["n_samples"].max()).sum(), 6)
+
+    def test_time_budget_stops_scheduling(self):
+        X, y = make_data()
+        search = ModelSearch({"Ridge": Ridge()}, {"Ridge": {"alpha": [1.0, 2.0]}}, n_jobs=1, time_budget=0)
+        with self.assertRaises(ModelTrainingError):
+            search.fit(X, y)
+        self.assertEqual(search.best_estimators_, {})
+
+    def test_inline_search_leaves_the_memory_limit_alone(self):
+        import resource
+
+        X, y = make_data()
+        before = resource.getrlimit(resource.RLIMIT_AS)
+        ModelSearch({"Ridge": Ridge()}, n_jobs=1, memory_limit_mb=4096).fit(X, y)
+        self.assertEqual(resource.getrlimit(resource.RLIMIT_AS), before)
+
+    def test_all_failed_fits_raise(self):
+        X, y = make_data()
+        X.iloc[0, 0] = np.nan
+        with self.assertRaises(ModelTrainingError):
+            ModelSearch({"Ridge": Ridge()}, n_jobs=1).fit(X, y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import http.client
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.models.model import PricingModel, array_predictor
+from src.models.serve import MicroBatcher, ScoringServer, feature_names_of, to_matrix
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def test_concurrent_requests_share_model_calls(self):
+        calls = []
+
+        def predict(rows):
+            calls.append(len(rows))
+            return rows.sum(axis=1)
+
+        batcher = MicroBatcher(predict, max_batch_rows=64, max_wait_ms=20).start()
+        try:
+            rows = [np.full((1, 3), i, dtype=float) for i in range(32)]
+            with ThreadPoolExecutor(max_workers=32) as pool:
+                results = list(pool.map(batcher.predict, rows))
+        finally:
+            batcher.stop()
+        self.assertEqual([r.tolist() for r in results], [[3.0 * i] for i in range(32)])
+        self.assertLess(len(calls), 32)
+        self.assertEqual(batcher.metrics.snapshot()["batches"], len(calls))
+
+    def test_bad_request_does_not_fail_its_batch(self):
+        def predict(rows):
+            if rows.shape[1] != 2:
+                raise ValueError("expected 2 features")
+            return rows[:, 0]
+
+        batcher = MicroBatcher(predict, max_wait_ms=20).start()
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                good = pool.submit(batcher.predict, [[1.0, 2.0]])
+                bad = pool.submit(batcher.predict, [[1.0, 2.0, 3.0]])
+                self.assertEqual(good.result().tolist(), [1.0])
+                with self.assertRaises(ValueError):
+                    bad.result()
+        finally:
+            batcher.stop()
+
+
+class TestScoringServer(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(200, 2)), columns=["MRP", "UnitsSold"])
+        self.model = PricingModel(LinearRegression(), StandardScaler())
+        self.model.train(X, X["MRP"] * 2 + 1)
+        self.batcher = MicroBatcher(array_predictor(self.model), max_wait_ms=1).start()
+        self.server = ScoringServer(("127.0.0.1", 0), self.batcher, feature_names_of(self.model))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.connection = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.stop()
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else None
+        self.connection.request(method, path, body=body)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_predict_rows_and_named_features(self):
+        status, body = self.request("POST", "/predict", {"instances": [[1.0, 0.0], [2.0, 5.0]]})
+        self.assertEqual(status, 200)
+        np.testing.assert_allclose(body["predictions"], [3.0, 5.0])
+        status, body = self.request("POST", "/predict", {"instances": [{"UnitsSold": 0.0, "MRP": 1.0}]})
+        np.testing.assert_allclose(body["predictions"], [3.0])
+
+    def test_invalid_request_and_metrics(self):
+        status, body = self.request("POST", "/predict", {"instances": [[1.0, 2.0, 3.0]]})
+        self.assertEqual(status, 400)
+        self.request("POST", "/predict", {"instances": [[1.0, 0.0]]})
+        status, metrics = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual((metrics["requests"], metrics["errors"]), (2, 1))
+        self.assertIsNotNone(metrics["latency_ms"]["p99"])
+
+    def test_to_matrix_requires_rows(self):
+        with self.assertRaises(ValueError):
+            to_matrix([1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
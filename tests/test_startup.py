@@ -0,0 +1,34 @@
+import sys
+import unittest
+
+from benchmarks.startup import ENTRY_POINTS, check, measure
+from src.utils import error_handler
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_entry_points_import_without_heavy_dependencies_or_side_effects(self):
+        report = measure(repeats=1)
+        self.assertEqual(set(report), set(ENTRY_POINTS))
+        for name, result in report.items():
+            with self.subTest(entry_point=name):
+                self.assertEqual(result["heavy_modules"], [])
+                self.assertFalse(result["excepthook_changed"])
+
+    def test_check_flags_regressions(self):
+        report = {
+            "fast": {"import_ms": 120.0, "heavy_modules": [], "excepthook_changed": False},
+            "slow": {"import_ms": 400.0, "heavy_modules": ["sklearn"], "excepthook_changed": True},
+        }
+        failures = check(report, {"fast": 100.0, "slow": 100.0}, tolerance=0.5, slack_ms=50.0)
+        self.assertEqual(len(failures), 3)
+        self.assertTrue(all(failure.startswith("slow") for failure in failures))
+
+    def test_install_exception_handler(self):
+        self.addCleanup(setattr, sys, "excepthook", sys.excepthook)
+        error_handler.install_exception_handler()
+        self.assertIs(sys.excepthook, error_handler.global_exception_handler)
+
+
+if __name__ == "__main__":
+    unittest.main()
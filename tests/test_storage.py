@@ -0,0 +1,204 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.storage import BlobCache, BlobStorage, LocalStorage, RangeReader
+from tests.helpers import make_raw_sources
+
+
+class NotFound(Exception):
+    status_code = 404
+
+
+class FakeBlob:
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    def get_blob_properties(self):
+        self.container.heads += 1
+        if self.name not in self.container.blobs:
+            raise NotFound(self.name)
+        data, etag = self.container.blobs[self.name]
+        return type("Properties", (), {"size": len(data), "etag": etag})()
+
+    def download_blob(self, offset=0, length=None, **options):
+        container = self.container
+        with container.lock:
+            container.in_flight += 1
+            container.max_in_flight = max(container.max_in_flight, container.in_flight)
+            container.ranges.append((self.name, offset, length))
+        time.sleep(container.latency)
+        with container.lock:
+            container.in_flight -= 1
+        data = container.blobs[self.name][0][offset:offset + length]
+        return type("Downloader", (), {"readall": lambda _: data})()
+
+
+class FakeContainer:
+    """
+    In-memory stand-in for azure.storage.blob.ContainerClient.
+    """
+
+    url = "https://fake.blob.core.windows.net/raw"
+
+    def __init__(self, latency=0.0):
+        self.blobs = {}
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.ranges = []
+        self.heads = 0
+        self.in_flight = self.max_in_flight = 0
+
+    def upload(self, name, data):
+        self.blobs[name] = (data, f'"{uuid.uuid4().hex}"')
+
+    def get_blob_client(self, name):
+        return FakeBlob(self, name)
+
+    def list_blobs(self, name_starts_with=None):
+        return [type("Blob", (), {"name": name})() for name in self.blobs if name.startswith(name_starts_with or "")]
+
+
+class TestRangeReader(unittest.TestCase):
+
+    def test_reads_in_order_with_ranges_in_parallel(self):
+        data = bytes(range(256)) * 40
+        container = FakeContainer(latency=0.01)
+        container.upload("blob", data)
+        storage = BlobStorage(container, chunk_size=1000, max_concurrency=4)
+        with storage.open("blob") as stream:
+            self.assertEqual(stream.read(), data)
+        self.assertEqual(len(container.ranges), 11)
+        self.assertGreater(container.max_in_flight, 1)
+        self.assertLessEqual(container.max_in_flight, 4)
+
+    def test_seek_restarts_prefetch(self):
+        data = bytes(range(256)) * 10
+        reader = RangeReader(lambda offset, length: data[offset:offset + length], len(data), chunk_size=100,
+                             max_concurrency=2)
+        self.assertEqual(reader.read(150), data[:100])
+        reader.seek(1000)
+        self.assertEqual(reader.read(50), data[1000:1050])
+        reader.seek(0)
+        self.assertEqual(b"".join(iter(lambda: reader.read(64), b"")), data)
+        reader.close()
+
+
+class TestBlobStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.container = FakeContainer()
+        self.sources = make_raw_sources(days=6, sales_per_day=5)
+        for name, df in self.sources.items():
+            self.container.upload(f"raw/{name}_data_dictionary.csv", df.to_csv(index=False).encode())
+        self.original = DataLoader.CACHE_DIR
+        DataLoader.CACHE_DIR = os.path.join(self.tmp.name, "columnar")
+
+    def tearDown(self):
+        DataLoader.set_storage(None)
+        DataLoader.CACHE_DIR = self.original
+        self.tmp.cleanup()
+
+    def test_data_loader_streams_blobs_like_local_files(self):
+        local_dir = os.path.join(self.tmp.name, "local")
+        os.makedirs(local_dir)
+        for name, df in self.sources.items():
+            df.to_csv(os.path.join(local_dir, f"{name}_data_dictionary.csv"), index=False)
+        schema = DataLoader.get_schema("sales")
+        DataLoader.set_storage(LocalStorage(local_dir))
+        expected = DataLoader.load_csv("sales_data_dictionary.csv", schema=schema)
+        DataLoader.set_storage(BlobStorage(self.container, prefix="raw", chunk_size=64))
+        streamed = DataLoader.load_csv("sales_data_dictionary.csv", schema=schema)
+        pd.testing.assert_frame_equal(streamed, expected)
+        chunks = list(DataLoader.iter_csv("sales_data_dictionary.csv", chunksize=7, schema=schema))
+        streamed = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(streamed, expected.astype(streamed.dtypes.to_dict()))
+        self.assertIn("sales_data_dictionary.csv", DataLoader.list_raw_files())
+
+    def test_missing_blob_raises_file_not_found(self):
+        DataLoader.set_storage(BlobStorage(self.container, prefix="raw"))
+        with self.assertRaises(FileNotFoundError):
+            DataLoader.load_csv("missing.csv")
+
+    def test_cache_revalidates_by_etag(self):
+        cache = BlobCache(os.path.join(self.tmp.name, "blobs"))
+        storage = BlobStorage(self.container, prefix="raw", cache=cache, chunk_size=64)
+        path = storage.local_path("sales_data_dictionary.csv")
+        downloads = len(self.container.ranges)
+        self.assertEqual(storage.local_path("sales_data_dictionary.csv"), path)
+        self.assertEqual(len(self.container.ranges), downloads)
+
+        self.container.upload("raw/sales_data_dictionary.csv", b"TransactionDate,SellingPrice\n2024-01-01,1.0\n")
+        changed = storage.local_path("sales_data_dictionary.csv")
+        self.assertNotEqual(changed, path)
+        self.assertGreater(len(self.container.ranges), downloads)
+        with open(changed, "rb") as f:
+            self.assertTrue(f.read().startswith(b"TransactionDate,SellingPrice"))
+
+    def test_cache_hits_do_not_rewrite_index(self):
+        cache = BlobCache(os.path.join(self.tmp.name, "blobs"))
+        storage = BlobStorage(self.container, prefix="raw", cache=cache)
+        storage.local_path("sales_data_dictionary.csv")
+        before = os.stat(cache._index_path()).st_mtime_ns
+        time.sleep(0.01)
+        storage.local_path("sales_data_dictionary.csv")
+        self.assertEqual(os.stat(cache._index_path()).st_mtime_ns, before)
+
+    def test_cache_is_content_addressed_and_bounded(self):
+        cache = BlobCache(os.path.join(self.tmp.name, "blobs"))
+        storage = BlobStorage(self.container, cache=cache)
+        self.container.upload("a.csv", b"x" * 1000)
+        self.container.upload("b.csv", b"x" * 1000)
+        self.assertEqual(storage.local_path("a.csv"), storage.local_path("b.csv"))
+        self.assertEqual(cache.size_bytes(), 1000)
+
+        cache.max_bytes = 1500
+        self.container.upload("c.csv", b"y" * 1000)
+        storage.local_path("c.csv")
+        self.assertEqual(cache.size_bytes(), 1000)
+        heads = self.container.heads
+        storage.local_path("a.csv")  # evicted: downloaded again
+        self.assertEqual(self.container.heads, heads + 1)
+        self.assertEqual(self.container.ranges[-1][0], "a.csv")
+
+    def test_fingerprint_uses_etags(self):
+        DataLoader.set_storage(BlobStorage(self.container, prefix="raw"))
+        before = DataLoader.fingerprint(["sales_data_dictionary.csv"])
+        self.assertEqual(DataLoader.fingerprint(["sales_data_dictionary.csv"]), before)
+        self.container.upload("raw/sales_data_dictionary.csv", b"TransactionDate\n")
+        self.assertNotEqual(DataLoader.fingerprint(["sales_data_dictionary.csv"]), before)
+        self.assertEqual(self.container.ranges, [])
+
+
+@unittest.skipUnless(os.environ.get("AZURITE_CONNECTION_STRING"), "Set AZURITE_CONNECTION_STRING to run against Azurite.")
+class TestAzurite(unittest.TestCase):
+
+    def test_round_trip(self):
+        from azure.storage.blob import ContainerClient
+
+        name = f"test-{uuid.uuid4().hex[:12]}"
+        container = ContainerClient.from_connection_string(os.environ["AZURITE_CONNECTION_STRING"], name)
+        container.create_container()
+        try:
+            data = os.urandom(3 * 1024 ** 2 + 17)
+            container.upload_blob("raw/data.bin", data)
+            with tempfile.TemporaryDirectory() as tmp:
+                storage = BlobStorage(container, prefix="raw", cache=BlobCache(tmp), chunk_size=1024 ** 2)
+                with storage.open("data.bin") as stream:
+                    self.assertEqual(stream.read(), data)
+                with open(storage.local_path("data.bin"), "rb") as f:
+                    self.assertEqual(f.read(), data)
+        finally:
+            container.delete_container()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import DataLoader
+from src.data.schema import SchemaRegistry
+from src.data.synthetic import DICTIONARY_DIR, SOURCES, SyntheticDataGenerator
+from src.pipelines.dynamic_pricing_pipeline import feature_engineering, load_and_validate_data
+from tests.helpers import raw_data_dir
+
+
+class TestSyntheticDataGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SchemaRegistry.from_directory(DICTIONARY_DIR)
+        self.generator = SyntheticDataGenerator(rows=5000, days=30, fcs=3, brands=4, seed=7, block_rows=1000)
+
+    def test_sources_follow_the_data_dictionaries(self):
+        sources = self.generator.generate()
+        self.assertEqual(set(sources), set(SOURCES))
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = self.generator.write(tmp)
+            for source, path in paths.items():
+                schema = self.registry.get(source)
+                self.assertEqual(list(sources[source].columns), list(schema.columns))
+                df, violations = schema.read_csv(path)
+                self.assertEqual(violations, [])
+                self.assertEqual(len(df), len(sources[source]))
+
+    def test_scale_and_grain(self):
+        sources = self.generator.generate()
+        self.assertEqual(len(sources["sales"]), 5000)
+        self.assertEqual(len(sources["inventory"]), 30 * 3)
+        self.assertEqual(sources["competitor"]["Brand"].nunique(), 4)
+        self.assertEqual(sources["sales"]["TransactionDate"].nunique(), 30)
+        self.assertTrue(sources["sales"]["TransactionDate"].is_monotonic_increasing)
+
+    def test_realistic_relationships(self):
+        sources = self.generator.generate()
+        sales, inventory = sources["sales"], sources["inventory"]
+        self.assertTrue((sales["SellingPrice"] <= sales["NoPromoPrice"]).all())
+        self.assertTrue((sales["NoPromoPrice"] <= sales["MRP"]).all())
+        self.assertTrue((sales["UnitsSold"] > 0).all())
+        self.assertTrue((inventory["DemandFulfilled"] <= inventory["Demand"]).all())
+        np.testing.assert_array_equal(inventory["Backorders"], inventory["Demand"] - inventory["DemandFulfilled"])
+        self.assertTrue((inventory["StockEnd"] >= inventory["StockStart"] - inventory["DemandFulfilled"]).all())
+        # Deeper discounts sell more units.
+        discount = 1 - sales["SellingPrice"] / sales["MRP"]
+        self.assertGreater(np.corrcoef(discount, sales["UnitsSold"])[0, 1], 0.1)
+
+    def test_seeded_and_deterministic(self):
+        same = SyntheticDataGenerator(rows=5000, days=30, fcs=3, brands=4, seed=7, block_rows=1000)
+        other = SyntheticDataGenerator(rows=5000, days=30, fcs=3, brands=4, seed=8, block_rows=1000)
+        pd.testing.assert_frame_equal(self.generator.sales(), same.sales())
+        pd.testing.assert_frame_equal(self.generator.inventory(), same.inventory())
+        self.assertFalse(self.generator.sales()["MRP"].equals(other.sales()["MRP"]))
+
+    def test_sales_keys(self):
+        generator = SyntheticDataGenerator(rows=100, days=5, fcs=2, brands=2, sales_keys=True)
+        sales = generator.sales()
+        self.assertEqual(set(sales["FC_ID"]), {"FC001", "FC002"})
+        self.assertEqual(set(sales["Brand"]), {"Brand001", "Brand002"})
+
+    def test_pipeline_runs_on_generated_data(self):
+        with tempfile.TemporaryDirectory() as tmp, raw_data_dir(tmp, self.generator.generate()):
+            df = feature_engineering(load_and_validate_data())
+        self.assertEqual(len(df), 5000)
+        self.assertIn("InventoryHealth", df.columns)
+        self.assertIn("CompetitorPriceGap", df.columns)
+        self.assertFalse(os.path.exists(os.path.join(DataLoader.RAW_DATA_DIR, ".cache")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.utils.utility import FileTokenBucket, RateLimiter, TokenBucket, rate_limiter
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drain_shared_bucket(path, results):
+    bucket = FileTokenBucket(path, rate=0.001, capacity=5)
+    results.put(sum(bucket.reserve(max_wait=0) is not None for _ in range(5)))
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_refills_smoothly_without_window_bursts(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+        self.assertEqual([bucket.reserve(max_wait=0) is not None for _ in range(3)], [True, True, False])
+        clock.now = 0.05
+        self.assertIsNone(bucket.reserve(max_wait=0))
+        clock.now = 0.1
+        self.assertEqual(bucket.reserve(max_wait=0), 0.0)
+        # Reservations queue up: the next two callers wait one and two refill intervals.
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+        with self.assertRaises(ValueError):
+            bucket.reserve(tokens=3)
+
+    def test_threads_share_the_budget(self):
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 20 calls with a burst of 5 need at least 15 refills at 50/s.
+        self.assertGreaterEqual(time.monotonic() - start, 0.28)
+
+    def test_async_acquire_awaits(self):
+        bucket = TokenBucket(rate=100, capacity=1)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.035)
+        self.assertFalse(asyncio.run(bucket.acquire_async(timeout=0)))
+
+    def test_file_bucket_is_shared_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "competitor_api.bucket")
+            results = multiprocessing.get_context("spawn").Queue()
+            processes = [
+                multiprocessing.get_context("spawn").Process(target=_drain_shared_bucket, args=(path, results))
+                for _ in range(2)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            granted = results.get() + results.get()
+        self.assertEqual(granted, 5)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_per_key_buckets(self):
+        limiter = RateLimiter(rate=1, capacity=1)
+        self.assertTrue(limiter.acquire("keyvault", timeout=0))
+        self.assertFalse(limiter.acquire("keyvault", timeout=0))
+        self.assertTrue(limiter.acquire("competitor", timeout=0))
+
+    def test_decorated_functions_do_not_share_a_counter(self):
+        @rate_limiter(max_calls=2, period=10)
+        def first():
+            return 1
+
+        @rate_limiter(max_calls=2, period=10)
+        def second():
+            return 2
+
+        start = time.monotonic()
+        self.assertEqual([first(), first(), second(), second()], [1, 1, 2, 2])
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_shared_path_keeps_a_file_per_function(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            limit = rate_limiter(max_calls=1, period=10, shared_path=os.path.join(tmp, "api.bucket"))
+
+            @limit
+            def first():
+                return 1
+
+            @limit
+            def second():
+                return 2
+
+            start = time.monotonic()
+            self.assertEqual([first(), second()], [1, 2])
+            self.assertLess(time.monotonic() - start, 1)
+            self.assertEqual(len(os.listdir(tmp)), 2)
+
+    def test_async_decorator(self):
+        @rate_limiter(max_calls=1, period=0.02)
+        async def fetch(x):
+            return x * 2
+
+        async def run():
+            return await asyncio.gather(*(fetch(i) for i in range(3)))
+
+        self.assertEqual(asyncio.run(run()), [0, 2, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.validation import (
+    CompareRule, ExpressionRule, MonotonicRule, NotNullRule, RangeRule, ReferentialRule,
+    Validator, WARNING, default_rules,
+)
+from src.utils.error_handler import DataValidationError
+from src.utils.utility import validate_positive_number
+
+
+class TestValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "Date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-01"]),
+            "MRP": [100.0, 100.0, 100.0, 100.0],
+            "SellingPrice": [90.0, 120.0, np.nan, -5.0],
+            "UnitsSold": pd.array([1, 2, None, 4], dtype="Int32"),
+        })
+
+    def test_rules_report_counts_and_samples(self):
+        report = Validator([
+            RangeRule("SellingPrice", min_value=0, inclusive=False),
+            NotNullRule("UnitsSold"),
+            MonotonicRule("Date"),
+            ReferentialRule("Date", pd.to_datetime(["2024-01-01"]), reference_name="inventory"),
+            CompareRule("SellingPrice", "<=", "MRP", severity=WARNING),
+            RangeRule("Missing", min_value=0),
+        ]).validate(self.df)
+        results = {r.name: r for r in report.results}
+        self.assertEqual(results["SellingPrice_range"].sample_indices, [3])
+        self.assertEqual(results["UnitsSold_not_null"].violations, 1)
+        self.assertEqual(results["Date_monotonic"].sample_indices, [3])
+        self.assertEqual(results["Date_in_inventory"].violations, 2)
+        self.assertEqual(results["SellingPrice<=MRP"].sample_indices, [1])
+        self.assertTrue(results["Missing_range"].skipped)
+        self.assertFalse(report.passed)
+        self.assertEqual(len(report.warnings), 1)
+
+    def test_raise_for_errors_carries_report(self):
+        report = Validator([RangeRule("SellingPrice", min_value=0)]).validate(self.df)
+        with self.assertRaises(DataValidationError) as ctx:
+            report.raise_for_errors()
+        self.assertIs(ctx.exception.report, report)
+
+    def test_stock_balance_rule(self):
+        df = pd.DataFrame({"StockStart": [10, 10], "DemandFulfilled": [4, 4], "StockEnd": [6, 3]})
+        rule = [r for r in default_rules() if r.name == "stock_balance"][0]
+        self.assertEqual(Validator([rule]).validate(df).results[0].sample_indices, [1])
+
+    def test_expression_rule_treats_missing_as_valid(self):
+        rule = ExpressionRule("gt", ["a"], lambda df: df["a"] > 0)
+        report = Validator([rule]).validate(pd.DataFrame({"a": [1.0, np.nan, -1.0]}))
+        self.assertEqual(report.results[0].sample_indices, [2])
+
+    def test_validate_positive_number_accepts_numpy_scalars(self):
+        self.assertTrue(validate_positive_number(np.float32(1.5)))
+        self.assertTrue(validate_positive_number(np.int32(3)))
+        self.assertFalse(validate_positive_number(np.float64(-1.0)))
+        self.assertFalse(validate_positive_number("3"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import unittest
+
+import numpy as np
+
+from src.utils.worker_pool import WORKER, InlineExecutor, SharedArrays, load_shared, worker_pool
+
+
+def _init(paths):
+    WORKER.update(load_shared(paths))
+
+
+def _memory_limit():
+    import resource
+
+    return resource.getrlimit(resource.RLIMIT_AS)
+
+
+def _row_sum(row):
+    return float(WORKER["X"][row].sum()), os.getpid()
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def test_workers_memory_map_shared_arrays(self):
+        X = np.arange(12, dtype=np.float64).reshape(4, 3)
+        shared = SharedArrays("worker_pool_test_", X=X)
+        try:
+            inline = worker_pool(1, _init, (shared.paths,))
+            self.assertIsInstance(inline, InlineExecutor)
+            self.assertIsInstance(WORKER["X"], np.memmap)
+            self.assertEqual(inline.submit(_row_sum, 1).result()[0], 12.0)
+            inline.shutdown()
+            self.assertEqual(WORKER, {})
+
+            pool = worker_pool(2, _init, (shared.paths,))
+            try:
+                # Spawned, not forked: the parent's logging and profiling threads stay behind.
+                self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+                sums, pids = zip(*pool.map(_row_sum, range(4)))
+            finally:
+                pool.shutdown()
+            self.assertEqual(list(sums), X.sum(axis=1).tolist())
+            self.assertNotIn(os.getpid(), pids)
+        finally:
+            shared.close()
+        self.assertFalse(os.path.exists(shared.data_dir))
+
+    def test_memory_limit_applies_to_pool_workers_only(self):
+        before = _memory_limit()
+        limit = 4096 * 1024 * 1024
+        inline = worker_pool(1, WORKER.update, ({},), memory_limit_mb=4096)
+        self.assertEqual(inline.submit(_memory_limit).result(), before)
+        inline.shutdown()
+        pool = worker_pool(2, WORKER.update, ({},), memory_limit_mb=4096)
+        try:
+            self.assertEqual(pool.submit(_memory_limit).result(), (limit, limit))
+        finally:
+            pool.shutdown()
+        self.assertEqual(_memory_limit(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()